@@ -0,0 +1,264 @@
+"""
+End-to-end load benchmark of search, preview, download and email against
+in-process SAP CPI and Graph stand-ins (see ``benchmarks/stubs.py``).
+
+The application is built with ``app_factory`` and driven through
+``httpx.ASGITransport``; its SAP CPI and Graph clients are pointed at the
+stubs and authentication is overridden, so nothing leaves the process.
+Every scenario runs at each concurrency level, reporting p50/p95/p99
+latency and requests per second. Results are also written as JSON so runs
+can be compared over time.
+
+    cd services/backend && python -m benchmarks.load [--scenarios search preview]
+        [--concurrency 1 8 32] [--requests 200] [--latency-median-ms 50]
+        [--latency-p99-ms 250] [--error-rate 0] [--cache] [--output load.json]
+"""
+import argparse
+import asyncio
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+import json
+import logging
+from pathlib import Path
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Any, Callable
+
+from azure.core.credentials import AccessToken
+from fastapi import FastAPI
+import httpx
+
+from benchmarks.stubs import GraphStub, SAPCPIStub, UpstreamProfile
+from src.api.rest.v1.document.routes import download_router, email_router, preview_router, search_router
+from src.apps.auth.enums import DrawingLocatorGroup
+from src.apps.auth.jwt import decode_jwt
+from src.apps.documents.client import DocumentClient
+from src.apps.documents.graph_client import GraphMailClient
+from src.config import AppConfig, get_config
+from src.infra.application.factory import app_factory
+
+API_PREFIX = "/api/1"
+RECIPIENT = "benchmark@tennantco.com"
+
+RequestSpec = tuple[str, str, dict[str, Any]]
+
+
+class StaticTokenCredential:
+    async def get_token(self, *scopes: str, **kwargs) -> AccessToken:
+        return AccessToken("benchmark", int(time.time()) + 3600)
+
+    async def close(self) -> None:
+        pass
+
+
+@dataclass(slots=True)
+class ScenarioResult:
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+def make_scenarios(
+        part_numbers: int,
+        documents_per_part_number: int,
+        batch_size: int,
+) -> dict[str, Callable[[random.Random], RequestSpec]]:
+    def document_ids(rng: random.Random, count: int) -> list[str]:
+        return [
+            f"{rng.randrange(part_numbers)}-{rng.randrange(documents_per_part_number)}"
+            for _ in range(count)
+        ]
+
+    return {
+        "search": lambda rng: (
+            "GET", f"{API_PREFIX}/search",
+            {"params": {"part_numbers": rng.sample(range(part_numbers), min(batch_size, part_numbers))}},
+        ),
+        "preview": lambda rng: ("GET", f"{API_PREFIX}/preview/{document_ids(rng, 1)[0]}", {}),
+        "download": lambda rng: (
+            "POST", f"{API_PREFIX}/download",
+            {"json": {"document_ids": document_ids(rng, batch_size)}, "headers": {"Accept": "application/zip"}},
+        ),
+        "email": lambda rng: (
+            "POST", f"{API_PREFIX}/send-email",
+            {"json": {"document_ids": document_ids(rng, batch_size), "email": RECIPIENT}},
+        ),
+    }
+
+
+def make_config(cache: bool, cache_dir: str) -> AppConfig:
+    config = get_config().model_copy(deep=True)
+    config.debug = False
+    config.log_level = "warning"
+    config.content_cache.enabled = cache
+    config.content_cache.disk_path = str(Path(cache_dir) / "document-cache")
+    config.metadata_cache.enabled = cache
+    config.email_jobs.enabled = False
+    return config
+
+
+def make_app(config: AppConfig) -> FastAPI:
+    app = app_factory(config)
+    assert isinstance(app, FastAPI)
+
+    # the document routes are not mounted in the application yet
+    for router in (search_router, preview_router, download_router, email_router):
+        app.include_router(router, prefix=API_PREFIX)
+
+    app.dependency_overrides[decode_jwt] = lambda: {"groups": list(DrawingLocatorGroup)}
+    return app
+
+
+async def run_scenario(
+        client: httpx.AsyncClient,
+        name: str,
+        build: Callable[[random.Random], RequestSpec],
+        concurrency: int,
+        requests: int,
+        rng: random.Random,
+) -> ScenarioResult:
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            method, url, kwargs = build(rng)
+            started_at = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started_at)
+            errors += failed
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return ScenarioResult(
+        scenario=name,
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        rps=round(len(latencies) / elapsed, 1),
+        p50_ms=round(cuts[49] * 1000, 1),
+        p95_ms=round(cuts[94] * 1000, 1),
+        p99_ms=round(cuts[98] * 1000, 1),
+        max_ms=round(max(latencies) * 1000, 1),
+    )
+
+
+async def main(args: argparse.Namespace) -> list[ScenarioResult]:
+    graph = GraphStub(UpstreamProfile(args.graph_latency_median_ms, args.graph_latency_p99_ms, args.error_rate))
+    scenarios = make_scenarios(args.part_numbers, args.documents_per_part_number, args.batch_size)
+    rng = random.Random(args.seed)
+    results: list[ScenarioResult] = []
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        config = make_config(args.cache, cache_dir)
+        app = make_app(config)
+        sap_cpi = SAPCPIStub(
+            UpstreamProfile(args.latency_median_ms, args.latency_p99_ms, args.error_rate),
+            min_document_bytes=args.min_document_kb * 1024,
+            max_document_bytes=args.max_document_kb * 1024,
+            documents_per_part_number=args.documents_per_part_number,
+            base_path=httpx.URL(str(config.sap_cpi.document_base_url)).path,
+            seed=args.seed,
+        )
+
+        async with AsyncExitStack() as stack:
+            await stack.enter_async_context(app.router.lifespan_context(app))
+
+            await app.state.document_client.aclose()
+            app.state.document_client = DocumentClient.from_config(
+                config.sap_cpi,
+                content_cache=app.state.content_cache,
+                transport=httpx.ASGITransport(app=sap_cpi.app),
+            )
+            stack.push_async_callback(app.state.document_client.aclose)
+
+            await app.state.graph_client.aclose()
+            app.state.graph_client = GraphMailClient(
+                config.graph,
+                credential=StaticTokenCredential(),
+                transport=httpx.ASGITransport(app=graph.app),
+            )
+            stack.push_async_callback(app.state.graph_client.aclose)
+
+            client = await stack.enter_async_context(httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+                base_url="http://benchmark",
+                timeout=None,
+            ))
+
+            for name in args.scenarios:
+                for concurrency in args.concurrency:
+                    result = await run_scenario(client, name, scenarios[name], concurrency, args.requests, rng)
+                    results.append(result)
+                    print(  # noqa: T201
+                        f"{name:<9} c={concurrency:<4} {result.rps:8.1f} req/s  "
+                        f"p50 {result.p50_ms:8.1f} ms  p95 {result.p95_ms:8.1f} ms  "
+                        f"p99 {result.p99_ms:8.1f} ms  errors {result.errors}/{result.requests}"
+                    )
+
+    return results
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=["search", "preview", "download", "email"],
+                        default=["search", "preview", "download", "email"])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and concurrency level")
+    parser.add_argument("--part-numbers", type=int, default=500, help="size of the part number pool")
+    parser.add_argument("--documents-per-part-number", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=5, help="part numbers per search, documents per download/email")
+    parser.add_argument("--min-document-kb", type=int, default=64)
+    parser.add_argument("--max-document-kb", type=int, default=512)
+    parser.add_argument("--latency-median-ms", type=float, default=50.0, help="SAP CPI latency")
+    parser.add_argument("--latency-p99-ms", type=float, default=250.0, help="SAP CPI latency")
+    parser.add_argument("--graph-latency-median-ms", type=float, default=150.0)
+    parser.add_argument("--graph-latency-p99-ms", type=float, default=600.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of upstream calls failing with 503")
+    parser.add_argument("--cache", action="store_true", help="enable the content and metadata caches")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("load-benchmark.json"))
+    args = parser.parse_args()
+
+    # JWKS and readiness checks cannot reach their upstreams and would flood the output
+    logging.disable(logging.CRITICAL)
+
+    started_at = datetime.now(UTC)
+    results = asyncio.run(main(args))
+
+    report = {
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "parameters": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        "results": [asdict(result) for result in results],
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"results written to {args.output}")  # noqa: T201
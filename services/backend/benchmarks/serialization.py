@@ -0,0 +1,107 @@
+"""
+Serialization cost of a search response with 500 documents.
+
+The previous path validated the dumped DTOs into ``SearchOut``, validated
+the result again against ``response_model`` and encoded it with
+``jsonable_encoder`` and stdlib ``json``. The new path dumps the DTOs
+once and hands them to the orjson (or msgpack) response class.
+
+    cd services/backend && python -m benchmarks.serialization [--documents 500] [--rounds 200]
+"""
+import argparse
+import asyncio
+from datetime import UTC, datetime, timedelta
+import time
+from typing import Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from src.api.rest.v1.document.routes import DOCUMENT_LIST
+from src.apps.documents.dto import DocumentDTO, SearchResultDTO
+from src.apps.documents.schemas import SearchOut
+from src.apps.documents.schemas.search import NotFoundInfo, StaleInfo
+from src.infra.application.serialization import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    negotiated_response,
+)
+
+SEARCH_OUT_FIELD = create_response_field(name="Response_search_documents", type_=SearchOut)
+
+
+def make_result(documents: int) -> SearchResultDTO:
+    created = datetime(2024, 1, 1, tzinfo=UTC)
+    return SearchResultDTO(
+        documents=[
+            DocumentDTO(
+                id=f"DOC-{index:08d}",
+                part_number=100000 + index // 3,
+                rev="C",
+                date_created=created + timedelta(minutes=index),
+                file_size_bytes=250_000 + index,
+            )
+            for index in range(documents)
+        ],
+        not_found_part_numbers=[1, 2, 3],
+    )
+
+
+LOOP = asyncio.new_event_loop()
+
+
+def legacy_response(result: SearchResultDTO) -> bytes:
+    content = SearchOut(
+        data=[document.model_dump() for document in result.documents],
+        not_found=NotFoundInfo(part_numbers=result.not_found_part_numbers),
+        stale=StaleInfo(part_numbers=result.stale_part_numbers),
+    )
+    encoded = LOOP.run_until_complete(
+        serialize_response(field=SEARCH_OUT_FIELD, response_content=content, is_coroutine=True),
+    )
+    return JSONResponse(encoded).body
+
+
+def negotiated(accept: str) -> Callable[[SearchResultDTO], bytes]:
+    def response(result: SearchResultDTO) -> bytes:
+        return negotiated_response(
+            {
+                "data": DOCUMENT_LIST.dump_python(result.documents, mode="json"),
+                "not_found": {"part_numbers": result.not_found_part_numbers},
+                "stale": {"part_numbers": result.stale_part_numbers},
+            },
+            accept,
+        ).body
+
+    return response
+
+
+def measure(render: Callable[[SearchResultDTO], bytes], result: SearchResultDTO, rounds: int) -> tuple[float, int]:
+    size = len(render(result))  # warm up
+    started_at = time.perf_counter()
+    for _ in range(rounds):
+        render(result)
+    return (time.perf_counter() - started_at) / rounds * 1000, size
+
+
+def main(documents: int, rounds: int) -> None:
+    result = make_result(documents)
+    variants = [
+        ("legacy (2x validation, json)", legacy_response),
+        ("negotiated json", negotiated(JSON_MEDIA_TYPE)),
+        ("negotiated msgpack", negotiated(MSGPACK_MEDIA_TYPE)),
+    ]
+
+    for name, render in variants:
+        milliseconds, size = measure(render, result, rounds)
+        print(f"{name:<30} {milliseconds:7.3f} ms  {size:8d} bytes")  # noqa: T201
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    main(args.documents, args.rounds)
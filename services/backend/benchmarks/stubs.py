@@ -0,0 +1,210 @@
+"""
+In-process stand-ins for SAP CPI and Microsoft Graph, used by the load
+benchmark through ``httpx.ASGITransport``.
+
+Every response is delayed by a sample of a log-normal latency distribution
+and fails with a 503 at the configured error rate.
+"""
+import asyncio
+import base64
+from dataclasses import dataclass
+from datetime import UTC, datetime
+import itertools
+import math
+import random
+import re
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from src.apps.documents.constants import APIEndpoints
+from src.apps.documents.utils.odata import NEXT_LINK
+
+# z-score of the 99th percentile of the standard normal distribution
+_Z_99 = 2.326
+
+_PART_NUMBER_FILTER = re.compile(r"part_number eq (\d+)")
+
+
+@dataclass(frozen=True, slots=True)
+class UpstreamProfile:
+    latency_median_ms: float = 50.0
+    latency_p99_ms: float = 250.0
+    error_rate: float = 0.0
+
+    def sample_delay(self, rng: random.Random) -> float:
+        if self.latency_median_ms <= 0:
+            return 0.0
+
+        mu = math.log(self.latency_median_ms)
+        sigma = max(math.log(self.latency_p99_ms / self.latency_median_ms), 0.0) / _Z_99
+        return rng.lognormvariate(mu, sigma) / 1000
+
+    def sample_failure(self, rng: random.Random) -> bool:
+        return rng.random() < self.error_rate
+
+
+class _Stub:
+    def __init__(self, profile: UpstreamProfile, seed: int):
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.failures = 0
+
+    async def _respond(self) -> Response | None:
+        """
+        Waits for the sampled latency, returns an error response for failed calls.
+        """
+        self.requests += 1
+        await asyncio.sleep(self.profile.sample_delay(self.rng))
+
+        if self.profile.sample_failure(self.rng):
+            self.failures += 1
+            return JSONResponse({"error": "injected failure"}, status_code=503)
+        return None
+
+
+class SAPCPIStub(_Stub):
+    """
+    Serves ``APIEndpoints.DOCUMENTS_METADATA`` and ``SINGLE_FULL_DOCUMENT``.
+
+    Every part number has ``documents_per_part_number`` documents with ids
+    ``"<part_number>-<n>"``. Content is incompressible pseudo-PDF bytes of
+    a size drawn uniformly between the bounds, stable per document id.
+    Metadata is filtered by the part numbers in ``$filter``, projected to
+    ``$select`` and paged with ``@odata.nextLink`` every ``page_size``
+    documents. Routes are served under ``base_path``, the path of the
+    configured document base URL.
+    """
+
+    def __init__(
+            self,
+            profile: UpstreamProfile,
+            min_document_bytes: int,
+            max_document_bytes: int,
+            documents_per_part_number: int = 2,
+            page_size: int = 100,
+            base_path: str = "",
+            seed: int = 0,
+    ):
+        super().__init__(profile, seed)
+        self.min_document_bytes = min_document_bytes
+        self.max_document_bytes = max_document_bytes
+        self.documents_per_part_number = documents_per_part_number
+        self.page_size = page_size
+        self.seed = seed
+
+        self._encoded: dict[str, str] = {}
+        base_path = base_path.rstrip("/")
+        self.app = Starlette(routes=[
+            Route(f"{base_path}/{APIEndpoints.DOCUMENTS_METADATA}", self.documents_metadata),
+            Route(f"{base_path}/{APIEndpoints.SINGLE_FULL_DOCUMENT}", self.single_full_document),
+        ])
+
+    def document_ids(self, part_number: int) -> list[str]:
+        return [f"{part_number}-{index}" for index in range(self.documents_per_part_number)]
+
+    def document_size(self, document_id: str) -> int:
+        return random.Random(f"{self.seed}:{document_id}").randint(self.min_document_bytes, self.max_document_bytes)
+
+    async def documents_metadata(self, request: Request) -> Response:
+        if (error := await self._respond()) is not None:
+            return error
+
+        part_numbers = [int(value) for value in _PART_NUMBER_FILTER.findall(request.query_params.get("$filter", ""))]
+        created = datetime(2024, 1, 1, tzinfo=UTC).isoformat()
+        documents = [
+            {
+                "id": document_id,
+                "part_number": part_number,
+                "rev": "A",
+                "date_created": created,
+                "file_size_bytes": self.document_size(document_id),
+            }
+            for part_number in part_numbers
+            for document_id in self.document_ids(part_number)
+        ]
+        if selected := request.query_params.get("$select"):
+            fields = selected.split(",")
+            documents = [{name: document[name] for name in fields} for document in documents]
+
+        start = int(request.query_params.get("$skiptoken", 0))
+        end = start + self.page_size
+        body: dict = {"value": documents[start:end]}
+        if end < len(documents):
+            body[NEXT_LINK] = str(request.url.include_query_params(**{"$skiptoken": end}))
+        return JSONResponse(body)
+
+    async def single_full_document(self, request: Request) -> Response:
+        if (error := await self._respond()) is not None:
+            return error
+
+        document_id = request.path_params["document_id"]
+        return JSONResponse({"id": document_id, "rev": "A", "content": self._content(document_id)})
+
+    def _content(self, document_id: str) -> str:
+        if (encoded := self._encoded.get(document_id)) is None:
+            size = self.document_size(document_id)
+            content = b"%PDF-1.7\n" + random.Random(f"{self.seed}:{document_id}").randbytes(max(size - 9, 0))
+            encoded = self._encoded[document_id] = base64.b64encode(content).decode()
+        return encoded
+
+
+class GraphStub(_Stub):
+    """
+    Serves Graph ``sendMail`` and the draft / upload session calls used
+    for large attachments.
+    """
+
+    def __init__(self, profile: UpstreamProfile, seed: int = 0):
+        super().__init__(profile, seed)
+        self.sent = 0
+        self.uploaded_bytes = 0
+
+        self._draft_ids = itertools.count(1)
+        self.app = Starlette(routes=[
+            Route("/v1.0/users/{user}/sendMail", self.send_mail, methods=["POST"]),
+            Route("/v1.0/users/{user}/messages", self.create_draft, methods=["POST"]),
+            Route(
+                "/v1.0/users/{user}/messages/{message_id}/attachments/createUploadSession",
+                self.create_upload_session,
+                methods=["POST"],
+            ),
+            Route("/v1.0/users/{user}/messages/{message_id}/send", self.send_mail, methods=["POST"]),
+            Route("/v1.0/users/{user}/messages/{message_id}", self.delete_draft, methods=["DELETE"]),
+            Route("/upload/{message_id}", self.upload_chunk, methods=["PUT"]),
+        ])
+
+    async def send_mail(self, request: Request) -> Response:
+        await request.body()
+        if (error := await self._respond()) is not None:
+            return error
+
+        self.sent += 1
+        return Response(status_code=202)
+
+    async def create_draft(self, request: Request) -> Response:
+        await request.body()
+        if (error := await self._respond()) is not None:
+            return error
+
+        return JSONResponse({"id": f"draft-{next(self._draft_ids)}"}, status_code=201)
+
+    async def create_upload_session(self, request: Request) -> Response:
+        if (error := await self._respond()) is not None:
+            return error
+
+        upload_url = f"https://graph.microsoft.com/upload/{request.path_params['message_id']}"
+        return JSONResponse({"uploadUrl": upload_url})
+
+    async def upload_chunk(self, request: Request) -> Response:
+        self.uploaded_bytes += len(await request.body())
+        if (error := await self._respond()) is not None:
+            return error
+
+        return Response(status_code=200)
+
+    async def delete_draft(self, request: Request) -> Response:
+        return Response(status_code=204)
@@ -0,0 +1,82 @@
+"""
+Requests per second on ``/api/0/health/live`` with the previous
+``BaseHTTPMiddleware`` based tracing and with the pure ASGI middleware.
+
+Requests go through ``httpx.ASGITransport``, so the numbers measure the
+application stack only, without a server or network.
+
+    cd services/backend && python -m benchmarks.tracing_middleware [--requests 5000] [--concurrency 20]
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from fastapi import FastAPI, Request, Response
+import httpx
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.api.rest.v0.routes import api_v0_router
+from src.infra.application.setup.tracing import TracingMiddleware, trace_id
+
+HEADER_NAME = "X-Trace-ID"
+
+
+async def legacy_tracing(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    """
+    The tracing dispatch as it was implemented with ``BaseHTTPMiddleware``.
+    """
+    headers = MutableHeaders(request.headers)
+    trace_id_value = headers.get(HEADER_NAME.lower()) or uuid4().hex
+    trace_id.set(trace_id_value)
+
+    response = await call_next(request)
+    response.headers[HEADER_NAME] = trace_id_value
+    return response
+
+
+def make_app(pure_asgi: bool) -> FastAPI:
+    app = FastAPI()
+    if pure_asgi:
+        app.add_middleware(TracingMiddleware, header_name=HEADER_NAME)
+    else:
+        app.add_middleware(BaseHTTPMiddleware, dispatch=legacy_tracing)
+    app.include_router(api_v0_router, prefix="/api/0")
+    return app
+
+
+async def run(app: FastAPI, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(requests))
+
+        async def worker() -> None:
+            for _ in remaining:
+                response = await client.get("/api/0/health/live", headers={HEADER_NAME: "bench"})
+                assert response.headers[HEADER_NAME] == "bench"
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))  # warm up
+        remaining = iter(range(requests))
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started_at)
+
+
+async def main(requests: int, concurrency: int, rounds: int) -> None:
+    for name, pure_asgi in (("BaseHTTPMiddleware", False), ("pure ASGI", True)):
+        app = make_app(pure_asgi)
+        best = max([await run(app, requests, concurrency) for _ in range(rounds)])
+        print(f"{name:<20} {best:8.0f} req/s")  # noqa: T201
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.concurrency, args.rounds))
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, status
 from functools import partial
 
-from src.apps.health_check.views import health_check_handler, LIVENESS_PROBE
+from src.apps.health_check.views import health_check_handler, readiness_check_handler, LIVENESS_PROBE
 from src.apps.health_check.dto import HealthOut
+from src.apps.metrics.views import metrics_handler
 
 api_v0_router = APIRouter()
 
@@ -22,3 +23,29 @@ api_v0_router.add_api_route(
         },
     },
 )
+
+api_v0_router.add_api_route(
+    path="/health/ready",
+    endpoint=readiness_check_handler,
+    response_model=HealthOut,
+    methods=["GET"],
+    summary="Probe ready",
+    tags=["Telemetry"],
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Indicates that apps is ready to serve traffic",
+        },
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Indicates that apps is not ready",
+        },
+    },
+)
+
+api_v0_router.add_api_route(
+    path="/metrics",
+    endpoint=metrics_handler,
+    methods=["GET"],
+    summary="Metrics",
+    tags=["Telemetry"],
+    include_in_schema=False,
+)
@@ -1,9 +1,18 @@
-from fastapi import APIRouter, Depends, Path, Query
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, Header, Path, Query, status
+from fastapi.responses import Response, StreamingResponse
+import orjson
+from pydantic import TypeAdapter
 from src.api.rest.v1.paths import (
     DOWNLOAD as DOWNLOAD_PATH,
+    DOWNLOAD_STREAM as DOWNLOAD_STREAM_PATH,
     SEND_EMAIL as SEND_EMAIL_PATH,
+    SEND_EMAIL_JOB as SEND_EMAIL_JOB_PATH,
+    SEND_EMAIL_JOBS as SEND_EMAIL_JOBS_PATH,
     PREVIEW as PREVIEW_PATH,
-    SEARCH as SEARCH_PATH
+    SEARCH as SEARCH_PATH,
+    SEARCH_BULK as SEARCH_BULK_PATH,
 )
 from src.apps.documents.services.download_service import DownloadDocumentAPIService
 from src.apps.documents.services.email_service import EmailDocumentAPIService
@@ -11,12 +20,25 @@ from src.apps.documents.services.preview_service import PreviewDocumentAPIServic
 from src.apps.documents.services.search_service import SearchDocumentAPIService
 from src.apps.documents.dependency import (
     get_download_service,
+    get_email_job_queue,
     get_email_service,
     get_preview_service,
     get_search_service
 )
-from src.apps.documents.schemas import DownloadIn, DownloadOut, PreviewOut, SearchOut
-from src.apps.documents.schemas.email import EmailIn, EmailOut
+from src.apps.documents.constants import DOCUMENT_NAME, FAILED_DOCUMENTS_HEADER, MediaTypes
+from src.apps.documents.dto import DocumentDTO, EmailJobDTO, SearchChunkDTO
+from src.apps.documents.exceptions import DownloadDocumentNotFound, DownloadNotAcceptable, EmailJobNotFound
+from src.apps.documents.jobs import EmailJobQueue
+from src.apps.documents.utils import encode_base64
+from src.apps.documents.utils.byte_range import byte_range_response
+from src.apps.documents.schemas import BulkSearchIn, DownloadIn, DownloadOut, PreviewOut, SearchOut
+from src.apps.documents.schemas.email import EmailIn, EmailJobOut, EmailOut, FailedDocuments
+from src.apps.documents.schemas.search import (
+    NotFoundInfo,
+    SearchChunkErrorOut,
+    SearchErrorInfo,
+    SearchNotFoundOut,
+)
 from src.apps.auth.dependency import require_groups
 from src.apps.auth.policies import (
     DOWNLOAD_POLICY,
@@ -24,6 +46,8 @@ from src.apps.auth.policies import (
     PREVIEW_POLICY,
     SEARCH_POLICY
 )
+from src.infra.application.negotiation import negotiate
+from src.infra.application.serialization import MSGPACK_MEDIA_TYPE, negotiated_response
 
 download_router = APIRouter()
 email_router = APIRouter()
@@ -31,13 +55,59 @@ preview_router = APIRouter()
 search_router = APIRouter()
 
 
-@download_router.post(DOWNLOAD_PATH, response_model=DownloadOut)
+DOWNLOAD_MEDIA_TYPES = ["application/json", MediaTypes.ZIP, MediaTypes.PDF]
+
+
+@download_router.post(
+    DOWNLOAD_PATH,
+    response_model=DownloadOut,
+    responses={
+        200: {
+            "content": {MediaTypes.ZIP: {}, MediaTypes.PDF: {}},
+            "description": "Base64 JSON envelope, or raw bytes when requested via Accept",
+        },
+    },
+)
 async def download_documents(
         request: DownloadIn,
-        group_claims: dict = require_groups(*DOWNLOAD_POLICY['groups']),
+        accept: str | None = Header(None),
+        group_claims: dict = Depends(require_groups(*DOWNLOAD_POLICY['groups'])),
+        service: DownloadDocumentAPIService = Depends(get_download_service)
+):
+    media_type = negotiate(accept, DOWNLOAD_MEDIA_TYPES)
+    # a single document is still archived for a client that only accepts ZIP
+    result = await service.download(request.document_ids, archive=media_type == MediaTypes.ZIP)
+
+    if media_type in (MediaTypes.ZIP, MediaTypes.PDF):
+        if not result.content_bytes:
+            raise DownloadDocumentNotFound()
+        if media_type == MediaTypes.PDF and result.file_name.endswith(".zip"):
+            raise DownloadNotAcceptable()
+
+        headers = {"Content-Disposition": f'attachment; filename="{result.file_name}"'}
+        if result.failed_document_ids:
+            headers[FAILED_DOCUMENTS_HEADER] = ",".join(result.failed_document_ids)
+
+        return Response(content=result.content_bytes, media_type=media_type, headers=headers)
+
+    return DownloadOut(
+        file_name=result.file_name,
+        content=encode_base64(result.content_bytes),
+    )
+
+
+@download_router.post(DOWNLOAD_STREAM_PATH, response_class=StreamingResponse)
+async def download_documents_stream(
+        request: DownloadIn,
+        group_claims: dict = Depends(require_groups(*DOWNLOAD_POLICY['groups'])),
         service: DownloadDocumentAPIService = Depends(get_download_service)
 ):
-    return await service.download(request.document_ids)
+    result = service.download_stream(request.document_ids)
+    return StreamingResponse(
+        result.content,
+        media_type=MediaTypes.ZIP,
+        headers={"Content-Disposition": f'attachment; filename="{result.file_name}"'},
+    )
 
 
 @email_router.post(SEND_EMAIL_PATH, response_model=EmailOut)
@@ -49,19 +119,150 @@ async def send_email(
     return await service.prepare_and_send(request.document_ids, request.email)
 
 
-@preview_router.get(PREVIEW_PATH, response_model=PreviewOut)
+def _to_email_job_out(job: EmailJobDTO) -> EmailJobOut:
+    return EmailJobOut(
+        job_id=job.id,
+        status=job.status,
+        attempts=job.attempts,
+        failed=FailedDocuments(document_ids=job.failed_document_ids),
+        error=job.last_error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+@email_router.post(SEND_EMAIL_JOBS_PATH, response_model=EmailJobOut, status_code=status.HTTP_202_ACCEPTED)
+async def queue_email(
+        request: EmailIn,
+        group_claims: dict = Depends(require_groups(*EMAIL_POLICY['groups'])),
+        queue: EmailJobQueue = Depends(get_email_job_queue)
+):
+    job = await queue.enqueue(request.document_ids, request.email)
+    return _to_email_job_out(job)
+
+
+@email_router.get(SEND_EMAIL_JOB_PATH, response_model=EmailJobOut)
+async def get_email_job(
+        job_id: str = Path(..., description="Email job ID returned when queueing"),
+        group_claims: dict = Depends(require_groups(*EMAIL_POLICY['groups'])),
+        queue: EmailJobQueue = Depends(get_email_job_queue)
+):
+    job = await queue.get(job_id)
+    if job is None:
+        raise EmailJobNotFound()
+    return _to_email_job_out(job)
+
+
+DOCUMENT_LIST = TypeAdapter(list[DocumentDTO])
+
+SERIALIZED_RESPONSES = {
+    200: {"content": {MSGPACK_MEDIA_TYPE: {}}, "description": "JSON, or msgpack when requested via Accept"},
+}
+
+
+PREVIEW_MEDIA_TYPES = ["application/json", MediaTypes.PDF]
+
+
+@preview_router.get(
+    PREVIEW_PATH,
+    response_model=PreviewOut,
+    responses={
+        200: {
+            "content": {MSGPACK_MEDIA_TYPE: {}, MediaTypes.PDF: {}},
+            "description": "JSON, msgpack or the raw PDF when requested via Accept",
+        },
+        206: {"content": {MediaTypes.PDF: {}}, "description": "Byte range of the raw PDF"},
+        416: {"description": "Requested byte range is outside the document"},
+    },
+)
 async def preview_document(
         id: str = Path(..., description="Document ID to preview"),
-        group_claims: dict = require_groups(*PREVIEW_POLICY['groups']),
+        rev: str | None = Query(None, description="Document revision, enables content caching"),
+        accept: str | None = Header(None),
+        range_header: str | None = Header(None, alias="Range", description="Single byte range, only for the raw PDF"),
+        if_range: str | None = Header(None),
+        group_claims: dict = Depends(require_groups(*PREVIEW_POLICY['groups'])),
         service: PreviewDocumentAPIService = Depends(get_preview_service)
 ):
-    return await service.preview(id)
+    if negotiate(accept, PREVIEW_MEDIA_TYPES) == MediaTypes.PDF:
+        content = await service.preview_content(id, rev)
+
+        headers = {"Content-Disposition": f'inline; filename="{DOCUMENT_NAME.format(id)}"'}
+        if rev is not None:
+            headers["ETag"] = f'"{rev}"'
+        # a stale If-Range validator asks for the whole document instead
+        if if_range is not None and if_range != headers.get("ETag"):
+            range_header = None
+
+        return byte_range_response(content, MediaTypes.PDF, range_header, headers)
 
+    result = await service.preview(id, rev)
+    # the DTO holds the base64 text as ASCII bytes
+    return negotiated_response({"content_base64": result.content.decode()}, accept)
 
-@search_router.get(SEARCH_PATH, response_model=SearchOut)
+
+@search_router.get(SEARCH_PATH, response_model=SearchOut, responses=SERIALIZED_RESPONSES)
 async def search_documents(
         part_numbers: list[int] = Query(...),
-        group_claims: dict = require_groups(*SEARCH_POLICY['groups']),
+        accept: str | None = Header(None),
+        group_claims: dict = Depends(require_groups(*SEARCH_POLICY['groups'])),
+        service: SearchDocumentAPIService = Depends(get_search_service)
+):
+    result = await service.search(part_numbers)
+    # DTOs are already validated, dump them as the SearchOut shape without revalidating
+    return negotiated_response(
+        {
+            "data": DOCUMENT_LIST.dump_python(result.documents, mode="json"),
+            "not_found": {"part_numbers": result.not_found_part_numbers},
+            "stale": {"part_numbers": result.stale_part_numbers},
+        },
+        accept,
+    )
+
+
+async def _search_ndjson(
+        part_numbers: list[int],
+        chunks: AsyncIterator[SearchChunkDTO],
+) -> AsyncIterator[bytes]:
+    not_found: set[int] = set()
+
+    async for chunk in chunks:
+        if chunk.result is None:
+            error = SearchChunkErrorOut(
+                error=SearchErrorInfo(part_numbers=chunk.part_numbers, detail=chunk.error or ""),
+            )
+            yield error.model_dump_json().encode() + b"\n"
+            continue
+
+        not_found.update(chunk.result.not_found_part_numbers)
+        # a SearchChunkOut line, dumped from the validated DTOs like the plain search
+        yield orjson.dumps({
+            "data": DOCUMENT_LIST.dump_python(chunk.result.documents, mode="json"),
+            "stale": {"part_numbers": chunk.result.stale_part_numbers},
+        }) + b"\n"
+
+    last = SearchNotFoundOut(
+        not_found=NotFoundInfo(part_numbers=[
+            part_number for part_number in dict.fromkeys(part_numbers) if part_number in not_found
+        ]),
+    )
+    yield last.model_dump_json().encode() + b"\n"
+
+
+@search_router.post(
+    SEARCH_BULK_PATH,
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {MediaTypes.NDJSON: {}},
+            "description": "One line per chunk as it returns, then a line with the part numbers not found",
+        },
+    },
+)
+async def search_documents_bulk(
+        request: BulkSearchIn,
+        group_claims: dict = Depends(require_groups(*SEARCH_POLICY['groups'])),
         service: SearchDocumentAPIService = Depends(get_search_service)
 ):
-    return await service.search(part_numbers)
+    chunks = service.search_chunks(request.part_numbers)
+    return StreamingResponse(_search_ndjson(request.part_numbers, chunks), media_type=MediaTypes.NDJSON)
@@ -1,4 +1,8 @@
 SEARCH = "/search"
+SEARCH_BULK = "/search/bulk"
 PREVIEW = "/preview/{id}"
 DOWNLOAD = "/download"
+DOWNLOAD_STREAM = "/download/stream"
 SEND_EMAIL = "/send-email"
+SEND_EMAIL_JOBS = "/send-email/jobs"
+SEND_EMAIL_JOB = "/send-email/jobs/{job_id}"
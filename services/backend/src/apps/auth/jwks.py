@@ -1,31 +1,150 @@
-import httpx
+import asyncio
+import logging
 import time
 from typing import Any
+
+import httpx
+
 from src.config import get_config
+from src.config.config import AzureConfig
+from src.infra.application.metrics import metrics_registry
 
+logger = logging.getLogger(__name__)
 
-_cached_keys: list[dict[str, Any]] | None = None
-_cached_at: float | None = None
-_CACHE_TTL = 24 * 60 * 60 # 24 Hours. To be configured (Maybe move this variable to config file)
 
+jwks_refreshes = metrics_registry.counter("jwks_refreshes_total", "JWKS refreshes by outcome", ("outcome",))
 
-async def get_jwks() -> list[dict[str, Any]]:
-    global _cached_keys, _cached_at
 
-    now =  time.time()
+class JWKSManager:
+    """
+    Keeps the Azure AD signing keys in memory.
+
+    Keys are refreshed by a background task every ``ttl_seconds``. If they
+    are older than that anyway (the refresh failed), callers get the stale
+    keys while one refresh runs in the background. Concurrent fetches are
+    coalesced into one, and a token signed with an unknown ``kid`` forces a
+    refresh at most once per ``unknown_kid_refresh_interval_seconds``.
+    """
+
+    def __init__(
+            self,
+            jwks_url: str,
+            ttl_seconds: float,
+            unknown_kid_refresh_interval_seconds: float,
+            timeout_seconds: float,
+    ):
+        self.jwks_url = jwks_url
+        self.ttl_seconds = ttl_seconds
+        self.unknown_kid_refresh_interval_seconds = unknown_kid_refresh_interval_seconds
+        self.timeout_seconds = timeout_seconds
+
+        self._keys: list[dict[str, Any]] | None = None
+        self._fetched_at = 0.0
+        self._forced_at = float("-inf")
+        self._fetch: asyncio.Task[list[dict[str, Any]]] | None = None
+        self._refresher: asyncio.Task[None] | None = None
+        self._http_client: httpx.AsyncClient | None = None
+
+    @classmethod
+    def from_config(cls, config: AzureConfig) -> "JWKSManager":
+        return cls(
+            jwks_url=config.jwks_url,
+            ttl_seconds=config.jwks_ttl_seconds,
+            unknown_kid_refresh_interval_seconds=config.jwks_unknown_kid_refresh_interval_seconds,
+            timeout_seconds=config.jwks_timeout_seconds,
+        )
+
+    async def get_keys(self) -> list[dict[str, Any]]:
+        if self._keys is None:
+            return await self._refresh()
+
+        if time.monotonic() - self._fetched_at >= self.ttl_seconds:
+            self._start_fetch()
+
+        return self._keys
+
+    async def refresh_for_unknown_kid(self) -> bool:
+        """
+        Refetches the keys unless that was done recently, returns whether it did.
+        """
+        now = time.monotonic()
+        if now - self._forced_at < self.unknown_kid_refresh_interval_seconds:
+            return False
+
+        self._forced_at = now
+        try:
+            await self._refresh()
+        except Exception as e:
+            logger.warning("JWKS refresh for unknown kid failed: %s", e)
+            return False
+        return True
+
+    async def start(self) -> None:
+        self._refresher = asyncio.create_task(self._refresh_periodically(), name="jwks-refresher")
 
-    if _cached_keys and _cached_at and now - _cached_at < _CACHE_TTL:
-        return _cached_keys
+    async def stop(self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+            self._refresher = None
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(get_config().azure.jwks_url)
+        if self._fetch is not None:
+            self._fetch.cancel()
+
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def _refresh(self) -> list[dict[str, Any]]:
+        return await asyncio.shield(self._start_fetch())
+
+    def _start_fetch(self) -> asyncio.Task[list[dict[str, Any]]]:
+        if self._fetch is None:
+            self._fetch = asyncio.create_task(self._fetch_keys(), name="jwks-fetch")
+            self._fetch.add_done_callback(self._on_fetched)
+        return self._fetch
+
+    def _on_fetched(self, task: asyncio.Task) -> None:
+        self._fetch = None
+        if task.cancelled():
+            return
+
+        if task.exception() is not None:
+            jwks_refreshes.inc("failure")
+            logger.error("JWKS refresh failed: %s", task.exception())
+        else:
+            jwks_refreshes.inc("success")
+
+    async def _fetch_keys(self) -> list[dict[str, Any]]:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=httpx.Timeout(self.timeout_seconds))
+
+        resp = await self._http_client.get(self.jwks_url)
         resp.raise_for_status()
 
         keys = resp.json().get('keys')
         if not keys:
             raise RuntimeError('JWKS endpoint did not return keys')
 
-        _cached_keys = keys
-        _cached_at = now
-
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+        logger.info("JWKS refreshed with %d keys", len(keys))
         return keys
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            try:
+                await self._refresh()
+                delay = self.ttl_seconds
+            except Exception:
+                # already logged, stale keys keep being served meanwhile
+                delay = self.unknown_kid_refresh_interval_seconds
+
+            await asyncio.sleep(delay)
+
+
+jwks_manager = JWKSManager.from_config(get_config().azure)
+
+
+async def get_jwks() -> list[dict[str, Any]]:
+    return await jwks_manager.get_keys()
@@ -2,7 +2,8 @@ from fastapi import HTTPException, Depends
 from fastapi.security import OAuth2PasswordBearer
 from jwt.algorithms import RSAAlgorithm
 from src.config import get_config
-from src.apps.auth.jwks import get_jwks
+from src.apps.auth.jwks import get_jwks, jwks_manager
+from src.apps.auth.token_cache import VerifiedTokenCache
 from typing import Any
 import jwt
 
@@ -14,18 +15,50 @@ oauth2_scheme = OAuth2PasswordBearer(f"https://login.microsoftonline.com/{config
 ISSUER = f"https://login.microsoftonline.com/{config.azure.tenant_id}/v2.0"
 
 
+# kid -> parsed public key, rebuilt only when the JWKS content changes
+_signing_keys: dict[str, Any] = {}
+_signing_keys_source: list[dict[str, Any]] | None = None
+
+verified_tokens = VerifiedTokenCache(config.azure.verified_token_cache_size)
+
+
+def _update_signing_keys(jwks: list[dict[str, Any]]) -> None:
+    global _signing_keys, _signing_keys_source
+
+    # refreshes return a new list, compare the keys themselves
+    if jwks != _signing_keys_source:
+        _signing_keys = {key["kid"]: RSAAlgorithm.from_jwk(key) for key in jwks if key.get('kid')}
+        _signing_keys_source = jwks
+        # tokens verified with keys that may have been rotated out
+        verified_tokens.clear()
+
+
 async def get_signing_key(token_kid: str):
-    jwks = await get_jwks()
+    _update_signing_keys(await get_jwks())
 
-    for key in jwks:
-        if key.get('kid') == token_kid:
-            return RSAAlgorithm.from_jwk(key)
+    public_key = _signing_keys.get(token_kid)
+    if public_key is None and await jwks_manager.refresh_for_unknown_kid():
+        # Azure may have rotated its keys since the last refresh
+        _update_signing_keys(await get_jwks())
+        public_key = _signing_keys.get(token_kid)
 
-    raise HTTPException(401, detail="Invalid token: Unknown 'kid'")
+    if public_key is None:
+        raise HTTPException(401, detail="Invalid token: Unknown 'kid'")
+
+    return public_key
 
 
 async def decode_jwt(token: str = Depends(oauth2_scheme)) -> dict[str, Any]:
-    header = jwt.get_unverified_header(token)
+    digest = verified_tokens.digest(token)
+    claims = verified_tokens.get(digest)
+    if claims is not None:
+        return dict(claims)
+
+    try:
+        header = jwt.get_unverified_header(token)
+    except jwt.InvalidTokenError:
+        raise HTTPException(401, detail="Invalid token") from None
+
     kid = header.get('kid')
 
     if not kid:
@@ -41,10 +74,12 @@ async def decode_jwt(token: str = Depends(oauth2_scheme)) -> dict[str, Any]:
             audience=config.azure.client_id,
             issuer=ISSUER,
         )
-        return payload
 
     except jwt.ExpiredSignatureError:
         raise HTTPException(401, detail="Expired token")
 
     except jwt.InvalidTokenError:
         raise HTTPException(401, detail="Invalid token")
+
+    verified_tokens.put(digest, payload)
+    return dict(payload)
@@ -0,0 +1,48 @@
+from collections import OrderedDict
+import hashlib
+import time
+from typing import Any
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already verified tokens, keyed by their SHA-256 digest.
+
+    Entries expire at the token's ``exp`` claim, so a cached token is never
+    accepted for longer than a full verification would accept it.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[dict[str, Any], float]] = OrderedDict()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, digest: bytes) -> dict[str, Any] | None:
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+
+        claims, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[digest]
+            return None
+
+        self._entries.move_to_end(digest)
+        return claims
+
+    def put(self, digest: bytes, claims: dict[str, Any]) -> None:
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)) or self.max_entries <= 0:
+            return
+
+        self._entries[digest] = (claims, float(expires_at))
+        self._entries.move_to_end(digest)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
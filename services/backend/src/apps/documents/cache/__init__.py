@@ -0,0 +1,13 @@
+from src.apps.documents.cache.content import CacheStats, DocumentContentCache
+from src.apps.documents.cache.index import MetadataIndex, MetadataIndexSync
+from src.apps.documents.cache.metadata import MetadataCacheStats, PartNumberMetadataCache
+
+
+__all__ = [
+    "CacheStats",
+    "DocumentContentCache",
+    "MetadataIndex",
+    "MetadataCacheStats",
+    "MetadataIndexSync",
+    "PartNumberMetadataCache",
+]
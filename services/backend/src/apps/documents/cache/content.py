@@ -0,0 +1,257 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
+import logging
+import mmap
+import os
+from pathlib import Path
+import shutil
+import time
+from uuid import uuid4
+
+from src.config.config import ContentCacheConfig
+from src.infra.application.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+cache_events = metrics_registry.counter(
+    "document_cache_events_total", "Cache hits, misses and evictions", ("cache", "event"),
+)
+
+
+CacheKey = tuple[str, str]
+
+_MAX_TRACKED_REVISIONS = 10_000
+
+
+@dataclass
+class CacheStats:
+    """
+    Event counts of one cache, also exported as ``document_cache_events_total``.
+    """
+    cache: str = field(repr=False)
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+
+    def record(self, event: str, amount: int = 1) -> None:
+        if amount:
+            setattr(self, event, getattr(self, event) + amount)
+            cache_events.inc(self.cache, event, amount=amount)
+
+
+class MemoryLRU:
+    """
+    In-memory LRU bounded by the total size of the stored values.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._items: OrderedDict[CacheKey, bytes] = OrderedDict()
+
+    def get(self, key: CacheKey) -> bytes | None:
+        content = self._items.get(key)
+        if content is not None:
+            self._items.move_to_end(key)
+        return content
+
+    def put(self, key: CacheKey, content: bytes) -> int:
+        """
+        Stores ``content`` and returns the number of evicted entries.
+        """
+        if len(content) > self.max_bytes:
+            return 0
+
+        if (previous := self._items.pop(key, None)) is not None:
+            self.size_bytes -= len(previous)
+
+        self._items[key] = content
+        self.size_bytes += len(content)
+
+        evicted = 0
+        while self.size_bytes > self.max_bytes:
+            _, dropped = self._items.popitem(last=False)
+            self.size_bytes -= len(dropped)
+            evicted += 1
+        return evicted
+
+
+class DiskLRU:
+    """
+    Size-capped on-disk LRU tier.
+
+    Files are content-addressed by SHA-256 so identical documents stored
+    under several keys share one file. The key index lives in memory and is
+    private to the worker process, so each worker owns its own directory.
+    """
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._index: OrderedDict[CacheKey, str] = OrderedDict()
+        self._refs: dict[str, int] = {}
+        self._sizes: dict[str, int] = {}
+
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _file_path(self, digest: str) -> Path:
+        return self.path / digest[:2] / digest
+
+    async def get(self, key: CacheKey) -> bytes | None:
+        digest = self._index.get(key)
+        if digest is None:
+            return None
+
+        self._index.move_to_end(key)
+        try:
+            return await asyncio.to_thread(self._read, self._file_path(digest))
+        except FileNotFoundError:
+            if self._index.get(key) == digest:
+                self._forget(key)
+            return None
+
+    async def put(self, key: CacheKey, content: bytes) -> int:
+        """
+        Stores ``content`` and returns the number of evicted entries.
+        """
+        if len(content) > self.max_bytes:
+            return 0
+
+        digest = hashlib.sha256(content).hexdigest()
+        if digest not in self._refs:
+            await asyncio.to_thread(self._write, self._file_path(digest), content)
+
+        # re-check, a concurrent put may have stored the same content meanwhile
+        if digest not in self._refs:
+            self._refs[digest] = 0
+            self._sizes[digest] = len(content)
+            self.size_bytes += len(content)
+
+        if key in self._index:
+            self._forget(key)
+        self._index[key] = digest
+        self._refs[digest] += 1
+
+        evicted = 0
+        while self.size_bytes > self.max_bytes and self._index:
+            oldest_key = next(iter(self._index))
+            self._forget(oldest_key)
+            evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+        self._index.clear()
+        self._refs.clear()
+        self._sizes.clear()
+        self.size_bytes = 0
+
+    def _forget(self, key: CacheKey) -> None:
+        digest = self._index.pop(key)
+        self._refs[digest] -= 1
+
+        if self._refs[digest] == 0:
+            del self._refs[digest]
+            self.size_bytes -= self._sizes.pop(digest)
+            self._file_path(digest).unlink(missing_ok=True)
+
+    @staticmethod
+    def _read(file_path: Path) -> bytes:
+        with open(file_path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return b""
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return mapped[:]
+
+    @staticmethod
+    def _write(file_path: Path, content: bytes) -> None:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = file_path.with_name(f"{file_path.name}.{uuid4().hex}.tmp")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, file_path)
+
+
+class DocumentContentCache:
+    """
+    Two-tier document content cache keyed by document id and revision.
+
+    Content of a given revision never changes, so entries need no expiry.
+    When the caller does not know the revision, the last revision seen for
+    the document is reused for ``revision_ttl_seconds`` before the upstream
+    is asked again.
+    """
+
+    def __init__(
+            self,
+            memory_max_bytes: int,
+            disk_path: Path | None,
+            disk_max_bytes: int,
+            revision_ttl_seconds: float,
+    ):
+        self.memory = MemoryLRU(memory_max_bytes)
+        self.disk = DiskLRU(disk_path, disk_max_bytes) if disk_path and disk_max_bytes else None
+        self.revision_ttl_seconds = revision_ttl_seconds
+        self.stats = CacheStats("content")
+        # oldest first, every revision shares the same TTL
+        self._revisions: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    @classmethod
+    def from_config(cls, config: ContentCacheConfig) -> "DocumentContentCache":
+        disk_path = Path(config.disk_path) / str(os.getpid()) if config.disk_path else None
+        return cls(
+            memory_max_bytes=config.memory_max_bytes,
+            disk_path=disk_path,
+            disk_max_bytes=config.disk_max_bytes,
+            revision_ttl_seconds=config.revision_ttl_seconds,
+        )
+
+    def known_revision(self, document_id: str) -> str | None:
+        revision = self._revisions.get(document_id)
+        if revision is None:
+            return None
+
+        rev, expires_at = revision
+        if expires_at < time.monotonic():
+            del self._revisions[document_id]
+            return None
+        return rev
+
+    async def get(self, document_id: str, rev: str) -> bytes | None:
+        key = (document_id, rev)
+
+        if (content := self.memory.get(key)) is not None:
+            self.stats.record("memory_hits")
+            return content
+
+        if self.disk is not None and (content := await self.disk.get(key)) is not None:
+            self.stats.record("disk_hits")
+            self.stats.record("memory_evictions", self.memory.put(key, content))
+            return content
+
+        self.stats.record("misses")
+        return None
+
+    async def put(self, document_id: str, rev: str, content: bytes) -> None:
+        key = (document_id, rev)
+        now = time.monotonic()
+
+        self._revisions[document_id] = (rev, now + self.revision_ttl_seconds)
+        self._revisions.move_to_end(document_id)
+        while len(self._revisions) > _MAX_TRACKED_REVISIONS:
+            self._revisions.popitem(last=False)
+
+        self.stats.record("memory_evictions", self.memory.put(key, content))
+        if self.disk is not None:
+            self.stats.record("disk_evictions", await self.disk.put(key, content))
+
+    async def aclose(self) -> None:
+        logger.info("Document content cache stats: %s", self.stats)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.clear)
@@ -0,0 +1,259 @@
+from array import array
+import asyncio
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import UTC, datetime
+import logging
+import time
+from typing import Awaitable, Callable, Iterable
+
+from src.apps.documents.dto import DocumentDTO
+from src.config.config import MetadataIndexConfig
+from src.infra.application.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+index_syncs = metrics_registry.counter(
+    "metadata_index_syncs_total", "Metadata index syncs by kind and outcome", ("kind", "outcome"),
+)
+
+
+# Returns up to ``limit`` documents created at or after the watermark (all if None), oldest first
+FetchDocumentsPage = Callable[[datetime | None, int], Awaitable[list[DocumentDTO]]]
+
+_Row = tuple[int, str, str, float, int]
+
+
+@dataclass(frozen=True, slots=True)
+class _Columns:
+    """
+    Document metadata stored column-wise, sorted by part number and id.
+
+    ``id_order`` holds the row positions sorted by id, for lookups by id.
+    """
+    part_numbers: array
+    ids: list[str]
+    revs: list[str]
+    created: array
+    sizes: array
+    id_order: array
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[_Row]) -> "_Columns":
+        ordered = sorted(rows)
+        ids = [row[1] for row in ordered]
+        return cls(
+            part_numbers=array("q", (row[0] for row in ordered)),
+            ids=ids,
+            revs=[row[2] for row in ordered],
+            created=array("d", (row[3] for row in ordered)),
+            sizes=array("q", (row[4] for row in ordered)),
+            id_order=array("q", sorted(range(len(ids)), key=ids.__getitem__)),
+        )
+
+    def find(self, document_id: str) -> int | None:
+        position = bisect_left(self.id_order, document_id, key=self.ids.__getitem__)
+        if position < len(self.id_order) and self.ids[self.id_order[position]] == document_id:
+            return self.id_order[position]
+        return None
+
+    def rows(self) -> Iterable[_Row]:
+        return zip(self.part_numbers, self.ids, self.revs, self.created, self.sizes, strict=True)
+
+
+def _created_utc(document: DocumentDTO) -> datetime:
+    created = document.date_created
+    if created.tzinfo is None:
+        # upstream dates without an offset are UTC, not the host's local time
+        return created.replace(tzinfo=UTC)
+    return created
+
+
+def _to_row(document: DocumentDTO) -> _Row:
+    return (
+        document.part_number,
+        document.id,
+        document.rev,
+        _created_utc(document).timestamp(),
+        document.file_size_bytes,
+    )
+
+
+class MetadataIndex:
+    """
+    Local index of document metadata by part number.
+
+    Rows are kept in columns sorted by part number, so a lookup is two
+    binary searches and a document costs a few dozen bytes instead of a
+    model object. Updates build new columns and swap them in at once,
+    lookups never see a partially applied sync.
+
+    The index answers searches only while it is current: a full sync has
+    completed and the last sync is at most ``max_lag_seconds`` old.
+    """
+
+    def __init__(self, max_lag_seconds: float):
+        self.max_lag_seconds = max_lag_seconds
+        self.watermark: datetime | None = None
+
+        self._columns = _Columns.from_rows(())
+        self._complete = False
+        self._synced_at = float("-inf")
+
+    def __len__(self) -> int:
+        return len(self._columns.ids)
+
+    @property
+    def lag_seconds(self) -> float:
+        return time.monotonic() - self._synced_at
+
+    def is_current(self) -> bool:
+        return self._complete and self.lag_seconds <= self.max_lag_seconds
+
+    def lookup(self, part_numbers: list[int]) -> dict[int, list[DocumentDTO]]:
+        """
+        Returns the documents of every requested part number, empty lists included.
+        """
+        columns = self._columns
+        results: dict[int, list[DocumentDTO]] = {}
+
+        for part_number in part_numbers:
+            start = bisect_left(columns.part_numbers, part_number)
+            end = bisect_right(columns.part_numbers, part_number, start)
+            results[part_number] = [
+                DocumentDTO.model_construct(
+                    id=columns.ids[row],
+                    part_number=part_number,
+                    rev=columns.revs[row],
+                    date_created=datetime.fromtimestamp(columns.created[row], UTC),
+                    file_size_bytes=columns.sizes[row],
+                )
+                for row in range(start, end)
+            ]
+
+        return results
+
+    def document_size(self, document_id: str) -> int | None:
+        """
+        Size of an indexed document, if any.
+        """
+        columns = self._columns
+        row = columns.find(document_id)
+        return columns.sizes[row] if row is not None else None
+
+    def replace(self, documents: list[DocumentDTO]) -> None:
+        """
+        Replaces the whole index with the result of a full sync.
+        """
+        self._columns = _Columns.from_rows(map(_to_row, documents))
+        self.watermark = max(map(_created_utc, documents), default=None)
+        self._mark_synced(complete=True)
+
+    def apply(self, documents: list[DocumentDTO]) -> None:
+        """
+        Upserts the result of a delta sync, a document replaces any row with its id.
+        """
+        if documents:
+            changed_ids = {document.id for document in documents}
+            self._columns = _Columns.from_rows([
+                *(row for row in self._columns.rows() if row[1] not in changed_ids),
+                *map(_to_row, documents),
+            ])
+            newest = max(map(_created_utc, documents))
+            self.watermark = newest if self.watermark is None else max(self.watermark, newest)
+
+        self._mark_synced(complete=self._complete)
+
+    def _mark_synced(self, complete: bool) -> None:
+        self._complete = complete
+        self._synced_at = time.monotonic()
+
+
+class MetadataIndexSync:
+    """
+    Keeps a ``MetadataIndex`` current in the background.
+
+    Starts with a full sync, then fetches documents created since the
+    index watermark every ``interval_seconds``. The watermark is
+    inclusive and pages are chained by the newest ``date_created`` seen,
+    so a new revision is picked up once its row appears upstream. A full
+    sync runs every ``full_sync_interval_seconds`` to drop documents
+    deleted upstream.
+    """
+
+    def __init__(
+            self,
+            index: MetadataIndex,
+            fetch_page: FetchDocumentsPage,
+            page_size: int,
+            interval_seconds: float,
+            full_sync_interval_seconds: float,
+    ):
+        self.index = index
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.interval_seconds = interval_seconds
+        self.full_sync_interval_seconds = full_sync_interval_seconds
+
+        self._full_synced_at = float("-inf")
+        self._task: asyncio.Task[None] | None = None
+
+    @classmethod
+    def from_config(cls, config: MetadataIndexConfig, fetch_page: FetchDocumentsPage) -> "MetadataIndexSync":
+        return cls(
+            index=MetadataIndex(max_lag_seconds=config.max_lag_seconds),
+            fetch_page=fetch_page,
+            page_size=config.page_size,
+            interval_seconds=config.sync_interval_seconds,
+            full_sync_interval_seconds=config.full_sync_interval_seconds,
+        )
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._sync_periodically(), name="metadata-index-sync")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def sync(self, full: bool) -> None:
+        watermark = None if full else self.index.watermark
+        # pages overlap at the inclusive watermark, the latest row per id wins
+        by_id: dict[str, DocumentDTO] = {}
+
+        while True:
+            page = await self.fetch_page(watermark, self.page_size)
+            by_id.update((document.id, document) for document in page)
+            if len(page) < self.page_size:
+                break
+
+            newest = max(map(_created_utc, page))
+            if watermark is not None and newest <= watermark:
+                logger.warning("More than %d documents created at %s, rest left to next sync", self.page_size, newest)
+                break
+            watermark = newest
+
+        documents = list(by_id.values())
+        if full:
+            await asyncio.to_thread(self.index.replace, documents)
+            self._full_synced_at = time.monotonic()
+        else:
+            await asyncio.to_thread(self.index.apply, documents)
+
+        logger.info("Metadata index %s sync fetched %d documents, %d indexed",
+                    "full" if full else "delta", len(documents), len(self.index))
+
+    async def _sync_periodically(self) -> None:
+        while True:
+            full = time.monotonic() - self._full_synced_at >= self.full_sync_interval_seconds
+            kind = "full" if full else "delta"
+            try:
+                await self.sync(full)
+                index_syncs.inc(kind, "success")
+            except Exception:
+                index_syncs.inc(kind, "failure")
+                logger.exception("Metadata index %s sync failed", kind)
+
+            await asyncio.sleep(self.interval_seconds)
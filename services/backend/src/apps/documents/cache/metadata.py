@@ -0,0 +1,131 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import time
+
+from src.apps.documents.cache.content import cache_events
+from src.apps.documents.dto import DocumentDTO
+from src.config.config import MetadataCacheConfig
+
+
+@dataclass
+class MetadataCacheStats:
+    """
+    Event counts of the metadata cache, also exported as
+    ``document_cache_events_total{cache="metadata"}``.
+    """
+    fresh_hits: int = 0
+    negative_hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def record(self, event: str, amount: int = 1) -> None:
+        if amount:
+            setattr(self, event, getattr(self, event) + amount)
+            cache_events.inc("metadata", event, amount=amount)
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    documents: list[DocumentDTO]
+    fresh_until: float
+    stale_until: float
+
+
+class PartNumberMetadataCache:
+    """
+    Per part number cache of search results.
+
+    Part numbers without documents are cached as negative entries with a
+    shorter TTL. Expired entries are kept for ``stale_ttl_seconds`` so they
+    can still be served while SAP CPI is unavailable.
+    """
+
+    def __init__(
+            self,
+            ttl_seconds: float,
+            negative_ttl_seconds: float,
+            stale_ttl_seconds: float,
+            max_entries: int,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.max_entries = max_entries
+        self.stats = MetadataCacheStats()
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._document_sizes: dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, config: MetadataCacheConfig) -> "PartNumberMetadataCache":
+        return cls(
+            ttl_seconds=config.ttl_seconds,
+            negative_ttl_seconds=config.negative_ttl_seconds,
+            stale_ttl_seconds=config.stale_ttl_seconds,
+            max_entries=config.max_entries,
+        )
+
+    def get_fresh(self, part_numbers: list[int]) -> tuple[dict[int, list[DocumentDTO]], list[int]]:
+        """
+        Splits ``part_numbers`` into fresh cached results and misses.
+        """
+        now = time.monotonic()
+        hits: dict[int, list[DocumentDTO]] = {}
+        misses: list[int] = []
+
+        for part_number in part_numbers:
+            entry = self._entries.get(part_number)
+
+            if entry is not None and entry.fresh_until >= now:
+                self._entries.move_to_end(part_number)
+                hits[part_number] = entry.documents
+                self.stats.record("fresh_hits" if entry.documents else "negative_hits")
+            else:
+                misses.append(part_number)
+                self.stats.record("misses")
+
+        return hits, misses
+
+    def get_stale(self, part_numbers: list[int]) -> dict[int, list[DocumentDTO]]:
+        """
+        Returns expired but still retained entries, used when upstream fails.
+        """
+        now = time.monotonic()
+        stale = {
+            part_number: entry.documents
+            for part_number in part_numbers
+            if (entry := self._entries.get(part_number)) is not None and entry.stale_until >= now
+        }
+        self.stats.record("stale_hits", len(stale))
+        return stale
+
+    def document_size(self, document_id: str) -> int | None:
+        """
+        Size of a document seen in a retained search result, if any.
+        """
+        return self._document_sizes.get(document_id)
+
+    def put_many(self, results: dict[int, list[DocumentDTO]]) -> None:
+        now = time.monotonic()
+
+        for part_number, documents in results.items():
+            self._forget_sizes(self._entries.get(part_number))
+            self._document_sizes.update((document.id, document.file_size_bytes) for document in documents)
+
+            ttl = self.ttl_seconds if documents else self.negative_ttl_seconds
+            self._entries[part_number] = _Entry(
+                documents=documents,
+                fresh_until=now + ttl,
+                stale_until=now + ttl + self.stale_ttl_seconds,
+            )
+            self._entries.move_to_end(part_number)
+
+        while len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._forget_sizes(evicted)
+            self.stats.record("evictions")
+
+    def _forget_sizes(self, entry: _Entry | None) -> None:
+        if entry is not None:
+            for document in entry.documents:
+                self._document_sizes.pop(document.id, None)
@@ -1,54 +1,302 @@
+import base64
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, nullcontext
+from datetime import datetime
+import importlib.util
+import json
+import time
+
 import httpx
 import logging
 
+from src.apps.documents.cache import DocumentContentCache
 from src.apps.documents.constants import DEFAULT_TIMEOUT_SECONDS
 from src.apps.documents.decorators import handle_http_errors
-from src.apps.documents.constants import APIEndpoints
+from src.apps.documents.dto import DocumentDTO
+from src.apps.documents.utils.concurrency_limiter import AdaptiveConcurrencyLimiter, LimiterSlot
+from src.apps.documents.utils.feed_parser import AtomFeedParser, is_xml_media_type
+from src.apps.documents.utils.odata import NEXT_LINK, ODataQuery, any_of, eq, ge
+from src.apps.documents.utils.single_flight import SingleFlight
+from src.apps.documents.constants import APIEndpoints, ODataFields
+from src.config.config import SAPCPIConfig
+from src.infra.application.metrics import metrics_registry
 
 
 logger = logging.getLogger(__name__)
 
 
+upstream_latency = metrics_registry.histogram(
+    "sap_cpi_request_duration_seconds", "SAP CPI request latency by endpoint", ("endpoint",),
+)
+upstream_responses = metrics_registry.counter(
+    "sap_cpi_responses_total", "SAP CPI responses by endpoint and status code", ("endpoint", "status"),
+)
+
+
+# only what DocumentDTO needs is requested from SAP CPI
+DOCUMENT_FIELDS = tuple(DocumentDTO.model_fields)
+
+
+def _records(json_response: dict) -> list[dict]:
+    # OData collections are under "value", the legacy flow answered with "data"
+    return json_response.get("value", json_response.get("data", []))
+
+
 class DocumentClient:
     def __init__(
             self,
             base_url: str,
             username: str,
             password: str,
-            timeout: int = DEFAULT_TIMEOUT_SECONDS
+            timeout: int = DEFAULT_TIMEOUT_SECONDS,
+            limits: httpx.Limits | None = None,
+            http2: bool = False,
+            content_cache: DocumentContentCache | None = None,
+            limiter: AdaptiveConcurrencyLimiter | None = None,
+            transport: httpx.AsyncBaseTransport | None = None,
     ):
         self.base_url = base_url if base_url.endswith("/") else base_url + "/"
 
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but 'h2' package is not installed, falling back to HTTP/1.1")
+            http2 = False
+
         self.http_client = httpx.AsyncClient(
             auth=(username, password),
             timeout=httpx.Timeout(timeout),
+            limits=limits or httpx.Limits(),
+            http2=http2,
             follow_redirects=True,
+            transport=transport,
         )
+        self.content_cache = content_cache
+        self.limiter = limiter
+
+        self._content_flights: SingleFlight[tuple[str, str | None], bytes | None] = SingleFlight()
+        self._metadata_flights: SingleFlight[int, list[DocumentDTO]] = SingleFlight()
 
         logger.debug(
-            "DocumentClient initialized with base_url=%s, timeout=%s",
+            "DocumentClient initialized with base_url=%s, timeout=%s, limits=%s, http2=%s",
             self.base_url,
-            timeout
+            timeout,
+            limits,
+            http2,
         )
 
-    @handle_http_errors("get")
-    async def get(self, url: str, params: dict | None = None):
-        full_url = f"{self.base_url}{url}"
+    @classmethod
+    def from_config(
+            cls,
+            config: SAPCPIConfig,
+            content_cache: DocumentContentCache | None = None,
+            transport: httpx.AsyncBaseTransport | None = None,
+    ) -> "DocumentClient":
+        """
+        Builds the pooled client shared by all requests of a worker.
 
-        # todo: transform request form into odata protocol
+        ``transport`` replaces the network transport, e.g. to run against
+        an in-process stand-in.
+        """
+        return cls(
+            base_url=str(config.document_base_url),
+            username=config.client_id,
+            password=config.client_secret,
+            timeout=config.timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry_seconds,
+            ),
+            http2=config.http2,
+            content_cache=content_cache,
+            limiter=AdaptiveConcurrencyLimiter(
+                initial_limit=config.limiter_initial_limit,
+                min_limit=config.limiter_min_limit,
+                max_limit=config.limiter_max_limit,
+                queue_timeout_seconds=config.limiter_queue_timeout_seconds,
+                latency_threshold_seconds=config.limiter_latency_threshold_seconds,
+                backoff_ratio=config.limiter_backoff_ratio,
+                name="sap_cpi",
+            ),
+            transport=transport,
+        )
+
+    async def aclose(self) -> None:
+        await self.http_client.aclose()
+        logger.debug("DocumentClient closed")
+
+    async def get(self, url: str, params: dict | None = None, *, endpoint: str | None = None):
+        """
+        ``url`` is relative to the base URL, or absolute (e.g. an OData next
+        link). ``endpoint`` is the URL template used to label metrics,
+        ``url`` itself by default.
+        """
+        full_url = url if "://" in url else f"{self.base_url}{url}"
+        endpoint = endpoint or url
+
+        slot_context = self.limiter.slot() if self.limiter is not None else nullcontext(LimiterSlot())
+        async with slot_context as slot:
+            started_at = time.perf_counter()
+            try:
+                response = await self.http_client.get(full_url, params=params or {})
+            except Exception:
+                upstream_responses.inc(endpoint, "error")
+                raise
+            finally:
+                upstream_latency.labels(endpoint).observe(time.perf_counter() - started_at)
+
+            slot.status_code = response.status_code
+            upstream_responses.inc(endpoint, str(response.status_code))
+            response.raise_for_status()
 
-        response = await self.http_client.get(full_url, params=params or {})
-        response.raise_for_status()
         return response.json()
 
-    async def get_documents_list(self, part_numbers: list[int]):
-        params = {"part_numbers": ",".join(map(str, part_numbers))}
-        json_response = await self.get(APIEndpoints.DOCUMENTS_METADATA, params)
+    @asynccontextmanager
+    async def stream(
+            self,
+            url: str,
+            params: dict | None = None,
+            *,
+            endpoint: str | None = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Like ``get``, but yields the response before its body is read. The
+        limiter slot is held until the body has been consumed.
+        """
+        full_url = url if "://" in url else f"{self.base_url}{url}"
+        endpoint = endpoint or url
+
+        slot_context = self.limiter.slot() if self.limiter is not None else nullcontext(LimiterSlot())
+        async with slot_context as slot:
+            started_at = time.perf_counter()
+            try:
+                request = self.http_client.build_request("GET", full_url, params=params or {})
+                response = await self.http_client.send(request, stream=True)
+            except Exception:
+                upstream_responses.inc(endpoint, "error")
+                raise
+            finally:
+                upstream_latency.labels(endpoint).observe(time.perf_counter() - started_at)
+
+            try:
+                slot.status_code = response.status_code
+                upstream_responses.inc(endpoint, str(response.status_code))
+                response.raise_for_status()
+                yield response
+            finally:
+                await response.aclose()
+
+    async def iter_documents(
+            self,
+            url: str,
+            query: ODataQuery,
+            *,
+            endpoint: str | None = None,
+    ) -> AsyncIterator[DocumentDTO]:
+        """
+        Yields the documents of an OData query one by one as they are parsed,
+        following next links. Atom feeds are parsed incrementally while the
+        body streams in, JSON pages are decoded whole.
+        """
+        endpoint = endpoint or url
+        next_url: str | None = url
+        params: dict | None = query.params()
+
+        while next_url is not None:
+            async with self.stream(next_url, params, endpoint=endpoint) as response:
+                if is_xml_media_type(response.headers.get("content-type")):
+                    parser = AtomFeedParser(DocumentDTO)
+                    async for chunk in response.aiter_bytes():
+                        for document in parser.feed(chunk):
+                            yield document
+                    for document in parser.close():
+                        yield document
+                    next_url = parser.next_link
+                else:
+                    json_response = json.loads(await response.aread())
+                    for record in _records(json_response):
+                        yield DocumentDTO.model_validate(record)
+                    next_url = json_response.get(NEXT_LINK)
+
+            # the next link carries the query options itself
+            params = None
+
+    async def get_documents_list(self, part_numbers: list[int]) -> list[DocumentDTO]:
+        """
+        Part numbers already being fetched by concurrent requests are joined,
+        only the remaining ones are sent upstream in a single call.
+        """
+        documents_by_part_number = await self._metadata_flights.do_many(
+            part_numbers,
+            self._fetch_documents_list,
+        )
+        return [
+            document
+            for documents in documents_by_part_number.values()
+            for document in documents
+        ]
+
+    @handle_http_errors("get_documents_list", retry=True)
+    async def _fetch_documents_list(self, part_numbers: list[int]) -> dict[int, list[DocumentDTO]]:
+        query = ODataQuery().select(*DOCUMENT_FIELDS).where(
+            any_of(ODataFields.PART_NUMBER, part_numbers),
+            eq(ODataFields.IS_LATEST_REVISION, True),
+        )
+
+        documents_by_part_number: dict[int, list[DocumentDTO]] = {part_number: [] for part_number in part_numbers}
+        async for document in self.iter_documents(APIEndpoints.DOCUMENTS_METADATA, query):
+            if document.part_number in documents_by_part_number:
+                documents_by_part_number[document.part_number].append(document)
+
+        return documents_by_part_number
 
-        return json_response
+    @handle_http_errors("get_documents_since", retry=True)
+    async def get_documents_since(self, created_since: datetime | None, limit: int) -> list[DocumentDTO]:
+        """
+        Returns up to ``limit`` documents created at or after ``created_since``
+        (all documents if None), oldest first. Used to sync the metadata index.
+        """
+        query = (
+            ODataQuery()
+            .select(*DOCUMENT_FIELDS)
+            .where(eq(ODataFields.IS_LATEST_REVISION, True))
+            .order_by(ODataFields.DATE_CREATED)
+            .top(limit)
+        )
+        if created_since is not None:
+            query = query.where(ge(ODataFields.DATE_CREATED, created_since))
+
+        return [document async for document in self.iter_documents(APIEndpoints.DOCUMENTS_METADATA, query)]
+
+    async def get_document_content(self, document_id: str, rev: str | None = None) -> bytes | None:
+        """
+        Returns document bytes, served from the content cache when the
+        requested (or last seen) revision is cached.
+        """
+        cache = self.content_cache
+
+        if cache is not None:
+            rev = rev if rev is not None else cache.known_revision(document_id)
+            if rev is not None and (cached := await cache.get(document_id, rev)) is not None:
+                return cached
+
+        return await self._content_flights.do(
+            (document_id, rev),
+            lambda: self._fetch_document_content(document_id, rev),
+        )
+
+    @handle_http_errors("get_document_content", retry=True)
+    async def _fetch_document_content(self, document_id: str, rev: str | None) -> bytes | None:
+        cache = self.content_cache
 
-    async def get_document_content(self, document_id: str):
         url = APIEndpoints.SINGLE_FULL_DOCUMENT.format(document_id=document_id)
-        json_response = await self.get(url)
+        json_response = await self.get(url, endpoint=APIEndpoints.SINGLE_FULL_DOCUMENT)
+
+        content = json_response.get("content")
+        if isinstance(content, str):
+            # binary payloads are transported base64 encoded inside JSON
+            content = base64.b64decode(content)
+
+        if content is not None and cache is not None:
+            await cache.put(document_id, json_response.get("rev") or rev or "", content)
 
-        return json_response.get("content")
+        return content
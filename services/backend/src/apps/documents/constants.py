@@ -1,5 +1,6 @@
 MIN_PART_NUMBERS = 1
 MAX_PART_NUMBERS = 10
+MAX_BULK_PART_NUMBERS = 1000
 
 DEFAULT_TIMEOUT_SECONDS = 30
 
@@ -13,8 +14,23 @@ class APIEndpoints:
     SINGLE_FULL_DOCUMENT = "api/v1/documents/{document_id}"
 
 
+class ODataFields:
+    PART_NUMBER = "part_number"
+    DATE_CREATED = "date_created"
+    IS_LATEST_REVISION = "is_latest_revision"
+
+
+class MediaTypes:
+    ZIP = "application/zip"
+    PDF = "application/pdf"
+    NDJSON = "application/x-ndjson"
+
+
 ZIP_NAME = "documents.zip"
 DOCUMENT_NAME = "document_{}.pdf"
+MANIFEST_NAME = "manifest.json"
+
+FAILED_DOCUMENTS_HEADER = "X-Failed-Document-Ids"
 
 
 class EmailServiceConsts:
@@ -1,24 +1,115 @@
+import functools
 import logging
+import random
+
 import httpx
+from tenacity import AsyncRetrying, RetryCallState, retry_if_exception, stop_after_attempt
+from tenacity.wait import wait_base
 
 from src.apps.documents.exceptions import (
     DocumentConnectionError,
     DocumentTimeoutError,
     DocumentError,
 )
+from src.apps.documents.utils.circuit_breaker import circuit_breakers
+from src.config import get_config
 
 logger = logging.getLogger(__name__)
 
 
-def handle_http_errors(operation_name: str):
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+class wait_decorrelated_jitter(wait_base):  # noqa: N801
+    """
+    Decorrelated jitter backoff: ``min(cap, uniform(base, previous * 3))``.
+
+    Tenacity clears ``retry_state.next_action`` before asking for the next
+    wait, so the previous delay is kept on the instance; create one per
+    retried call.
+    """
+
+    def __init__(self, base: float, cap: float):
+        self.base = base
+        self.cap = cap
+        self._previous = base
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        delay = min(self.cap, random.uniform(self.base, max(self.base, self._previous * 3)))
+        self._previous = delay
+        return delay
+
+
+def _is_upstream_failure(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exc, (httpx.ConnectError, httpx.TimeoutException))
+
+
+def handle_http_errors(operation_name: str, *, retry: bool = False):
     """
     Converts httpx errors into application-level exceptions.
+
+    Calls go through a circuit breaker named after ``operation_name``, and
+    fail fast with ``DocumentConnectionError`` while it is open. With
+    ``retry`` (only for idempotent requests) connection errors, timeouts and
+    429/502/503/504 responses are retried with decorrelated jitter backoff.
     """
 
     def decorator(func):
+        async def attempt_call(*args, **kwargs):
+            breaker = circuit_breakers.get(operation_name)
+            if not breaker.allow_request():
+                logger.warning("Circuit open for %s, failing fast", operation_name)
+                raise DocumentConnectionError()
+
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                if _is_upstream_failure(e):
+                    breaker.record_failure()
+                elif isinstance(e, httpx.HTTPStatusError):
+                    # upstream answered, e.g. 404 for an unknown document
+                    breaker.record_success()
+                else:
+                    breaker.release()
+                raise
+
+            breaker.record_success()
+            return result
+
+        async def call_with_retry(*args, **kwargs):
+            config = get_config().sap_cpi
+            retrying = AsyncRetrying(
+                stop=stop_after_attempt(config.retry_attempts if retry else 1),
+                wait=wait_decorrelated_jitter(config.retry_base_delay_seconds, config.retry_max_delay_seconds),
+                retry=retry_if_exception(_is_retryable),
+                before_sleep=lambda state: logger.warning(
+                    "Retrying %s in %.3fs (attempt %d): %s",
+                    operation_name,
+                    state.next_action.sleep if state.next_action else 0.0,
+                    state.attempt_number,
+                    state.outcome.exception() if state.outcome else None,
+                ),
+                reraise=True,
+            )
+            async for attempt in retrying:
+                with attempt:
+                    return await attempt_call(*args, **kwargs)
+
+        @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             try:
-                return await func(*args, **kwargs)
+                return await call_with_retry(*args, **kwargs)
+
+            except DocumentError:
+                raise
 
             except httpx.ConnectError as e:
                 logger.error("Connection error during %s: %s", operation_name, e)
@@ -1,38 +1,43 @@
-from typing import AsyncGenerator
-
-from fastapi import Depends
+from fastapi import Depends, Request
 
+from src.apps.documents.cache import MetadataIndex, PartNumberMetadataCache
 from src.apps.documents.client import DocumentClient
+from src.apps.documents.graph_client import GraphMailClient
+from src.apps.documents.jobs import EmailJobQueue
 from src.apps.documents.services.download_service import DownloadDocumentAPIService
 
 from src.apps.documents.services.search_service import SearchDocumentAPIService
 from src.apps.documents.services.email_service import EmailDocumentAPIService
 
 from src.apps.documents.services.preview_service import PreviewDocumentAPIService
+from src.infra.application.exception import NotFoundError
 
-from src.config import get_config, AppConfig
 
+def get_document_client(request: Request) -> DocumentClient:
+    """
+    Returns the worker-wide pooled client created in the app lifespan.
+    """
+    return request.app.state.document_client
 
-async def get_document_client(
-        config: AppConfig = Depends(get_config)
-) -> AsyncGenerator[DocumentClient, None]:
 
-    client = DocumentClient(
-        base_url=config.document_base_url,
-        username=config.document_username,
-        password=config.document_password,
-        timeout=config.document_timeout_seconds
-    )
-    try:
-        yield client
-    finally:
-        await client.http_client.aclose()
+def get_metadata_cache(request: Request) -> PartNumberMetadataCache | None:
+    return request.app.state.metadata_cache
+
+
+def get_metadata_index(request: Request) -> MetadataIndex | None:
+    return request.app.state.metadata_index
+
+
+def get_graph_client(request: Request) -> GraphMailClient:
+    return request.app.state.graph_client
 
 
 def get_search_service(
-        client: DocumentClient = Depends(get_document_client)
+        client: DocumentClient = Depends(get_document_client),
+        metadata_cache: PartNumberMetadataCache | None = Depends(get_metadata_cache),
+        metadata_index: MetadataIndex | None = Depends(get_metadata_index),
 ) -> SearchDocumentAPIService:
-    return SearchDocumentAPIService(client=client)
+    return SearchDocumentAPIService(client=client, metadata_cache=metadata_cache, metadata_index=metadata_index)
 
 
 def get_download_service(
@@ -48,6 +53,18 @@ def get_preview_service(
 
 
 def get_email_service(
-        client: DocumentClient = Depends(get_document_client)
+        client: DocumentClient = Depends(get_document_client),
+        graph_client: GraphMailClient = Depends(get_graph_client),
+        metadata_cache: PartNumberMetadataCache | None = Depends(get_metadata_cache),
+        metadata_index: MetadataIndex | None = Depends(get_metadata_index),
 ) -> EmailDocumentAPIService:
-    return EmailDocumentAPIService(client=client)
+    return EmailDocumentAPIService(
+        client=client, graph_client=graph_client, metadata_cache=metadata_cache, metadata_index=metadata_index,
+    )
+
+
+def get_email_job_queue(request: Request) -> EmailJobQueue:
+    queue = request.app.state.email_jobs
+    if queue is None:
+        raise NotFoundError(detail="Queued email sending is disabled")
+    return queue
@@ -1,4 +1,6 @@
+from collections.abc import AsyncIterator
 from datetime import datetime
+from enum import StrEnum
 from pydantic import BaseModel
 
 
@@ -13,6 +15,13 @@ class DocumentDTO(BaseModel):
 class SearchResultDTO(BaseModel):
     documents: list[DocumentDTO]
     not_found_part_numbers: list[int]
+    stale_part_numbers: list[int] = []
+
+
+class SearchChunkDTO(BaseModel):
+    part_numbers: list[int]
+    result: SearchResultDTO | None = None
+    error: str | None = None
 
 
 class DocumentContentDTO(BaseModel):
@@ -25,6 +34,15 @@ class DocumentContentDTO(BaseModel):
 class DownloadResultDTO(BaseModel):
     file_name: str
     content_bytes: bytes
+    failed_document_ids: list[str] = []
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class DownloadStreamDTO(BaseModel):
+    file_name: str
+    content: AsyncIterator[bytes]
 
     class Config:
         arbitrary_types_allowed = True
@@ -36,3 +54,22 @@ class FailedDocumentsDTO(BaseModel):
 
 class EmailResultDTO(BaseModel):
     failed: FailedDocumentsDTO = FailedDocumentsDTO()
+
+
+class EmailJobStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class EmailJobDTO(BaseModel):
+    id: str
+    email: str
+    document_ids: list[str]
+    status: EmailJobStatus
+    attempts: int
+    failed_document_ids: list[str] = []
+    last_error: str | None = None
+    created_at: datetime
+    updated_at: datetime
@@ -1,3 +1,5 @@
+from fastapi import status
+
 from src.infra.application.exception import AppError
 
 
@@ -13,6 +15,10 @@ class DocumentTimeoutError(DocumentError):
     default_detail = "Document request timed out"
 
 
+class DocumentServiceOverloadedError(DocumentError):
+    default_detail = "Document service is overloaded, try again later"
+
+
 class DocumentAuthenticationError(DocumentError):
     default_detail = "Authentication failed to document service"
 
@@ -21,5 +27,29 @@ class DocumentNotFound(DocumentError):
     default_detail = "No documents found for the provided IDs"
 
 
+class DownloadDocumentNotFound(DocumentError):
+    default_detail = "Documents not found for download"
+
+
+class DownloadNotAcceptable(DocumentError):
+    status_code = status.HTTP_406_NOT_ACCEPTABLE
+    default_detail = "Documents cannot be served in the requested media type"
+
+
 class PreviewDocumentNotFound(DocumentError):
     default_detail = "Document not found for preview"
+
+
+class DocumentRangeNotSatisfiable(DocumentError):
+    status_code = status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    default_detail = "Requested range is outside the document"
+
+
+class EmailAttachmentTooLarge(DocumentError):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Documents exceed the maximum email size"
+
+
+class EmailJobNotFound(DocumentError):
+    status_code = status.HTTP_404_NOT_FOUND
+    default_detail = "Email job not found"
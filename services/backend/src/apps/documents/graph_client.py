@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import time
+
+from azure.core.credentials import AccessToken
+from azure.core.credentials_async import AsyncTokenCredential
+from azure.identity.aio import ClientSecretCredential
+import httpx
+from kiota_authentication_azure.azure_identity_authentication_provider import AzureIdentityAuthenticationProvider
+from msgraph import GraphRequestAdapter, GraphServiceClient
+from msgraph.generated.models.attachment_item import AttachmentItem
+from msgraph.generated.models.attachment_type import AttachmentType
+from msgraph.generated.models.message import Message
+from msgraph.generated.users.item.messages.item.attachments.create_upload_session.create_upload_session_post_request_body import (
+    CreateUploadSessionPostRequestBody,
+)
+from msgraph.generated.users.item.send_mail.send_mail_post_request_body import SendMailPostRequestBody
+from msgraph_core import GraphClientFactory
+
+from src.config.config import GraphConfig
+from src.infra.application.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+send_mail_duration = metrics_registry.histogram(
+    "graph_send_mail_seconds", "Duration of Graph email sends", ("mode",),
+)
+
+
+class CachedTokenCredential(AsyncTokenCredential):
+    """
+    Caches access tokens per scope set and refreshes them ahead of expiry.
+
+    Concurrent callers share one refresh. Requests carrying claims (CAE
+    challenges) always go to the wrapped credential.
+    """
+
+    def __init__(self, credential: AsyncTokenCredential, refresh_margin_seconds: float = 300):
+        self.credential = credential
+        self.refresh_margin_seconds = refresh_margin_seconds
+
+        self._tokens: dict[tuple, AccessToken] = {}
+        self._lock = asyncio.Lock()
+
+    async def get_token(self, *scopes: str, claims: str | None = None, **kwargs) -> AccessToken:
+        if claims:
+            return await self.credential.get_token(*scopes, claims=claims, **kwargs)
+
+        key = (scopes, tuple(sorted(kwargs.items())))
+
+        token = self._tokens.get(key)
+        if token is not None and self._is_fresh(token):
+            return token
+
+        async with self._lock:
+            token = self._tokens.get(key)
+            if token is None or not self._is_fresh(token):
+                token = await self.credential.get_token(*scopes, **kwargs)
+                self._tokens[key] = token
+                logger.debug("Graph access token refreshed, expires at %d", token.expires_on)
+
+        return token
+
+    async def close(self) -> None:
+        self._tokens.clear()
+        await self.credential.close()
+
+    def _is_fresh(self, token: AccessToken) -> bool:
+        return token.expires_on - time.time() > self.refresh_margin_seconds
+
+
+class GraphMailClient:
+    """
+    Worker-wide Microsoft Graph client, created on first use.
+
+    Holds one credential (with token caching) and one HTTP connection pool
+    for all sends, both closed by ``aclose`` at shutdown. Upload session
+    chunks go through a separate plain pool, since upload URLs are
+    pre-authenticated and must not receive the Graph bearer token.
+
+    ``credential`` and ``transport`` replace the client secret credential
+    and the network transport, e.g. to run against an in-process stand-in.
+    """
+
+    def __init__(
+            self,
+            config: GraphConfig,
+            credential: AsyncTokenCredential | None = None,
+            transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.config = config
+        self.credential = credential
+        self.transport = transport
+
+        self._credential: CachedTokenCredential | None = None
+        self._http_client: httpx.AsyncClient | None = None
+        self._upload_client: httpx.AsyncClient | None = None
+        self._client: GraphServiceClient | None = None
+
+    @property
+    def client(self) -> GraphServiceClient:
+        if self._client is None:
+            self._credential = CachedTokenCredential(
+                self.credential or ClientSecretCredential(
+                    tenant_id=self.config.azure_tenant_id,
+                    client_id=self.config.client_id,
+                    client_secret=self.config.client_secret,
+                ),
+                refresh_margin_seconds=self.config.token_refresh_margin_seconds,
+            )
+            self._http_client = GraphClientFactory.create_with_default_middleware(
+                client=httpx.AsyncClient(
+                    timeout=httpx.Timeout(self.config.timeout_seconds),
+                    transport=self.transport,
+                ),
+            )
+            adapter = GraphRequestAdapter(
+                AzureIdentityAuthenticationProvider(self._credential),
+                client=self._http_client,
+            )
+            self._client = GraphServiceClient(request_adapter=adapter)
+            self._upload_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.config.timeout_seconds),
+                transport=self.transport,
+            )
+            logger.info("Graph client initialized")
+
+        return self._client
+
+    async def send_mail(self, request_body: SendMailPostRequestBody) -> None:
+        send_mail = self.client.users.by_user_id(self.config.sender_mailbox).send_mail
+
+        started_at = time.monotonic()
+        try:
+            await send_mail.post(request_body)
+        finally:
+            send_mail_duration.labels("inline").observe(time.monotonic() - started_at)
+
+    async def send_mail_with_upload(
+            self,
+            message: Message,
+            file_name: str,
+            content_type: str,
+            content: bytes,
+    ) -> None:
+        """
+        Sends ``message`` with a large attachment through an upload session.
+
+        A draft is created, the attachment is PUT in ranged chunks (up to
+        ``upload_max_in_flight`` at a time) and the draft is sent. The draft
+        is deleted if any step fails.
+        """
+        mailbox = self.client.users.by_user_id(self.config.sender_mailbox)
+
+        started_at = time.monotonic()
+        draft = await mailbox.messages.post(message)
+        if draft is None or draft.id is None:
+            raise RuntimeError("Graph did not return the created draft")
+
+        draft_message = mailbox.messages.by_message_id(draft.id)
+        try:
+            session = await draft_message.attachments.create_upload_session.post(
+                CreateUploadSessionPostRequestBody(
+                    attachment_item=AttachmentItem(
+                        attachment_type=AttachmentType.File,
+                        name=file_name,
+                        content_type=content_type,
+                        size=len(content),
+                    ),
+                ),
+            )
+            if session is None or session.upload_url is None:
+                raise RuntimeError("Graph did not return an upload session")
+
+            await self._upload_chunks(session.upload_url, content)
+            await draft_message.send.post()
+        except BaseException:
+            await asyncio.shield(self._delete_draft(draft.id))
+            raise
+        finally:
+            send_mail_duration.labels("upload_session").observe(time.monotonic() - started_at)
+
+    async def aclose(self) -> None:
+        if self._upload_client is not None:
+            await self._upload_client.aclose()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        if self._credential is not None:
+            await self._credential.close()
+
+        self._client = self._http_client = self._upload_client = self._credential = None
+
+    async def _upload_chunks(self, upload_url: str, content: bytes) -> None:
+        upload_client = self._upload_client
+        assert upload_client is not None
+
+        total = len(content)
+        view = memoryview(content)
+        window = asyncio.Semaphore(max(1, self.config.upload_max_in_flight))
+
+        async def put_chunk(start: int) -> None:
+            end = min(start + self.config.upload_chunk_size_bytes, total)
+            async with window:
+                response = await upload_client.put(
+                    upload_url,
+                    content=bytes(view[start:end]),
+                    headers={"Content-Range": f"bytes {start}-{end - 1}/{total}"},
+                )
+                response.raise_for_status()
+
+        async with asyncio.TaskGroup() as group:
+            for start in range(0, total, self.config.upload_chunk_size_bytes):
+                group.create_task(put_chunk(start))
+
+        logger.debug("Uploaded %d bytes to Graph upload session", total)
+
+    async def _delete_draft(self, message_id: str) -> None:
+        try:
+            await self.client.users.by_user_id(self.config.sender_mailbox).messages.by_message_id(message_id).delete()
+        except Exception as e:
+            logger.warning("Failed to delete draft %s: %s", message_id, e)
@@ -0,0 +1,8 @@
+from src.apps.documents.jobs.queue import EmailJobQueue
+from src.apps.documents.jobs.store import EmailJobStore
+
+
+__all__ = [
+    "EmailJobQueue",
+    "EmailJobStore",
+]
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+import httpx
+from kiota_abstractions.api_error import APIError
+
+from src.apps.documents.dto import EmailJobDTO, EmailResultDTO
+from src.apps.documents.exceptions import EmailAttachmentTooLarge
+from src.apps.documents.jobs.store import EmailJobStore
+from src.config.config import EmailJobsConfig
+
+logger = logging.getLogger(__name__)
+
+
+EmailJobHandler = Callable[[EmailJobDTO], Awaitable[EmailResultDTO]]
+
+# client errors that may succeed when repeated
+RETRYABLE_CLIENT_STATUS_CODES = frozenset({408, 409, 429})
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """
+    Oversized attachments and 4xx answers from Graph fail the same way on
+    every attempt.
+    """
+    if isinstance(exc, BaseExceptionGroup):
+        return any(_is_retryable(inner) for inner in exc.exceptions)
+    if isinstance(exc, EmailAttachmentTooLarge):
+        return False
+
+    if isinstance(exc, APIError):
+        status_code = exc.response_status_code
+    elif isinstance(exc, httpx.HTTPStatusError):
+        status_code = exc.response.status_code
+    else:
+        return True
+
+    return status_code is None or not 400 <= status_code < 500 or status_code in RETRYABLE_CLIENT_STATUS_CODES
+
+
+class EmailJobQueue:
+    """
+    Bounded pool of async workers sending queued email jobs.
+
+    Workers are woken up on enqueue and otherwise poll the store, which also
+    picks up retries that became due and jobs recovered from expired leases.
+    The lease of a running job is renewed every third of its duration, so
+    slow sends are not claimed (and sent) a second time.
+    """
+
+    def __init__(
+            self,
+            store: EmailJobStore,
+            handler: EmailJobHandler,
+            workers: int,
+            max_attempts: int,
+            retry_backoff_seconds: float,
+            poll_interval_seconds: float,
+    ):
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    @classmethod
+    def from_config(cls, config: EmailJobsConfig, handler: EmailJobHandler) -> "EmailJobQueue":
+        return cls(
+            store=EmailJobStore(config.db_path, lease_seconds=config.lease_seconds),
+            handler=handler,
+            workers=config.workers,
+            max_attempts=config.max_attempts,
+            retry_backoff_seconds=config.retry_backoff_seconds,
+            poll_interval_seconds=config.poll_interval_seconds,
+        )
+
+    async def start(self) -> None:
+        await self.store.open()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"email-job-worker-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info("Email job queue started with %d workers", self.workers)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.store.close()
+        logger.info("Email job queue stopped")
+
+    async def enqueue(self, document_ids: list[str], email: str) -> EmailJobDTO:
+        job = await self.store.create(email, document_ids, self.max_attempts)
+        self._wakeup.set()
+        logger.info("Email job %s queued for %d documents", job.id, len(document_ids))
+        return job
+
+    async def get(self, job_id: str) -> EmailJobDTO | None:
+        return await self.store.get(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job = await self.store.claim()
+            except Exception:
+                logger.exception("Failed to claim email job")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval_seconds)
+                except TimeoutError:
+                    pass
+                continue
+
+            await self._process(job)
+
+    async def _process(self, job: EmailJobDTO) -> None:
+        logger.info("Processing email job %s (attempt %d)", job.id, job.attempts)
+        heartbeat = asyncio.create_task(self._renew_lease(job), name=f"email-job-lease-{job.id}")
+        try:
+            result = await self.handler(job)
+            if set(result.failed.document_ids) >= set(job.document_ids):
+                raise RuntimeError("None of the documents could be fetched")
+        except asyncio.CancelledError:
+            await asyncio.shield(self.store.release(job))
+            raise
+        except Exception as e:
+            retry = _is_retryable(e)
+            delay = self.retry_backoff_seconds * 2 ** (job.attempts - 1)
+            logger.exception(
+                "Email job %s failed%s, attempt %d/%d",
+                job.id, "" if retry else " permanently", job.attempts, self.max_attempts,
+            )
+            error = getattr(e, "detail", None) or str(e) or type(e).__name__
+            await self.store.fail(job, str(error), delay, retry=retry)
+            return
+        finally:
+            heartbeat.cancel()
+
+        await self.store.complete(job, result.failed.document_ids)
+        logger.info("Email job %s completed", job.id)
+
+    async def _renew_lease(self, job: EmailJobDTO) -> None:
+        while True:
+            await asyncio.sleep(self.store.lease_seconds / 3)
+            try:
+                await self.store.renew_lease(job)
+            except Exception:
+                logger.exception("Failed to renew the lease of email job %s", job.id)
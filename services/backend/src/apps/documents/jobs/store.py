@@ -0,0 +1,213 @@
+import asyncio
+from datetime import datetime, UTC
+import json
+import logging
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from uuid import uuid4
+
+from src.apps.documents.dto import EmailJobDTO, EmailJobStatus
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS email_jobs (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    document_ids TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_expires_at REAL,
+    failed_document_ids TEXT NOT NULL DEFAULT '[]',
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS email_jobs_claim_idx ON email_jobs (status, available_at);
+"""
+
+_LEASE_EXPIRED_ERROR = "Lease expired on the last attempt"
+
+
+class EmailJobStore:
+    """
+    SQLite-backed persistent store of queued email jobs.
+
+    Claimed jobs carry a lease that the worker renews while it runs. A job
+    whose lease expired (the worker or pod died while sending) becomes
+    claimable again, so queued and in-progress sends survive restarts,
+    until it has used up its attempts and is marked failed. Updates of a
+    running job only apply to the attempt that claimed it. The database
+    may be shared by several worker processes; claims run in
+    ``BEGIN IMMEDIATE`` transactions.
+    """
+
+    def __init__(self, path: str, lease_seconds: float):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    async def open(self) -> None:
+        await asyncio.to_thread(self._open)
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await asyncio.to_thread(self._connection.close)
+            self._connection = None
+
+    async def create(self, email: str, document_ids: list[str], max_attempts: int) -> EmailJobDTO:
+        job_id = uuid4().hex
+        return await asyncio.to_thread(self._create, job_id, email, document_ids, max_attempts)
+
+    async def get(self, job_id: str) -> EmailJobDTO | None:
+        return await asyncio.to_thread(self._get, job_id)
+
+    async def claim(self) -> EmailJobDTO | None:
+        """
+        Marks the next due job as running and returns it.
+        """
+        return await asyncio.to_thread(self._claim)
+
+    async def complete(self, job: EmailJobDTO, failed_document_ids: list[str]) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE email_jobs SET status = ?, failed_document_ids = ?, last_error = NULL, "
+            "lease_expires_at = NULL, updated_at = ? WHERE id = ? AND status = ? AND attempts = ?",
+            (
+                EmailJobStatus.SUCCEEDED, json.dumps(failed_document_ids), time.time(),
+                job.id, EmailJobStatus.RUNNING, job.attempts,
+            ),
+        )
+
+    async def fail(self, job: EmailJobDTO, error: str, retry_delay_seconds: float, retry: bool = True) -> None:
+        """
+        Schedules a retry, or marks the job failed once attempts are used up
+        or when the error is not worth retrying.
+        """
+        now = time.time()
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE email_jobs SET "
+            "status = CASE WHEN ? AND attempts < max_attempts THEN ? ELSE ? END, "
+            "available_at = ?, lease_expires_at = NULL, last_error = ?, updated_at = ? "
+            "WHERE id = ? AND status = ? AND attempts = ?",
+            (
+                retry, EmailJobStatus.QUEUED, EmailJobStatus.FAILED, now + retry_delay_seconds, error, now,
+                job.id, EmailJobStatus.RUNNING, job.attempts,
+            ),
+        )
+
+    async def renew_lease(self, job: EmailJobDTO) -> None:
+        """
+        Extends the lease of a running job, unless it was claimed again since.
+        """
+        now = time.time()
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE email_jobs SET lease_expires_at = ? WHERE id = ? AND status = ? AND attempts = ?",
+            (now + self.lease_seconds, job.id, EmailJobStatus.RUNNING, job.attempts),
+        )
+
+    async def release(self, job: EmailJobDTO) -> None:
+        """
+        Puts a claimed job back without counting the attempt (worker shutdown).
+        """
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE email_jobs SET status = ?, attempts = attempts - 1, lease_expires_at = NULL, "
+            "updated_at = ? WHERE id = ? AND status = ? AND attempts = ?",
+            (EmailJobStatus.QUEUED, time.time(), job.id, EmailJobStatus.RUNNING, job.attempts),
+        )
+
+    def _open(self) -> None:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+        self._connection = connection
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            raise RuntimeError("EmailJobStore is not opened")
+        return self._connection
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        with self._lock:
+            self._db.execute(sql, params)
+
+    def _create(self, job_id: str, email: str, document_ids: list[str], max_attempts: int) -> EmailJobDTO:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO email_jobs (id, email, document_ids, status, max_attempts, available_at, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, email, json.dumps(document_ids), EmailJobStatus.QUEUED, max_attempts, now, now, now),
+            )
+            row = self._db.execute("SELECT * FROM email_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dto(row)
+
+    def _get(self, job_id: str) -> EmailJobDTO | None:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM email_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dto(row) if row is not None else None
+
+    def _claim(self) -> EmailJobDTO | None:
+        now = time.time()
+
+        with self._lock:
+            db = self._db
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                # a job whose worker keeps dying must not be reclaimed forever
+                db.execute(
+                    "UPDATE email_jobs SET status = ?, lease_expires_at = NULL, "
+                    "last_error = COALESCE(last_error, ?), updated_at = ? "
+                    "WHERE status = ? AND lease_expires_at < ? AND attempts >= max_attempts",
+                    (EmailJobStatus.FAILED, _LEASE_EXPIRED_ERROR, now, EmailJobStatus.RUNNING, now),
+                )
+                row = db.execute(
+                    "SELECT id FROM email_jobs "
+                    "WHERE (status = ? AND available_at <= ?) "
+                    "OR (status = ? AND lease_expires_at < ? AND attempts < max_attempts) "
+                    "ORDER BY available_at LIMIT 1",
+                    (EmailJobStatus.QUEUED, now, EmailJobStatus.RUNNING, now),
+                ).fetchone()
+
+                if row is None:
+                    db.execute("COMMIT")
+                    return None
+
+                db.execute(
+                    "UPDATE email_jobs SET status = ?, attempts = attempts + 1, lease_expires_at = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    (EmailJobStatus.RUNNING, now + self.lease_seconds, now, row["id"]),
+                )
+                claimed = db.execute("SELECT * FROM email_jobs WHERE id = ?", (row["id"],)).fetchone()
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+        return self._to_dto(claimed)
+
+    @staticmethod
+    def _to_dto(row: sqlite3.Row) -> EmailJobDTO:
+        return EmailJobDTO(
+            id=row["id"],
+            email=row["email"],
+            document_ids=json.loads(row["document_ids"]),
+            status=row["status"],
+            attempts=row["attempts"],
+            failed_document_ids=json.loads(row["failed_document_ids"]),
+            last_error=row["last_error"],
+            created_at=datetime.fromtimestamp(row["created_at"], UTC),
+            updated_at=datetime.fromtimestamp(row["updated_at"], UTC),
+        )
@@ -1,10 +1,11 @@
-from src.apps.documents.schemas.search import SearchIn, SearchOut
+from src.apps.documents.schemas.search import BulkSearchIn, SearchIn, SearchOut
 from src.apps.documents.schemas.download import DownloadIn, DownloadOut
 from src.apps.documents.schemas.preview import PreviewIn, PreviewOut
-from src.apps.documents.schemas.email import EmailIn, EmailOut
+from src.apps.documents.schemas.email import EmailIn, EmailJobOut, EmailOut
 
 
 __all__ = [
+    "BulkSearchIn",
     "SearchIn",
     "SearchOut",
     "DownloadIn",
@@ -13,4 +14,5 @@ __all__ = [
     "PreviewOut",
     "EmailIn",
     "EmailOut",
-]
\ No newline at end of file
+    "EmailJobOut",
+]
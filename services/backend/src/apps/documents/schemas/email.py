@@ -1,3 +1,4 @@
+from datetime import datetime
 from pydantic import BaseModel, Field, field_validator
 
 from src.apps.documents.constants import MIN_DOCUMENT_IDS, MAX_DOCUMENT_IDS
@@ -27,4 +28,14 @@ class FailedDocuments(BaseModel):
 
 
 class EmailOut(BaseModel):
-    failed: FailedDocuments = Field(default_factory=FailedDocuments)
\ No newline at end of file
+    failed: FailedDocuments = Field(default_factory=FailedDocuments)
+
+
+class EmailJobOut(BaseModel):
+    job_id: str = Field(..., description="Identifier to poll the job status with")
+    status: str = Field(..., description="One of queued, running, succeeded, failed")
+    attempts: int = Field(0, description="Number of send attempts made so far")
+    failed: FailedDocuments = Field(default_factory=FailedDocuments)
+    error: str | None = Field(None, description="Last error, if an attempt failed")
+    created_at: datetime
+    updated_at: datetime
@@ -1,7 +1,7 @@
 from datetime import datetime
 from pydantic import BaseModel, Field
 
-from src.apps.documents.constants import MIN_PART_NUMBERS, MAX_PART_NUMBERS
+from src.apps.documents.constants import MAX_BULK_PART_NUMBERS, MIN_PART_NUMBERS, MAX_PART_NUMBERS
 
 
 class SearchIn(BaseModel):
@@ -13,6 +13,15 @@ class SearchIn(BaseModel):
     )
 
 
+class BulkSearchIn(BaseModel):
+    part_numbers: list[int] = Field(
+        ...,
+        min_length=MIN_PART_NUMBERS,
+        max_length=MAX_BULK_PART_NUMBERS,
+        description="List of part numbers to search for",
+    )
+
+
 class DocumentSchema(BaseModel):
     id: str
     part_number: int
@@ -25,6 +34,38 @@ class NotFoundInfo(BaseModel):
     part_numbers: list[int] = Field(default_factory=list)
 
 
+class StaleInfo(BaseModel):
+    part_numbers: list[int] = Field(
+        default_factory=list,
+        description="Part numbers served from cache because SAP was unavailable",
+    )
+
+
 class SearchOut(BaseModel):
     data: list[DocumentSchema] = Field(default_factory=list)
     not_found: NotFoundInfo = Field(default_factory=NotFoundInfo)
+    stale: StaleInfo = Field(default_factory=StaleInfo)
+
+
+class SearchErrorInfo(BaseModel):
+    part_numbers: list[int] = Field(default_factory=list)
+    detail: str
+
+
+class SearchChunkOut(BaseModel):
+    """
+    One NDJSON line of a bulk search, sent as each upstream chunk returns.
+    """
+    data: list[DocumentSchema] = Field(default_factory=list)
+    stale: StaleInfo = Field(default_factory=StaleInfo)
+
+
+class SearchChunkErrorOut(BaseModel):
+    error: SearchErrorInfo
+
+
+class SearchNotFoundOut(BaseModel):
+    """
+    Last NDJSON line of a bulk search.
+    """
+    not_found: NotFoundInfo = Field(default_factory=NotFoundInfo)
@@ -1,6 +1,6 @@
 import logging
 
-from src.apps.documents.dto import DownloadResultDTO
+from src.apps.documents.dto import DownloadResultDTO, DownloadStreamDTO
 from src.apps.documents.services.base_service import DocumentAPIService
 from src.apps.documents.utils.content_generator import ContentGenerator
 
@@ -9,16 +9,19 @@ logger = logging.getLogger(__name__)
 
 class DownloadDocumentAPIService(DocumentAPIService):
 
-    async def download(self, document_ids: list[str]) -> DownloadResultDTO:
+    async def download(self, document_ids: list[str], archive: bool = False) -> DownloadResultDTO:
         logger.info("Downloading %d documents", len(document_ids))
 
-        documents_content = await ContentGenerator.content_response(self.document_client, document_ids)
+        documents_content = await ContentGenerator.content_response(
+            self.document_client, document_ids, archive=archive,
+        )
 
         if documents_content is None:
             logger.warning("All %d documents failed to download", len(document_ids))
             return DownloadResultDTO(
                 file_name="",
                 content_bytes=b"",
+                failed_document_ids=document_ids,
             )
 
         file_name, file_content, failed_ids = documents_content
@@ -33,5 +36,14 @@ class DownloadDocumentAPIService(DocumentAPIService):
 
         return DownloadResultDTO(
             file_name=file_name,
-            content_bytes=file_content
+            content_bytes=file_content,
+            failed_document_ids=failed_ids,
+        )
+
+    def download_stream(self, document_ids: list[str]) -> DownloadStreamDTO:
+        logger.info("Streaming %d documents", len(document_ids))
+
+        return DownloadStreamDTO(
+            file_name=ContentGenerator.archive_name(),
+            content=ContentGenerator.stream_archive(self.document_client, document_ids),
         )
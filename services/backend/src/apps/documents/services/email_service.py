@@ -1,6 +1,5 @@
 import logging
 
-from msgraph import GraphServiceClient
 from msgraph.generated.users.item.send_mail.send_mail_post_request_body import SendMailPostRequestBody
 from msgraph.generated.models.message import Message
 from msgraph.generated.models.item_body import ItemBody
@@ -8,10 +7,13 @@ from msgraph.generated.models.body_type import BodyType
 from msgraph.generated.models.recipient import Recipient
 from msgraph.generated.models.email_address import EmailAddress
 from msgraph.generated.models.file_attachment import FileAttachment
-from azure.identity.aio import ClientSecretCredential
 
+from src.apps.documents.cache import MetadataIndex, PartNumberMetadataCache
+from src.apps.documents.client import DocumentClient
 from src.apps.documents.constants import EmailServiceConsts
 from src.apps.documents.dto import EmailResultDTO, FailedDocumentsDTO
+from src.apps.documents.exceptions import EmailAttachmentTooLarge
+from src.apps.documents.graph_client import GraphMailClient
 from src.apps.documents.services.base_service import DocumentAPIService
 from src.apps.documents.utils.content_generator import ContentGenerator
 from src.config import get_config
@@ -20,13 +22,30 @@ logger = logging.getLogger(__name__)
 
 
 class EmailDocumentAPIService(DocumentAPIService):
+    def __init__(
+            self,
+            client: DocumentClient,
+            graph_client: GraphMailClient,
+            metadata_cache: PartNumberMetadataCache | None = None,
+            metadata_index: MetadataIndex | None = None,
+    ):
+        super().__init__(client)
+        self.graph_client = graph_client
+        self.metadata_cache = metadata_cache
+        self.metadata_index = metadata_index
+        self.max_email_size_bytes = get_config().max_email_size_mb * 1024 * 1024
+
     async def prepare_and_send(self, document_ids: list[str], email: str) -> EmailResultDTO:
         logger.info("Preparing %d documents for email to %s", len(document_ids), email)
 
+        self.check_known_size(document_ids)
+
         documents_content = await ContentGenerator.content_response(self.document_client, document_ids)
 
         if documents_content is not None:
             file_name, file_content, failed_ids = documents_content
+            if len(file_content) > self.max_email_size_bytes:
+                raise EmailAttachmentTooLarge()
             await self.send_email(email, file_name, file_content)
         else:
             failed_ids = document_ids
@@ -35,47 +54,59 @@ class EmailDocumentAPIService(DocumentAPIService):
             failed=FailedDocumentsDTO(document_ids=failed_ids)
         )
 
-    async def send_email(self, email: str, file_name: str, content: bytes) -> None:
-        config = get_config()
+    def check_known_size(self, document_ids: list[str]) -> None:
+        """
+        Rejects requests whose documents are already known (from cached
+        search results or the metadata index) to exceed the email size
+        limit, before fetching them.
+
+        Best effort: documents of unknown size count as empty, the limit is
+        enforced again on the fetched content.
+        """
+        known_size = sum(self._known_size(document_id) or 0 for document_id in dict.fromkeys(document_ids))
+        if known_size > self.max_email_size_bytes:
+            logger.warning("Documents for email are %d bytes, over the limit", known_size)
+            raise EmailAttachmentTooLarge()
+
+    def _known_size(self, document_id: str) -> int | None:
+        size = None
+        if self.metadata_cache is not None:
+            size = self.metadata_cache.document_size(document_id)
+        if size is None and self.metadata_index is not None:
+            size = self.metadata_index.document_size(document_id)
+        return size
 
+    async def send_email(self, email: str, file_name: str, content: bytes) -> None:
         # todo: add handlers
-        credential = ClientSecretCredential(
-            tenant_id=config.graph.azure_tenant_id,
-            client_id=config.graph.client_id,
-            client_secret=config.graph.client_secret
-        )
-
-        graph_client = GraphServiceClient(credential)
-
         content_type = EmailServiceConsts.ZIP_CONTENT if file_name.endswith(".zip") else EmailServiceConsts.PDF_CONTENT
 
-        request_body = SendMailPostRequestBody(
-            message=Message(
-                subject=EmailServiceConsts.MESSAGE_SUBJECT,
-                body=ItemBody(
-                    content_type=BodyType.Text,
-                    content=EmailServiceConsts.ATTACHMENT_CONTENT_DESC.format(file_name=file_name),
-                ),
-                to_recipients=[
-                    Recipient(
-                        email_address=EmailAddress(
-                            address=email,
-                        ),
-                    ),
-                ],
-                attachments=[
-                    FileAttachment(
-                        odata_type=EmailServiceConsts.ODATA_FILE_TYPE,
-                        name=file_name,
-                        content_type=content_type,
-                        content_bytes=content,
-                    ),
-                ],
+        message = Message(
+            subject=EmailServiceConsts.MESSAGE_SUBJECT,
+            body=ItemBody(
+                content_type=BodyType.Text,
+                content=EmailServiceConsts.ATTACHMENT_CONTENT_DESC.format(file_name=file_name),
             ),
-            save_to_sent_items=False,
+            to_recipients=[
+                Recipient(
+                    email_address=EmailAddress(
+                        address=email,
+                    ),
+                ),
+            ],
         )
 
-        await graph_client.users.by_user_id(config.graph.sender_mailbox).send_mail.post(request_body)
+        if len(content) > self.graph_client.config.upload_session_threshold_bytes:
+            # avoids the base64 JSON body, Graph rejects inline attachments over ~3 MB
+            await self.graph_client.send_mail_with_upload(message, file_name, content_type, content)
+        else:
+            message.attachments = [
+                FileAttachment(
+                    odata_type=EmailServiceConsts.ODATA_FILE_TYPE,
+                    name=file_name,
+                    content_type=content_type,
+                    content_bytes=content,
+                ),
+            ]
+            await self.graph_client.send_mail(SendMailPostRequestBody(message=message, save_to_sent_items=False))
 
         logger.info("Email sent to %s with file %s", email, file_name)
-
@@ -9,12 +9,15 @@ logger = logging.getLogger(__name__)
 
 
 class PreviewDocumentAPIService(DocumentAPIService):
-    async def preview(self, document_id: str) -> DocumentContentDTO:
-        raw_byte_content = await self.document_client.get_document_content(document_id)
+    async def preview(self, document_id: str, rev: str | None = None) -> DocumentContentDTO:
+        return DocumentContentDTO(
+            content=encode_base64(await self.preview_content(document_id, rev))
+        )
+
+    async def preview_content(self, document_id: str, rev: str | None = None) -> bytes:
+        raw_byte_content = await self.document_client.get_document_content(document_id, rev)
 
         if raw_byte_content is None:
             raise PreviewDocumentNotFound()
 
-        return DocumentContentDTO(
-            content=encode_base64(raw_byte_content)
-        )
+        return raw_byte_content
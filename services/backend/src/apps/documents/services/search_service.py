@@ -1,22 +1,123 @@
+import asyncio
+from collections.abc import AsyncIterator
 import logging
 
-from src.apps.documents.dto import SearchResultDTO
+from src.apps.documents.cache import MetadataIndex, PartNumberMetadataCache
+from src.apps.documents.client import DocumentClient
+from src.apps.documents.dto import DocumentDTO, SearchChunkDTO, SearchResultDTO
+from src.apps.documents.exceptions import DocumentError
 from src.apps.documents.services.base_service import DocumentAPIService
+from src.config import get_config
 
 logger = logging.getLogger(__name__)
 
 
 class SearchDocumentAPIService(DocumentAPIService):
+    def __init__(
+            self,
+            client: DocumentClient,
+            metadata_cache: PartNumberMetadataCache | None = None,
+            metadata_index: MetadataIndex | None = None,
+    ):
+        super().__init__(client)
+        self.metadata_cache = metadata_cache
+        self.metadata_index = metadata_index
+
+        config = get_config().sap_cpi
+        self.chunk_size = config.search_chunk_size
+        self.max_in_flight = config.search_max_in_flight
+
     async def search(self, part_numbers: list[int]) -> SearchResultDTO:
-        response = await self.document_client.get_documents_list(part_numbers)
+        """
+        Answers from the local metadata index while it is current, otherwise
+        from the metadata cache and SAP CPI.
+        """
+        index = self.metadata_index
+        if index is not None and index.is_current():
+            return self._build_result(part_numbers, index.lookup(part_numbers))
+
+        cache = self.metadata_cache
+        if cache is None:
+            return self._build_result(part_numbers, await self._fetch(part_numbers))
+
+        results, misses = cache.get_fresh(part_numbers)
+        stale_part_numbers: list[int] = []
+
+        if misses:
+            try:
+                fetched = await self._fetch(misses)
+            except DocumentError:
+                stale = cache.get_stale(misses)
+                if len(stale) < len(set(misses)):
+                    raise
+
+                logger.warning("SAP CPI unavailable, serving %d stale part numbers", len(stale))
+                fetched = stale
+                stale_part_numbers = list(stale)
+            else:
+                cache.put_many(fetched)
+
+            results.update(fetched)
+
+        return self._build_result(part_numbers, results, stale_part_numbers)
+
+    async def search_chunks(self, part_numbers: list[int]) -> AsyncIterator[SearchChunkDTO]:
+        """
+        Searches upstream-sized chunks of ``part_numbers``, at most
+        ``max_in_flight`` at a time, and yields each chunk as it completes.
+
+        A failed chunk is yielded with its error instead of failing the
+        whole search.
+        """
+        unique = list(dict.fromkeys(part_numbers))
+        chunks = [unique[start:start + self.chunk_size] for start in range(0, len(unique), self.chunk_size)]
+        window = asyncio.Semaphore(max(1, self.max_in_flight))
+
+        async def search_chunk(chunk: list[int]) -> SearchChunkDTO:
+            async with window:
+                try:
+                    return SearchChunkDTO(part_numbers=chunk, result=await self.search(chunk))
+                except DocumentError as e:
+                    logger.warning("Search of %d part numbers failed: %s", len(chunk), e.detail)
+                    return SearchChunkDTO(part_numbers=chunk, error=str(e.detail))
+
+        logger.info("Searching %d part numbers in %d chunks", len(unique), len(chunks))
+        tasks = [asyncio.ensure_future(search_chunk(chunk)) for chunk in chunks]
+        try:
+            for next_completed in asyncio.as_completed(tasks):
+                yield await next_completed
+        finally:
+            # the client may disconnect mid-stream, do not leave searches running
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch(self, part_numbers: list[int]) -> dict[int, list[DocumentDTO]]:
+        documents = await self.document_client.get_documents_list(part_numbers)
+
+        results: dict[int, list[DocumentDTO]] = {part_number: [] for part_number in part_numbers}
+        for document in documents:
+            if document.part_number in results:
+                results[document.part_number].append(document)
+
+        return results
 
-        # todo: map xml response to dto
+    @staticmethod
+    def _build_result(
+            part_numbers: list[int],
+            results: dict[int, list[DocumentDTO]],
+            stale_part_numbers: list[int] | None = None,
+    ) -> SearchResultDTO:
+        documents: list[DocumentDTO] = []
+        not_found: list[int] = []
 
-        cpi_docs = response.get("data", [])
-        found_part_numbers = [doc.get("part_number") for doc in cpi_docs]
-        not_found = list(filter(lambda part_number: part_number not in found_part_numbers, part_numbers))
+        for part_number in dict.fromkeys(part_numbers):
+            if found := results.get(part_number):
+                documents.extend(found)
+            else:
+                not_found.append(part_number)
 
         return SearchResultDTO(
-            data=response,
-            not_found=not_found
+            documents=documents,
+            not_found_part_numbers=not_found,
+            stale_part_numbers=stale_part_numbers or [],
         )
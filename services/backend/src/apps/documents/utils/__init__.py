@@ -0,0 +1,10 @@
+from src.apps.documents.utils.encoders import Base64Encoder
+
+
+encode_base64 = Base64Encoder.encode_base64
+
+
+__all__ = [
+    "Base64Encoder",
+    "encode_base64",
+]
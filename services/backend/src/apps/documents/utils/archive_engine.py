@@ -0,0 +1,236 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+import logging
+import struct
+import time
+import zipfile
+import zlib
+
+from src.config import get_config
+from src.config.config import ArchiveConfig
+from src.infra.application.metrics import DEFAULT_SIZE_BUCKETS, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+archive_size = metrics_registry.histogram(
+    "archive_size_bytes", "Size of built ZIP archives", buckets=DEFAULT_SIZE_BUCKETS,
+).labels()
+
+
+_ZIP32_LIMIT = 0xFFFFFFFF
+_ZIP32_MAX_ENTRIES = 0xFFFF
+_ZIP64_MARKER = 0xFFFFFFFF
+_ZIP64_EXTRA_ID = 0x0001
+_UTF8_FLAG = 0x800
+_VERSION = 20
+_ZIP64_VERSION = 45
+_SAMPLE_WINDOWS = 8
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_OF_CENTRAL_DIRECTORY = struct.Struct("<IHHHHIIH")
+_ZIP64_END_OF_CENTRAL_DIRECTORY = struct.Struct("<IQHHIIQQQQ")
+_ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR = struct.Struct("<IIQI")
+
+
+@dataclass(frozen=True, slots=True)
+class CompressedEntry:
+    name: bytes
+    method: int
+    crc: int
+    size: int
+    data: bytes
+
+
+def should_store(content: bytes, level: int, sample_bytes: int, min_saving_ratio: float) -> bool:
+    """
+    Samples ``content`` and tells whether DEFLATE would save less than
+    ``min_saving_ratio``. PDFs with compressed streams usually do.
+
+    The sample is taken from windows centred on equal slices of the content,
+    since a PDF often starts with a small but compressible text header.
+    """
+    if not content or level == 0:
+        return True
+
+    if len(content) <= sample_bytes:
+        sample = content
+    else:
+        window = sample_bytes // _SAMPLE_WINDOWS
+        step = len(content) // _SAMPLE_WINDOWS
+        sample = b"".join(
+            content[start:start + window]
+            for start in range(step // 2 - window // 2, len(content) - window + 1, step)
+        )
+
+    compressed = zlib.compress(sample, level)
+    return len(compressed) > len(sample) * (1 - min_saving_ratio)
+
+
+def compress_entry(
+        name: str,
+        content: bytes,
+        level: int,
+        sample_bytes: int,
+        min_saving_ratio: float,
+) -> CompressedEntry:
+    """
+    Compresses one entry on its own, so entries can be compressed in parallel.
+    """
+    crc = zlib.crc32(content)
+
+    if should_store(content, level, sample_bytes, min_saving_ratio):
+        return CompressedEntry(name.encode(), zipfile.ZIP_STORED, crc, len(content), content)
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    data = compressor.compress(content) + compressor.flush()
+    return CompressedEntry(name.encode(), zipfile.ZIP_DEFLATED, crc, len(content), data)
+
+
+def _zip64_extra(values: list[int]) -> bytes:
+    if not values:
+        return b""
+    return struct.pack(f"<HH{len(values)}Q", _ZIP64_EXTRA_ID, 8 * len(values), *values)
+
+
+def assemble_zip(entries: list[CompressedEntry]) -> bytes:
+    """
+    Lays out precompressed entries as a ZIP archive, in the given order.
+
+    Sizes, offsets and counts past the ZIP32 limits go to Zip64 extra fields
+    and records, as ``zipfile`` does with ``allowZip64``.
+    """
+    local_time = time.localtime()
+    dos_time = local_time.tm_hour << 11 | local_time.tm_min << 5 | local_time.tm_sec // 2
+    dos_date = (local_time.tm_year - 1980) << 9 | local_time.tm_mon << 5 | local_time.tm_mday
+
+    parts: list[bytes] = []
+    central_directory: list[bytes] = []
+    offset = 0
+
+    for entry in entries:
+        compressed_size = len(entry.data)
+        sizes_overflow = entry.size > _ZIP32_LIMIT or compressed_size > _ZIP32_LIMIT
+
+        # the local header carries both sizes when either one overflows
+        local_extra = _zip64_extra([entry.size, compressed_size] if sizes_overflow else [])
+        local_header = _LOCAL_HEADER.pack(
+            0x04034B50, _ZIP64_VERSION if local_extra else _VERSION, _UTF8_FLAG, entry.method,
+            dos_time, dos_date, entry.crc,
+            _ZIP64_MARKER if sizes_overflow else compressed_size,
+            _ZIP64_MARKER if sizes_overflow else entry.size,
+            len(entry.name), len(local_extra),
+        )
+
+        # the central header only carries the fields that overflow
+        central_values = [
+            value for value in (entry.size, compressed_size, offset) if value > _ZIP32_LIMIT
+        ]
+        central_extra = _zip64_extra(central_values)
+        version = _ZIP64_VERSION if central_extra else _VERSION
+        central_directory.append(
+            _CENTRAL_HEADER.pack(
+                0x02014B50, version, version, _UTF8_FLAG, entry.method, dos_time, dos_date, entry.crc,
+                _ZIP64_MARKER if compressed_size > _ZIP32_LIMIT else compressed_size,
+                _ZIP64_MARKER if entry.size > _ZIP32_LIMIT else entry.size,
+                len(entry.name), len(central_extra), 0, 0, 0, 0,
+                _ZIP64_MARKER if offset > _ZIP32_LIMIT else offset,
+            )
+            + entry.name
+            + central_extra
+        )
+        parts += (local_header, entry.name, local_extra, entry.data)
+        offset += len(local_header) + len(entry.name) + len(local_extra) + compressed_size
+
+    directory = b"".join(central_directory)
+    count = len(entries)
+    parts.append(directory)
+
+    if count > _ZIP32_MAX_ENTRIES or len(directory) > _ZIP32_LIMIT or offset > _ZIP32_LIMIT:
+        zip64_end_offset = offset + len(directory)
+        parts += (
+            _ZIP64_END_OF_CENTRAL_DIRECTORY.pack(
+                0x06064B50, _ZIP64_END_OF_CENTRAL_DIRECTORY.size - 12, _ZIP64_VERSION, _ZIP64_VERSION,
+                0, 0, count, count, len(directory), offset,
+            ),
+            _ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR.pack(0x07064B50, 0, zip64_end_offset, 1),
+        )
+
+    parts.append(
+        _END_OF_CENTRAL_DIRECTORY.pack(
+            0x06054B50, 0, 0,
+            min(count, _ZIP32_MAX_ENTRIES), min(count, _ZIP32_MAX_ENTRIES),
+            min(len(directory), _ZIP64_MARKER), min(offset, _ZIP64_MARKER), 0,
+        ),
+    )
+    return b"".join(parts)
+
+
+class ArchiveEngine:
+    """
+    Builds ZIP archives off the event loop.
+
+    Entries are compressed independently in a thread pool (zlib releases the
+    GIL) and then assembled in input order. Each entry is STORED or DEFLATEd
+    depending on how well a sample of it compresses.
+    """
+
+    def __init__(
+            self,
+            executor: Executor,
+            compression_level: int = 6,
+            sample_bytes: int = 64 * 1024,
+            min_saving_ratio: float = 0.05,
+    ):
+        self.executor = executor
+        self.compression_level = compression_level
+        self.sample_bytes = sample_bytes
+        self.min_saving_ratio = min_saving_ratio
+
+    @classmethod
+    def from_config(cls, config: ArchiveConfig) -> "ArchiveEngine":
+        return cls(
+            executor=ThreadPoolExecutor(max_workers=config.workers, thread_name_prefix="archive"),
+            compression_level=config.compression_level,
+            sample_bytes=config.sample_bytes,
+            min_saving_ratio=config.min_saving_ratio,
+        )
+
+    async def create_zip_archive(self, files: dict[str, bytes]) -> bytes:
+        """
+        Builds an archive with one entry per ``{name: content}`` pair.
+        """
+        loop = asyncio.get_running_loop()
+        entries = await asyncio.gather(*(
+            loop.run_in_executor(
+                self.executor,
+                compress_entry,
+                name,
+                content,
+                self.compression_level,
+                self.sample_bytes,
+                self.min_saving_ratio,
+            )
+            for name, content in files.items()
+        ))
+
+        stored = sum(entry.method == zipfile.ZIP_STORED for entry in entries)
+        logger.debug("Archive of %d entries built, %d stored without compression", len(entries), stored)
+
+        archive = await loop.run_in_executor(self.executor, assemble_zip, list(entries))
+        archive_size.observe(len(archive))
+        return archive
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(self.executor.shutdown)
+
+
+@lru_cache
+def get_archive_engine() -> ArchiveEngine:
+    """
+    Per-worker engine, shut down by the application lifespan.
+    """
+    return ArchiveEngine.from_config(get_config().archive)
@@ -0,0 +1,87 @@
+from collections.abc import AsyncIterator, Mapping
+
+from fastapi import status
+from fastapi.responses import StreamingResponse
+
+from src.apps.documents.exceptions import DocumentRangeNotSatisfiable
+
+BYTES_UNIT = "bytes"
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Parses a single ``Range: bytes=...`` header into inclusive offsets.
+
+    Returns ``None`` when the whole representation should be served: no
+    header, another unit, a malformed value or several ranges (RFC 9110
+    allows ignoring those). Raises ``DocumentRangeNotSatisfiable`` when
+    the range lies outside the content.
+    """
+    if not header:
+        return None
+
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != BYTES_UNIT or "," in spec:
+        return None
+
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+
+    try:
+        if not first:
+            # suffix range: the last N bytes
+            suffix = int(last)
+            if suffix <= 0 or size == 0:
+                raise DocumentRangeNotSatisfiable(headers={"Content-Range": f"{BYTES_UNIT} */{size}"})
+            return max(size - suffix, 0), size - 1
+
+        start = int(first)
+        end = int(last) if last else None
+    except ValueError:
+        return None
+
+    if start < 0 or (end is not None and start > end):
+        return None
+    if start >= size:
+        raise DocumentRangeNotSatisfiable(headers={"Content-Range": f"{BYTES_UNIT} */{size}"})
+
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+async def _iter_slice(content: bytes, start: int, stop: int, chunk_size: int) -> AsyncIterator[bytes]:
+    view = memoryview(content)
+    for offset in range(start, stop, chunk_size):
+        yield bytes(view[offset:min(offset + chunk_size, stop)])
+
+
+def byte_range_response(
+        content: bytes,
+        media_type: str,
+        range_header: str | None,
+        headers: Mapping[str, str] | None = None,
+        chunk_size: int = CHUNK_SIZE,
+) -> StreamingResponse:
+    """
+    Streams ``content``, or the part of it requested by ``range_header``
+    as ``206 Partial Content``, in ``chunk_size`` pieces.
+    """
+    size = len(content)
+    response_headers = {"Accept-Ranges": BYTES_UNIT, **(headers or {})}
+
+    byte_range = parse_byte_range(range_header, size)
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, status.HTTP_200_OK
+    else:
+        start, end = byte_range
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        response_headers["Content-Range"] = f"{BYTES_UNIT} {start}-{end}/{size}"
+
+    response_headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _iter_slice(content, start, end + 1, chunk_size),
+        status_code=status_code,
+        media_type=media_type,
+        headers=response_headers,
+    )
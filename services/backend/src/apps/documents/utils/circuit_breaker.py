@@ -0,0 +1,113 @@
+from enum import StrEnum
+import logging
+import time
+
+from src.config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream endpoint.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are refused for ``reset_timeout_seconds``. Then up to
+    ``half_open_max_calls`` trial calls are let through: a success closes
+    the circuit, a failure opens it again.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            failure_threshold: int,
+            reset_timeout_seconds: float,
+            half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+                self._state == CircuitState.OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def allow_request(self) -> bool:
+        state = self.state
+
+        if state == CircuitState.CLOSED:
+            return True
+
+        if state == CircuitState.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+
+        return False
+
+    def record_success(self) -> None:
+        if self._state != CircuitState.CLOSED:
+            logger.info("circuit %s closed", self.name)
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+
+    def release(self) -> None:
+        """
+        Returns a half-open trial slot when the call ended without a verdict.
+        """
+        if self._state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def record_failure(self) -> None:
+        self._failures += 1
+
+        if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != CircuitState.OPEN:
+                logger.warning("circuit %s opened after %d failures", self.name, self._failures)
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+
+class CircuitBreakerRegistry:
+    """
+    Per-worker circuit breakers, created on first use from SAP CPI config.
+    """
+
+    def __init__(self) -> None:
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            config = get_config().sap_cpi
+            breaker = CircuitBreaker(
+                name=name,
+                failure_threshold=config.breaker_failure_threshold,
+                reset_timeout_seconds=config.breaker_reset_timeout_seconds,
+                half_open_max_calls=config.breaker_half_open_max_calls,
+            )
+            self._breakers[name] = breaker
+        return breaker
+
+    def states(self) -> dict[str, CircuitState]:
+        return {name: breaker.state for name, breaker in self._breakers.items()}
+
+
+circuit_breakers = CircuitBreakerRegistry()
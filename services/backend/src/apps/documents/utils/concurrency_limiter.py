@@ -0,0 +1,156 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import AsyncIterator
+
+import httpx
+
+from src.apps.documents.exceptions import DocumentServiceOverloadedError
+from src.infra.application.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LimiterSlot:
+    """
+    Holds the outcome of one upstream call made under the limiter.
+    """
+    started_at: float = field(default_factory=time.monotonic)
+    status_code: int | None = None
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit for calls to a single upstream.
+
+    Every successful call grows the limit by ``1 / limit`` (roughly +1 per
+    window of calls). Throttling (429), server errors (5xx), transport
+    failures and calls slower than ``latency_threshold_seconds`` shrink it
+    by ``backoff_ratio``, at most once per window so a burst of failures
+    does not collapse the limit to the floor. Callers above the limit wait
+    in FIFO order for up to ``queue_timeout_seconds``.
+    """
+
+    def __init__(
+            self,
+            initial_limit: int,
+            min_limit: int,
+            max_limit: int,
+            queue_timeout_seconds: float,
+            latency_threshold_seconds: float,
+            backoff_ratio: float = 0.75,
+            name: str = "upstream",
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.latency_threshold_seconds = latency_threshold_seconds
+        self.backoff_ratio = backoff_ratio
+        self.name = name
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._last_decrease_at = 0.0
+
+        self.queue_wait = metrics_registry.histogram(
+            f"{name}_limiter_queue_wait_seconds", "Time spent waiting for a slot",
+        ).labels()
+        self.rejected_total = metrics_registry.counter(
+            f"{name}_limiter_rejected_total", "Calls rejected after waiting for a slot",
+        )
+        self.rejected = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[LimiterSlot]:
+        await self._acquire()
+        slot = LimiterSlot()
+        try:
+            yield slot
+        except httpx.TransportError:
+            self._on_congestion(slot)
+            raise
+        except httpx.HTTPStatusError:
+            self._on_result(slot)
+            raise
+        else:
+            self._on_result(slot)
+        finally:
+            self._release()
+
+    async def _acquire(self) -> None:
+        queued_at = time.monotonic()
+
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self.queue_wait.observe(0.0)
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            async with asyncio.timeout(self.queue_timeout_seconds):
+                await waiter
+        except TimeoutError:
+            # a slot handed over right as the timeout fired is kept
+            if waiter.cancelled():
+                self.rejected += 1
+                self.rejected_total.inc()
+                logger.warning(
+                    "%s limiter queue timeout after %.2fs (limit=%d, in_flight=%d, queued=%d)",
+                    self.name, self.queue_timeout_seconds, self.limit, self._in_flight, len(self._waiters),
+                )
+                raise DocumentServiceOverloadedError() from None
+        except asyncio.CancelledError:
+            # the slot may have been handed over right before cancellation
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+        self.queue_wait.observe(time.monotonic() - queued_at)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def _on_result(self, slot: LimiterSlot) -> None:
+        status_code = slot.status_code or 0
+        latency = time.monotonic() - slot.started_at
+
+        if status_code == 429 or status_code >= 500 or latency > self.latency_threshold_seconds:
+            self._on_congestion(slot)
+        else:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def _on_congestion(self, slot: LimiterSlot) -> None:
+        # calls started before the last decrease reflect the old limit
+        if slot.started_at < self._last_decrease_at:
+            return
+
+        self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+        self._last_decrease_at = time.monotonic()
+        logger.info("%s limiter decreased to %d", self.name, self.limit)
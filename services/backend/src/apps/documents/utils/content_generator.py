@@ -1,8 +1,12 @@
 import asyncio
-from typing import Optional
+import json
+from typing import AsyncIterator, Optional
 from datetime import datetime, UTC
-from src.apps.documents.utils.zip_generator import ZipGenerator
+from src.apps.documents.constants import DOCUMENT_NAME, MANIFEST_NAME
+from src.apps.documents.utils.archive_engine import get_archive_engine
+from src.apps.documents.utils.zip_stream import ZipStreamWriter
 from src.apps.documents.client import DocumentClient
+from src.config import get_config
 
 
 class ContentGenerator:
@@ -18,8 +22,20 @@ class ContentGenerator:
             return document_id, None
 
     @staticmethod
-    async def content_response(client: DocumentClient, document_ids: list[str]):
-        tasks = [ContentGenerator.fetch_single_document(client, doc_id) for doc_id in document_ids]
+    def archive_name() -> str:
+        timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+        return f"{timestamp}.zip"  # todo: implement naming functionality
+
+    @staticmethod
+    async def content_response(client: DocumentClient, document_ids: list[str], archive: bool = False):
+        """
+        Fetches the documents into a single PDF, or a ZIP archive when there
+        are several or ``archive`` is set.
+        """
+        tasks = [
+            ContentGenerator.fetch_single_document(client, doc_id)
+            for doc_id in dict.fromkeys(document_ids)
+        ]
         results = await asyncio.gather(*tasks)
 
         found_files: dict[str, bytes] = {}
@@ -32,17 +48,70 @@ class ContentGenerator:
                 found_files[doc_id] = content
 
         if found_files:
-            timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-
-            if len(found_files) == 1:
+            if len(found_files) == 1 and not archive:
                 doc_id, content = next(iter(found_files.items()))
                 file_name = f"document_{doc_id}.pdf"  # todo: implement naming functionality
                 file_content = content
             else:
-                file_name = f"{timestamp}.zip"  # todo: implement naming functionality
-                file_content = ZipGenerator.create_zip_archive(found_files)
+                file_name = ContentGenerator.archive_name()
+                file_content = await get_archive_engine().create_zip_archive(
+                    {DOCUMENT_NAME.format(doc_id): content for doc_id, content in found_files.items()}
+                )
             return (
                 file_name, file_content, failed_ids
             )
 
         return None
+
+    @staticmethod
+    async def stream_archive(
+            client: DocumentClient,
+            document_ids: list[str],
+            prefetch: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yields a ZIP archive entry by entry, in the order documents arrive.
+
+        At most ``prefetch`` documents are fetched ahead of the consumer, so
+        a slow client holds a bounded number of payloads whatever the batch
+        size. Documents that could not be fetched are listed in a trailing
+        manifest entry instead of failing the whole archive.
+        """
+        if prefetch is None:
+            prefetch = get_config().archive.stream_prefetch
+
+        remaining = iter(dict.fromkeys(document_ids))
+        tasks: set[asyncio.Future[tuple[str, Optional[bytes]]]] = set()
+        writer = ZipStreamWriter()
+        written: list[str] = []
+        failed_ids: list[str] = []
+
+        try:
+            while True:
+                for doc_id in remaining:
+                    tasks.add(asyncio.ensure_future(ContentGenerator.fetch_single_document(client, doc_id)))
+                    if len(tasks) >= prefetch:
+                        break
+                if not tasks:
+                    break
+
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    doc_id, content = task.result()
+
+                    if content is None:
+                        failed_ids.append(doc_id)
+                        continue
+
+                    entry_name = DOCUMENT_NAME.format(doc_id)
+                    yield await writer.add_entry(entry_name, content)
+                    written.append(entry_name)
+
+            manifest = {"documents": written, "failed_document_ids": failed_ids}
+            yield await writer.add_entry(MANIFEST_NAME, json.dumps(manifest).encode())
+            yield await writer.finish()
+
+        finally:
+            # the client may disconnect mid-stream, do not leave fetches running
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,77 @@
+from typing import Generic, Iterator, TypeVar
+from xml.etree.ElementTree import Element, XMLPullParser
+
+from pydantic import BaseModel
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+DATA_SERVICES = "{http://schemas.microsoft.com/ado/2007/08/dataservices}"
+METADATA = "{http://schemas.microsoft.com/ado/2007/08/dataservices/metadata}"
+
+_ENTRY = ATOM + "entry"
+_LINK = ATOM + "link"
+_PROPERTIES = METADATA + "properties"
+_NULL = METADATA + "null"
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def is_xml_media_type(content_type: str | None) -> bool:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return media_type.endswith("/xml") or media_type.endswith("+xml")
+
+
+class AtomFeedParser(Generic[M]):
+    """
+    Incremental parser of OData Atom feeds into ``model`` instances.
+
+    Bytes are fed as they arrive. Each ``<entry>`` is converted as soon as
+    its closing tag is parsed and then dropped from the tree, so memory
+    stays bounded by one entry however large the feed is. Only properties
+    that are fields of ``model`` are read, ``m:null`` ones are skipped.
+    """
+
+    def __init__(self, model: type[M]):
+        self.model = model
+        self.next_link: str | None = None
+
+        self._fields = frozenset(model.model_fields)
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._feed: Element | None = None
+
+    def feed(self, data: bytes) -> Iterator[M]:
+        self._parser.feed(data)
+        return self._read_events()
+
+    def close(self) -> Iterator[M]:
+        self._parser.close()
+        return self._read_events()
+
+    def _read_events(self) -> Iterator[M]:
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if self._feed is None:
+                    self._feed = element
+                continue
+
+            if element.tag == _ENTRY:
+                yield self._to_model(element)
+                element.clear()
+                if self._feed is not None and self._feed is not element:
+                    self._feed.remove(element)
+            elif element.tag == _LINK and element.get("rel") == "next":
+                self.next_link = element.get("href")
+
+    def _to_model(self, entry: Element) -> M:
+        properties = entry.find(f"{ATOM}content/{_PROPERTIES}")
+        if properties is None:
+            # media link entries carry their properties next to the content
+            properties = entry.find(_PROPERTIES)
+
+        values: dict[str, str] = {}
+        if properties is not None:
+            for prop in properties:
+                name = prop.tag.removeprefix(DATA_SERVICES)
+                if name in self._fields and prop.get(_NULL) != "true":
+                    values[name] = prop.text or ""
+
+        return self.model.model_validate(values)
@@ -0,0 +1,84 @@
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Iterable
+
+
+NEXT_LINK = "@odata.nextLink"
+
+ODataValue = str | int | float | bool | datetime | None
+
+
+def odata_literal(value: ODataValue) -> str:
+    """
+    Formats a Python value as an OData URL literal.
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, datetime):
+        return value.isoformat().replace("+00:00", "Z")
+    return "'" + value.replace("'", "''") + "'"
+
+
+def eq(name: str, value: ODataValue) -> str:
+    return f"{name} eq {odata_literal(value)}"
+
+
+def ge(name: str, value: ODataValue) -> str:
+    return f"{name} ge {odata_literal(value)}"
+
+
+def any_of(name: str, values: Iterable[ODataValue]) -> str:
+    """
+    ``name`` equal to one of ``values``, as an ``or`` chain (``in`` is OData 4.01 only).
+    """
+    return "(" + " or ".join(eq(name, value) for value in values) + ")"
+
+
+@dataclass(frozen=True, slots=True)
+class ODataQuery:
+    """
+    Immutable OData query options, built by chaining.
+
+        ODataQuery().select("id", "rev").where(eq("rev", "A")).top(50).params()
+    """
+    fields: tuple[str, ...] = ()
+    filters: tuple[str, ...] = ()
+    order: tuple[str, ...] = ()
+    limit: int | None = None
+    offset: int | None = None
+
+    def select(self, *fields: str) -> "ODataQuery":
+        return replace(self, fields=self.fields + fields)
+
+    def where(self, *filters: str) -> "ODataQuery":
+        """
+        Adds filter expressions, all of which must hold.
+        """
+        return replace(self, filters=self.filters + filters)
+
+    def order_by(self, *order: str) -> "ODataQuery":
+        return replace(self, order=self.order + order)
+
+    def top(self, limit: int) -> "ODataQuery":
+        return replace(self, limit=limit)
+
+    def skip(self, offset: int) -> "ODataQuery":
+        return replace(self, offset=offset)
+
+    def params(self) -> dict[str, str]:
+        params: dict[str, str] = {}
+        if self.fields:
+            params["$select"] = ",".join(self.fields)
+        if self.filters:
+            params["$filter"] = " and ".join(self.filters)
+        if self.order:
+            params["$orderby"] = ",".join(self.order)
+        if self.limit is not None:
+            params["$top"] = str(self.limit)
+        if self.offset:
+            params["$skip"] = str(self.offset)
+        return params
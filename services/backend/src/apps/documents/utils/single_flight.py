@@ -0,0 +1,75 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Coalesces concurrent calls for the same key into one shared upstream call.
+
+    Every caller awaits the same task through ``asyncio.shield`` so errors
+    reach all waiters, while a cancelled waiter leaves the shared call (and
+    the other waiters) untouched.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[K, asyncio.Future[V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._track(key, future)
+
+        return await asyncio.shield(future)
+
+    async def do_many(
+            self,
+            keys: list[K],
+            fn: Callable[[list[K]], Awaitable[dict[K, V]]],
+    ) -> dict[K, V]:
+        """
+        Resolves each key, joining calls already in flight and fetching all
+        remaining keys with a single ``fn`` call.
+
+        ``fn`` must return a value for every key it was given.
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        missing = [key for key in unique_keys if key not in self._in_flight]
+
+        if missing:
+            batch = asyncio.ensure_future(fn(missing))
+            self._mark_retrieved(batch)
+
+            for key in missing:
+                self._track(key, asyncio.ensure_future(self._pick(batch, key)))
+
+        gathered = asyncio.gather(*(self._in_flight[key] for key in unique_keys))
+        self._mark_retrieved(gathered)
+        values = await asyncio.shield(gathered)
+        return dict(zip(unique_keys, values, strict=True))
+
+    @staticmethod
+    async def _pick(batch: "asyncio.Future[dict[K, V]]", key: K) -> V:
+        return (await batch)[key]
+
+    def _track(self, key: K, future: "asyncio.Future[V]") -> None:
+        self._in_flight[key] = future
+
+        def release(done: "asyncio.Future[V]") -> None:
+            if self._in_flight.get(key) is done:
+                del self._in_flight[key]
+
+        future.add_done_callback(release)
+        self._mark_retrieved(future)
+
+    @staticmethod
+    def _mark_retrieved(future: asyncio.Future) -> None:
+        # all waiters may be gone by the time a shared call fails
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
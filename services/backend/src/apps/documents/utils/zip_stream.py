@@ -0,0 +1,62 @@
+import asyncio
+import io
+import zipfile
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Non-seekable write target collecting archive bytes until drained.
+
+    Being non-seekable makes ``zipfile`` emit data descriptors after each
+    entry, so CRC and sizes are computed on the fly and headers never have
+    to be rewritten.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStreamWriter:
+    """
+    Incrementally builds a ZIP archive, handing out bytes as entries are added.
+
+    Zip64 extensions are enabled for entries and central directory records
+    whenever sizes or offsets exceed the classic ZIP limits.
+    """
+
+    def __init__(self, compression: int = zipfile.ZIP_DEFLATED) -> None:
+        self._sink = _ChunkSink()
+        self._zip_file = zipfile.ZipFile(
+            self._sink,
+            mode="w",
+            compression=compression,
+            allowZip64=True,
+        )
+
+    async def add_entry(self, name: str, content: bytes) -> bytes:
+        """
+        Compresses ``content`` off the event loop and returns the archive
+        bytes produced for this entry.
+        """
+        await asyncio.to_thread(self._zip_file.writestr, name, content)
+        return self._sink.drain()
+
+    async def finish(self) -> bytes:
+        """
+        Writes the central directory and returns the remaining bytes.
+        """
+        await asyncio.to_thread(self._zip_file.close)
+        return self._sink.drain()
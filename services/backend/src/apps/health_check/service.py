@@ -3,10 +3,14 @@ import asyncio
 from dataclasses import dataclass
 from itertools import chain, groupby
 import logging
+from typing import Any
 
 from datetime import UTC, datetime
 import time
 
+import httpx
+
+from src.apps.documents.utils.circuit_breaker import CircuitState, circuit_breakers
 from src.apps.health_check.dto import (
     CheckResult,
     CheckComponentType,
@@ -45,6 +49,26 @@ class UptimeCheck(Check):
         )
 
 
+@dataclass
+class CircuitBreakerCheck(Check):
+    """
+    Reports SAP CPI circuit breaker states, warns while any is not closed.
+    """
+    component_id: str = "sap_cpi:circuit_breakers"
+    component_type: CheckComponentType = CheckComponentType.component
+
+    async def __call__(self) -> CheckResult:
+        states = circuit_breakers.states()
+        all_closed = all(state == CircuitState.CLOSED for state in states.values())
+        return CheckResult(
+            component_id=self.component_id,
+            component_type=self.component_type,
+            observed_value={name: str(state) for name, state in states.items()},
+            status=(healthy_status if all_closed else warn_status).name,
+            time=datetime.now(UTC).isoformat(),
+        )
+
+
 @dataclass(frozen=True)
 class Probe:
     name: str
@@ -68,14 +92,128 @@ warn_status = ProbeResultStatus(code=200, name="warn")
 fail_status = ProbeResultStatus(code=503, name="fail")
 
 
+@dataclass
+class HttpCheck(Check):
+    """
+    Checks that an upstream answers HTTP requests.
+
+    Any response below 500 means the upstream is reachable, unless
+    ``expected_status`` asks for a specific one.
+    """
+    url: str = ""
+    http_client: httpx.AsyncClient | None = None
+    expected_status: int | None = None
+
+    async def __call__(self) -> CheckResult:
+        assert self.http_client is not None
+
+        started_at = time.monotonic()
+        try:
+            response = await self.http_client.get(self.url)
+            healthy = (
+                response.status_code == self.expected_status
+                if self.expected_status is not None
+                else response.status_code < 500
+            )
+            observed_value: Any = round((time.monotonic() - started_at) * 1000, 1)
+        except httpx.HTTPError as e:
+            healthy = False
+            observed_value = type(e).__name__
+
+        return CheckResult(
+            component_id=self.component_id,
+            component_type=self.component_type,
+            observed_value=observed_value,
+            observed_unit="ms" if healthy else None,
+            status=(healthy_status if healthy else fail_status).name,
+            time=datetime.now(UTC).isoformat(),
+        )
+
+
+@dataclass
+class CachedCheck(Check):
+    """
+    Serves the last result of ``check``, which is refreshed in the
+    background by ``CheckScheduler`` so probes never call upstreams.
+
+    A failing check is reported as ``warn`` unless it is ``critical``:
+    upstreams are shared by all pods, so taking every pod out of rotation
+    would not help while the circuit breakers already fail fast.
+    """
+    component_id: str = ""
+    check: Check | None = None
+    timeout_seconds: float = 3
+    critical: bool = False
+
+    def __post_init__(self):
+        assert self.check is not None
+        self.component_id = self.component_id or self.check.component_id
+        self.component_type = self.check.component_type
+        self._result: CheckResult | None = None
+
+    async def refresh(self) -> None:
+        assert self.check is not None
+
+        try:
+            result = await asyncio.wait_for(self.check(), self.timeout_seconds)
+        except TimeoutError:
+            result = self._result_with_status(fail_status, "timeout")
+        except Exception as e:
+            logger.exception("Health check %s failed", self.component_id)
+            result = self._result_with_status(fail_status, type(e).__name__)
+
+        if result.status == fail_status.name and not self.critical:
+            result = result.model_copy(update={"status": warn_status.name})
+
+        self._result = result
+
+    async def __call__(self) -> CheckResult:
+        return self._result or self._result_with_status(warn_status, "pending")
+
+    def _result_with_status(self, status: ProbeResultStatus, observed_value: str) -> CheckResult:
+        return CheckResult(
+            component_id=self.component_id,
+            component_type=self.component_type,
+            observed_value=observed_value,
+            status=status.name,
+            time=datetime.now(UTC).isoformat(),
+        )
+
+
+class CheckScheduler:
+    """
+    Refreshes cached checks every ``interval_seconds`` in a background task.
+    """
+
+    def __init__(self, checks: list[CachedCheck], interval_seconds: float):
+        self.checks = checks
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="health-check-scheduler")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.gather(*(check.refresh() for check in self.checks))
+            await asyncio.sleep(self.interval_seconds)
+
+
 class HealthCheckService:
     async def run_probe(self, probe: Probe) -> ProbeResult:
         checks = [check() for check in probe.checks]
         check_results: list[CheckResult] = await asyncio.gather(*checks)
 
         checks_by_component = {}
+        # groupby only merges adjacent items, so results are sorted first
         for component_id, checks in groupby(
-                check_results,
+                sorted(check_results, key=lambda c: c.component_id),
                 key=lambda c: c.component_id,
         ):
             checks_by_component[component_id] = list(checks)
@@ -91,10 +229,11 @@ class HealthCheckService:
             self,
             checks: dict[str, list[CheckResult]],
     ) -> ProbeResultStatus:
-        for check in chain.from_iterable(checks.values()):
-            if check.status == warn_status.name:
-                return warn_status
-            elif check.status == fail_status.name:
-                return fail_status
+        statuses = {check.status for check in chain.from_iterable(checks.values())}
+
+        if fail_status.name in statuses:
+            return fail_status
+        if warn_status.name in statuses:
+            return warn_status
 
         return healthy_status
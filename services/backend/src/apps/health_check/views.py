@@ -1,11 +1,22 @@
 import logging
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 
-from src.config import config
+import httpx
+
+from src.config import AppConfig, config
 from src.apps.health_check.dto import HealthOut
-from src.apps.health_check.service import HealthCheckService, Probe, ProbeResult, UptimeCheck
+from src.apps.health_check.service import (
+    CachedCheck,
+    CheckScheduler,
+    CircuitBreakerCheck,
+    HealthCheckService,
+    HttpCheck,
+    Probe,
+    ProbeResult,
+    UptimeCheck,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,5 +43,56 @@ LIVENESS_PROBE = Probe(
     name="live",
     checks=[
         UptimeCheck(),
+        CircuitBreakerCheck(),
     ],
 )
+
+
+async def readiness_check_handler(
+    request: Request,
+    health_check: HealthCheckService = Depends(),
+):
+    return await health_check_handler(request.app.state.readiness_probe, health_check)
+
+
+def create_readiness_probe(
+    app_config: AppConfig,
+    http_client: httpx.AsyncClient,
+) -> tuple[Probe, CheckScheduler]:
+    """
+    Builds the readiness probe, whose upstream checks are evaluated by the
+    returned scheduler in the background and served from cache.
+    """
+    upstream_checks = [
+        CachedCheck(
+            check=check,
+            timeout_seconds=app_config.readiness_check_timeout_seconds,
+        )
+        for check in (
+            HttpCheck(
+                component_id="sap_cpi:reachability",
+                url=str(app_config.sap_cpi.document_base_url),
+                http_client=http_client,
+            ),
+            HttpCheck(
+                component_id="azure:jwks",
+                url=app_config.azure.jwks_url,
+                http_client=http_client,
+                expected_status=200,
+            ),
+            HttpCheck(
+                component_id="graph:token_endpoint",
+                url=f"https://login.microsoftonline.com/{app_config.graph.azure_tenant_id}/oauth2/v2.0/token",
+                http_client=http_client,
+            ),
+        )
+    ]
+
+    probe = Probe(
+        name="ready",
+        checks=[
+            UptimeCheck(),
+            *upstream_checks,
+        ],
+    )
+    return probe, CheckScheduler(upstream_checks, app_config.readiness_check_interval_seconds)
@@ -0,0 +1,48 @@
+from fastapi import Request
+from fastapi.responses import PlainTextResponse
+
+from src.apps.documents.utils.circuit_breaker import CircuitState, circuit_breakers
+from src.infra.application.metrics import metrics_registry
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_CIRCUIT_STATE_VALUES = {
+    CircuitState.CLOSED: 0,
+    CircuitState.HALF_OPEN: 1,
+    CircuitState.OPEN: 2,
+}
+
+limiter_limit = metrics_registry.gauge("sap_cpi_limiter_limit", "Current adaptive concurrency limit")
+limiter_in_flight = metrics_registry.gauge("sap_cpi_limiter_in_flight", "SAP CPI calls holding a limiter slot")
+limiter_queued = metrics_registry.gauge("sap_cpi_limiter_queued", "SAP CPI calls waiting for a limiter slot")
+index_documents = metrics_registry.gauge("metadata_index_documents", "Documents in the local metadata index")
+index_lag = metrics_registry.gauge("metadata_index_lag_seconds", "Time since the last metadata index sync")
+circuit_states = metrics_registry.gauge(
+    "sap_cpi_circuit_state", "Circuit breaker state (0 closed, 1 half open, 2 open)", ("operation",),
+)
+
+
+def _collect_state_metrics(request: Request) -> None:
+    """
+    Copies values owned by shared per-worker objects into gauges at scrape time.
+    """
+    state = request.app.state
+
+    document_client = getattr(state, "document_client", None)
+    if document_client is not None and (limiter := document_client.limiter) is not None:
+        limiter_limit.set(limiter.limit)
+        limiter_in_flight.set(limiter.in_flight)
+        limiter_queued.set(limiter.queued)
+
+    if (metadata_index := getattr(state, "metadata_index", None)) is not None:
+        index_documents.set(len(metadata_index))
+        index_lag.set(metadata_index.lag_seconds)
+
+    for operation, circuit_state in circuit_breakers.states().items():
+        circuit_states.set(_CIRCUIT_STATE_VALUES[circuit_state], operation)
+
+
+async def metrics_handler(request: Request) -> PlainTextResponse:
+    _collect_state_metrics(request)
+    return PlainTextResponse(metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -27,6 +27,17 @@ class GraphConfig(BaseSettings):
     client_secret: str
     azure_tenant_id: str
 
+    timeout_seconds: int = 60
+    # cached access tokens are refreshed this long before they expire
+    token_refresh_margin_seconds: int = 300
+
+    # attachments above the threshold go through an upload session instead of inline
+    upload_session_threshold_bytes: int = 3 * 1024 * 1024
+    # must be a multiple of 320 KiB and at most 4 MiB
+    upload_chunk_size_bytes: int = 10 * 320 * 1024
+    # Graph expects Outlook attachment chunks in order, keep 1 unless verified otherwise
+    upload_max_in_flight: int = 1
+
     _email_config: EmailConfig | None = None
 
     @property
@@ -45,6 +56,30 @@ class GraphConfig(BaseSettings):
         return f"{self.azure_issuer}/discovery/v2.0/keys"
 
 
+# Azure AD app registration validating the SPA bearer tokens
+class AzureConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="AZURE_")
+
+    tenant_id: str
+    client_id: str
+
+    jwks_ttl_seconds: int = 60 * 60
+    jwks_timeout_seconds: int = 10
+    # minimum interval between forced refreshes triggered by an unknown kid
+    jwks_unknown_kid_refresh_interval_seconds: int = 60
+
+    # verified tokens kept so repeated calls skip signature verification
+    verified_token_cache_size: int = 1024
+
+    @property
+    def issuer(self) -> str:
+        return f"https://login.microsoftonline.com/{self.tenant_id}/v2.0"
+
+    @property
+    def jwks_url(self) -> str:
+        return f"https://login.microsoftonline.com/{self.tenant_id}/discovery/v2.0/keys"
+
+
 class SAPCPIConfig(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="SAP_CPI_")
 
@@ -53,13 +88,110 @@ class SAPCPIConfig(BaseSettings):
     client_id: str
     client_secret: str
 
+    timeout_seconds: int = 30
+
+    # Connection pool shared by all requests of a worker
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_seconds: float = 30.0
+    http2: bool = False
+
+    # Adaptive (AIMD) concurrency limit for upstream calls
+    limiter_initial_limit: int = 20
+    limiter_min_limit: int = 2
+    limiter_max_limit: int = 100
+    limiter_queue_timeout_seconds: float = 10.0
+    limiter_latency_threshold_seconds: float = 5.0
+    limiter_backoff_ratio: float = 0.75
+
+    # Retries of idempotent requests (decorrelated jitter backoff)
+    retry_attempts: int = 3
+    retry_base_delay_seconds: float = 0.2
+    retry_max_delay_seconds: float = 2.0
+
+    # Bulk search splits part numbers into upstream calls of this size
+    search_chunk_size: int = 10
+    search_max_in_flight: int = 4
+
+    # Per-endpoint circuit breaker
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout_seconds: float = 30.0
+    breaker_half_open_max_calls: int = 1
+
+
+class ContentCacheConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="CONTENT_CACHE_")
+
+    enabled: bool = True
+    memory_max_bytes: int = 128 * 1024 * 1024
+    disk_path: str | None = "/tmp/document-cache"
+    disk_max_bytes: int = 2 * 1024 * 1024 * 1024
+    # How long the last seen revision is trusted for lookups without "rev"
+    revision_ttl_seconds: float = 60.0
+
+
+class MetadataCacheConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="METADATA_CACHE_")
+
+    enabled: bool = True
+    ttl_seconds: float = 300.0
+    negative_ttl_seconds: float = 60.0
+    # How long expired entries are still served when SAP CPI is unavailable
+    stale_ttl_seconds: float = 3600.0
+    max_entries: int = 50_000
+
+
+class MetadataIndexConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="METADATA_INDEX_")
+
+    # requires the metadata endpoint to support $filter/$orderby on date_created
+    enabled: bool = False
+    sync_interval_seconds: float = 60.0
+    full_sync_interval_seconds: float = 6 * 3600.0
+    # searches go to SAP CPI when the last sync is older than this
+    max_lag_seconds: float = 300.0
+    page_size: int = 5000
+
+
+class ArchiveConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="ARCHIVE_")
+
+    workers: int = 4
+    compression_level: int = Field(default=6, ge=0, le=9)
+    sample_bytes: int = 64 * 1024
+    # entries whose sample compresses by less than this ratio are stored as is
+    min_saving_ratio: float = 0.05
+    # documents fetched ahead of a streamed archive, bounds its memory use
+    stream_prefetch: int = Field(default=4, ge=1)
+
+
+class EmailJobsConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="EMAIL_JOBS_")
+
+    enabled: bool = True
+    # Must be on persistent storage (the /services/data volume of the image),
+    # otherwise queued sends are lost when the pod restarts
+    db_path: str = "/services/data/email-jobs.sqlite3"
+    workers: int = 2
+    max_attempts: int = 3
+    retry_backoff_seconds: float = 30.0
+    # A running job whose lease expired is considered abandoned and retried
+    lease_seconds: float = 300.0
+    poll_interval_seconds: float = 1.0
+
 
 class AppConfig(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="")
 
     email: EmailConfig = Field(default_factory=EmailConfig) # type: ignore[arg-type]
     graph: GraphConfig = Field(default_factory=GraphConfig) # type: ignore[arg-type]
+    azure: AzureConfig = Field(default_factory=AzureConfig) # type: ignore[arg-type]
     sap_cpi: SAPCPIConfig = Field(default_factory=SAPCPIConfig) # type: ignore[arg-type]
+    content_cache: ContentCacheConfig = Field(default_factory=ContentCacheConfig)
+    metadata_cache: MetadataCacheConfig = Field(default_factory=MetadataCacheConfig)
+    metadata_index: MetadataIndexConfig = Field(default_factory=MetadataIndexConfig)
+    email_jobs: EmailJobsConfig = Field(default_factory=EmailJobsConfig)
+    archive: ArchiveConfig = Field(default_factory=ArchiveConfig)
 
     app_name: str
     app_host: AnyHttpUrl
@@ -70,8 +202,9 @@ class AppConfig(BaseSettings):
     openapi_url: str = "/openapi.json"
     docs_url: str = "/docs"
 
-    log_buffer_size: int = 1024
-    log_flush_interval: int | float = 0.1
+    # records logged while the queue is full are dropped and counted
+    log_queue_size: int = 10000
+    log_json: bool = False
     log_format: str = (
         "%(asctime)s %(levelname)s:%(funcName)s:%(lineno)d %(trace_id)s %(message)s"
     )
@@ -79,9 +212,16 @@ class AppConfig(BaseSettings):
 
     trace_header_name: str = "X-Trace-ID"
 
+    metrics_enabled: bool = True
+
+    # readiness checks run in the background, probes only read the last results
+    readiness_check_interval_seconds: int = 15
+    readiness_check_timeout_seconds: float = 3
+
     cors_origins: list[AnyHttpUrl] = Field(default_factory=list)
     cors_methods: list[str]
     cors_headers: list[str]
+    cors_expose_headers: list[str] = Field(default_factory=list)
 
     # Application Limits
     max_email_size_mb: int = 50
@@ -15,8 +15,10 @@ from src.apps.documents.exceptions import (
     DocumentError,
     DocumentConnectionError,
     DocumentTimeoutError,
+    DocumentServiceOverloadedError,
     DocumentAuthenticationError,
     DownloadDocumentNotFound,
+    EmailJobNotFound,
     PreviewDocumentNotFound,
 )
 
@@ -64,6 +66,8 @@ async def upstream_error_handler(request: Request, exc: DocumentError) -> JSONRe
     """
     if isinstance(exc, DocumentTimeoutError):
         code = status.HTTP_504_GATEWAY_TIMEOUT
+    elif isinstance(exc, DocumentServiceOverloadedError):
+        code = status.HTTP_503_SERVICE_UNAVAILABLE
     else:
         code = status.HTTP_502_BAD_GATEWAY
 
@@ -82,6 +86,7 @@ async def app_error_handler(request: Request, exc: AppError) -> JSONResponse:
     return JSONResponse(
         status_code=exc.status_code,
         content={"errors": [{"message": exc.detail}]},
+        headers=exc.headers,
     )
 
 
@@ -110,11 +115,13 @@ def register_exception_handlers(app: FastAPI, config: AppConfig) -> None:
     app.add_exception_handler(NotFoundError, not_found_error_handler)  # type: ignore[arg-type]
     app.add_exception_handler(DownloadDocumentNotFound, not_found_error_handler)  # type: ignore[arg-type]
     app.add_exception_handler(PreviewDocumentNotFound, not_found_error_handler)  # type: ignore[arg-type]
+    app.add_exception_handler(EmailJobNotFound, not_found_error_handler)  # type: ignore[arg-type]
     app.add_exception_handler(StarletteHTTPException, not_found_error_handler)  # type: ignore[arg-type]
 
     # Upstream / service communication (502 / 504)
     app.add_exception_handler(DocumentConnectionError, upstream_error_handler)  # type: ignore[arg-type]
     app.add_exception_handler(DocumentTimeoutError, upstream_error_handler)  # type: ignore[arg-type]
+    app.add_exception_handler(DocumentServiceOverloadedError, upstream_error_handler)  # type: ignore[arg-type]
 
     # Application / domain
     app.add_exception_handler(AppError, app_error_handler)  # type: ignore[arg-type]
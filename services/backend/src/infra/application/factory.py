@@ -6,8 +6,11 @@ from src.api.rest.v0.routes import api_v0_router
 from src.api.rest.v1.routes import api_v1_router
 from src.config import AppConfig
 from src.infra.application.exception_handlers import register_exception_handlers
+from src.infra.application.lifespan import create_lifespan
+from src.infra.application.serialization import DefaultResponse
 from src.infra.application.setup.cors import setup_cors_middleware
 from src.infra.application.setup.logging import setup_logging
+from src.infra.application.setup.metrics import setup_metrics_middleware
 from src.infra.application.setup.tracing import setup_tracing_middleware
 
 logger = logging.getLogger(__name__)
@@ -23,6 +26,8 @@ def app_factory(config: AppConfig) -> ASGIApp:
         "docs_url": config.docs_url,
         "openapi_url": config.openapi_url,
         "redoc_url": None,
+        "lifespan": create_lifespan(config),
+        "default_response_class": DefaultResponse,
     }
 
     if not config.debug:
@@ -47,6 +52,7 @@ def app_factory(config: AppConfig) -> ASGIApp:
 
     setup_cors_middleware(app, config)
     setup_tracing_middleware(app, config)
+    setup_metrics_middleware(app, config)
 
     app.include_router(
         api_v0_router,
@@ -0,0 +1,103 @@
+from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager
+import logging
+from typing import AsyncIterator, Callable
+
+from fastapi import FastAPI
+import httpx
+
+from src.apps.auth.jwks import jwks_manager
+from src.apps.documents.cache import DocumentContentCache, MetadataIndexSync, PartNumberMetadataCache
+from src.apps.documents.client import DocumentClient
+from src.apps.documents.dto import EmailJobDTO, EmailResultDTO
+from src.apps.documents.graph_client import GraphMailClient
+from src.apps.documents.jobs import EmailJobQueue
+from src.apps.documents.services.email_service import EmailDocumentAPIService
+from src.apps.documents.utils.archive_engine import get_archive_engine
+from src.apps.health_check.views import create_readiness_probe
+from src.config import AppConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+Lifespan = Callable[[FastAPI], AbstractAsyncContextManager[None]]
+
+
+def create_lifespan(config: AppConfig) -> Lifespan:
+    """
+    Builds the lifespan handler owning per-worker shared resources.
+
+    Resources are registered on an ``AsyncExitStack`` so they are released
+    in reverse order of creation on shutdown.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        async with AsyncExitStack() as stack:
+            await jwks_manager.start()
+            stack.push_async_callback(jwks_manager.stop)
+
+            archive_engine = get_archive_engine()
+            # a later lifespan (tests, reload) gets an engine with a live executor
+            stack.callback(get_archive_engine.cache_clear)
+            stack.push_async_callback(archive_engine.aclose)
+
+            content_cache = None
+            if config.content_cache.enabled:
+                content_cache = DocumentContentCache.from_config(config.content_cache)
+                stack.push_async_callback(content_cache.aclose)
+            app.state.content_cache = content_cache
+
+            app.state.metadata_cache = (
+                PartNumberMetadataCache.from_config(config.metadata_cache)
+                if config.metadata_cache.enabled
+                else None
+            )
+
+            document_client = DocumentClient.from_config(config.sap_cpi, content_cache=content_cache)
+            stack.push_async_callback(document_client.aclose)
+            app.state.document_client = document_client
+
+            metadata_index = None
+            if config.metadata_index.enabled:
+                index_sync = MetadataIndexSync.from_config(
+                    config.metadata_index,
+                    document_client.get_documents_since,
+                )
+                await index_sync.start()
+                stack.push_async_callback(index_sync.stop)
+                metadata_index = index_sync.index
+            app.state.metadata_index = metadata_index
+
+            graph_client = GraphMailClient(config.graph)
+            stack.push_async_callback(graph_client.aclose)
+            app.state.graph_client = graph_client
+
+            email_jobs = None
+            if config.email_jobs.enabled:
+                async def send_email_job(job: EmailJobDTO) -> EmailResultDTO:
+                    service = EmailDocumentAPIService(
+                        client=document_client,
+                        graph_client=graph_client,
+                        metadata_cache=app.state.metadata_cache,
+                        metadata_index=metadata_index,
+                    )
+                    return await service.prepare_and_send(job.document_ids, job.email)
+
+                email_jobs = EmailJobQueue.from_config(config.email_jobs, send_email_job)
+                await email_jobs.start()
+                stack.push_async_callback(email_jobs.stop)
+            app.state.email_jobs = email_jobs
+
+            health_http_client = httpx.AsyncClient(timeout=httpx.Timeout(config.readiness_check_timeout_seconds))
+            stack.push_async_callback(health_http_client.aclose)
+            readiness_probe, readiness_checks = create_readiness_probe(config, health_http_client)
+            await readiness_checks.start()
+            stack.push_async_callback(readiness_checks.stop)
+            app.state.readiness_probe = readiness_probe
+
+            logger.info("shared resources initialized")
+            yield
+            logger.info("releasing shared resources")
+
+    return lifespan
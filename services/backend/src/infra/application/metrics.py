@@ -0,0 +1,225 @@
+from bisect import bisect_left
+import math
+from typing import Final, Iterator, Protocol
+
+
+DEFAULT_LATENCY_BUCKETS: Final[tuple[float, ...]] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+DEFAULT_SIZE_BUCKETS: Final[tuple[float, ...]] = tuple(
+    float(2 ** exponent) for exponent in range(10, 31, 2)
+)
+
+Labels = tuple[str, ...]
+
+
+class Metric(Protocol):
+    name: str
+    description: str
+    type: str
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """
+        Yields ``(suffix, labels, value)`` for the text exposition format.
+        """
+        ...
+
+
+class Counter:
+    """
+    Per-worker counter, one value per label combination.
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, description: str = "", labelnames: Labels = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        for labels, value in self.values.items():
+            yield "", dict(zip(self.labelnames, labels, strict=True)), value
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+    def set(self, value: float, *labels: str) -> None:
+        self.values[labels] = value
+
+
+class Histogram:
+    """
+    Cheap per-worker histogram with fixed upper-bound buckets.
+
+    ``observe`` is a bisect plus two additions, safe to call on hot paths.
+    """
+
+    type = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            description: str = "",
+            buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list[tuple[float, int]]:
+        """
+        Returns ``(upper_bound, count)`` pairs, the last bound being ``inf``.
+        """
+        total = 0
+        result = []
+        for bound, count in zip((*self.buckets, float("inf")), self.counts, strict=True):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket containing the ``q`` quantile.
+        """
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        for bound, cumulative in self.cumulative_counts():
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        yield from _histogram_samples(self, {})
+
+
+class HistogramVec:
+    """
+    Histograms sharing a name, one per label combination.
+    """
+
+    type = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            description: str = "",
+            labelnames: Labels = (),
+            buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self.children: dict[Labels, Histogram] = {}
+
+    def labels(self, *labels: str) -> Histogram:
+        child = self.children.get(labels)
+        if child is None:
+            child = self.children[labels] = Histogram(self.name, self.description, self.buckets)
+        return child
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        for labels, child in self.children.items():
+            yield from _histogram_samples(child, dict(zip(self.labelnames, labels, strict=True)))
+
+
+def _histogram_samples(
+        histogram: Histogram,
+        labels: dict[str, str],
+) -> Iterator[tuple[str, dict[str, str], float]]:
+    for bound, count in histogram.cumulative_counts():
+        yield "_bucket", {**labels, "le": _format_value(bound)}, count
+    yield "_sum", labels, histogram.sum
+    yield "_count", labels, histogram.count
+
+
+class MetricsRegistry:
+    """
+    Metrics of this worker, rendered in the Prometheus text format.
+
+    Metrics are registered once by name; registering a name again returns
+    (or, for ``register``, replaces) the existing metric.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str = "", labelnames: Labels = ()) -> Counter:
+        metric = self._metrics.get(name)
+        if not isinstance(metric, Counter):
+            metric = self.register(Counter(name, description, labelnames))
+        return metric  # type: ignore[return-value]
+
+    def gauge(self, name: str, description: str = "", labelnames: Labels = ()) -> Gauge:
+        metric = self._metrics.get(name)
+        if not isinstance(metric, Gauge):
+            metric = self.register(Gauge(name, description, labelnames))
+        return metric  # type: ignore[return-value]
+
+    def histogram(
+            self,
+            name: str,
+            description: str = "",
+            labelnames: Labels = (),
+            buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> HistogramVec:
+        metric = self._metrics.get(name)
+        if not isinstance(metric, HistogramVec):
+            metric = self.register(HistogramVec(name, description, labelnames, buckets))
+        return metric  # type: ignore[return-value]
+
+    def render(self) -> str:
+        lines: list[str] = []
+
+        for metric in self._metrics.values():
+            if metric.description:
+                lines.append(f"# HELP {metric.name} {_escape(metric.description)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+
+            for suffix, labels, value in metric.samples():
+                if labels:
+                    rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+                    lines.append(f"{metric.name}{suffix}{{{rendered}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{metric.name}{suffix} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+metrics_registry = MetricsRegistry()
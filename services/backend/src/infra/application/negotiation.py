@@ -0,0 +1,59 @@
+def _parse_accept(accept: str) -> list[tuple[str, float]]:
+    media_ranges = []
+    for part in accept.split(","):
+        media_range, *params = (p.strip() for p in part.split(";"))
+        if not media_range:
+            continue
+
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        media_ranges.append((media_range.lower(), quality))
+    return media_ranges
+
+
+def _quality(media_type: str, media_ranges: list[tuple[str, float]]) -> float:
+    main_type = media_type.split("/", 1)[0]
+    best_specificity, best_quality = -1, 0.0
+
+    for media_range, quality in media_ranges:
+        if media_range == media_type:
+            specificity = 2
+        elif media_range == f"{main_type}/*":
+            specificity = 1
+        elif media_range == "*/*":
+            specificity = 0
+        else:
+            continue
+
+        if specificity > best_specificity:
+            best_specificity, best_quality = specificity, quality
+
+    return best_quality
+
+
+def negotiate(accept: str | None, offered: list[str]) -> str | None:
+    """
+    Picks the offered media type the client prefers according to ``Accept``.
+
+    Missing header means the first offered type. Ties are resolved by the
+    order of ``offered``. Returns ``None`` when nothing offered is acceptable.
+    """
+    if not accept:
+        return offered[0] if offered else None
+
+    media_ranges = _parse_accept(accept)
+    best_type, best_quality = None, 0.0
+
+    for media_type in offered:
+        quality = _quality(media_type, media_ranges)
+        if quality > best_quality:
+            best_type, best_quality = media_type, quality
+
+    return best_type
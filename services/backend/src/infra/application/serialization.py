@@ -0,0 +1,49 @@
+from datetime import date, datetime
+from typing import Any, Mapping
+
+from fastapi.responses import ORJSONResponse, Response
+import msgpack
+
+from src.infra.application.negotiation import negotiate
+
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# used as the app's default_response_class as well
+DefaultResponse = ORJSONResponse
+
+OFFERED_MEDIA_TYPES = [JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE]
+
+
+def _msgpack_default(value: Any) -> Any:
+    # same representation as in JSON responses
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not msgpack serializable")
+
+
+class MsgPackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, default=_msgpack_default)
+
+
+def negotiated_response(
+        content: Any,
+        accept: str | None,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+) -> Response:
+    """
+    Serializes plain ``content`` (e.g. ``model_dump()`` of validated DTOs)
+    as JSON or, when the client prefers it, as msgpack.
+
+    Returning the response from a route skips ``response_model``
+    validation, so ``content`` must already have the documented shape.
+    """
+    if negotiate(accept, OFFERED_MEDIA_TYPES) == MSGPACK_MEDIA_TYPE:
+        return MsgPackResponse(content, status_code=status_code, headers=headers)
+    return DefaultResponse(content, status_code=status_code, headers=headers)
+
@@ -17,9 +17,11 @@ def setup_cors_middleware(app: FastAPI, config: AppConfig) -> None:
             allow_credentials=True,
             allow_methods=config.cors_methods,
             allow_headers=config.cors_headers,
+            expose_headers=config.cors_expose_headers,
         )
 
         logger.info("cors enabled for")
         logger.info(" origins: %s", [str(o) for o in config.cors_origins])
         logger.info(" methods: %s", config.cors_methods)
         logger.info(" headers: %s", config.cors_headers)
+        logger.info(" exposed headers: %s", config.cors_expose_headers)
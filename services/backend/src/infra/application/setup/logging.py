@@ -1,155 +1,142 @@
-import asyncio
 import atexit
-from contextlib import suppress
-from dataclasses import dataclass, field
+import copy
+from datetime import datetime, UTC
 import logging
 import logging.handlers
+import queue
 import sys
-import threading
-import time
-from types import MappingProxyType
-from typing import Any, Callable, Final
+from typing import Final
+
+import orjson
 
 from src.config import AppConfig
+from src.infra.application.metrics import metrics_registry
 from src.infra.application.setup.tracing import get_trace_id
 
 
-F = Callable[..., Any]
+_listener: logging.handlers.QueueListener | None = None
+
+log_records_dropped = metrics_registry.counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full",
+)
 
 
 def setup_logging(config: AppConfig) -> None:
+    global _listener
+
     log_level = logging.getLevelName(config.log_level.upper())
     log_format = config.log_format
 
-    stream_handler = _create_logging_handler(log_format)
-    buffered_handler = _wrap_logging_handler(
+    stream_handler = _create_logging_handler(log_format, json_output=config.log_json)
+    queue_handler = BoundedQueueHandler(queue.Queue(maxsize=config.log_queue_size))
+
+    if _listener is not None:
+        _listener.stop()
+
+    _listener = logging.handlers.QueueListener(
+        queue_handler.queue,
         stream_handler,
-        loop=asyncio.get_running_loop(),
-        buffer_size=config.log_buffer_size,
-        flush_interval=config.log_flush_interval,
+        respect_handler_level=True,
     )
+    _listener.start()
 
     logging.basicConfig(
         format=log_format,
         level=log_level,
         handlers=[
-            buffered_handler,
+            queue_handler,
         ],
+        force=True,
     )
 
 
-_trace_id_record_attr: Final[str] = "trace_id"
-_trace_id_record_default_value: Final[str] = "-"
-
-
-@dataclass
-class TraceIdFilter(logging.Filter):
-    name: str = field(default=_trace_id_record_attr)
-    default_value: str = field(default=_trace_id_record_default_value)
-
-    def filter(self, record: logging.LogRecord) -> bool:
-        """
-        Used to attach Trace ID value to the log record via ``name``
-        attribute.
-        """
-        setattr(record, self.name, get_trace_id(self.default_value))
-        return True
-
-
-class BufferedHandler(logging.handlers.MemoryHandler):
+def stop_logging() -> None:
     """
-    Used to resolve value of trace_id contextvar on emit. Otherwise the log
-    record may contains stale value of the contextvar.
+    Flushes queued records and stops the listener thread.
     """
+    global _listener
 
-    def emit(self, record: logging.LogRecord) -> None:
-        setattr(record, _trace_id_record_attr, get_trace_id())
-        return super().emit(record)
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
-def _safe_flush_handler(
-    handler: logging.handlers.MemoryHandler,
-) -> None:
-    with suppress(Exception):
-        if handler.buffer:
-            handler.flush()
+atexit.register(stop_logging)
 
 
-def _create_logging_handler(
-    log_format: str,
-) -> logging.Handler:
-    handler = logging.StreamHandler(stream=sys.stdout)
+_trace_id_record_attr: Final[str] = "trace_id"
+_trace_id_record_default_value: Final[str] = "-"
 
-    formatter = logging.Formatter(log_format)
-    handler.setFormatter(formatter)
 
-    return handler
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a ``QueueListener`` thread so logging never blocks on
+    stdout.
 
+    The trace id contextvar is resolved at enqueue time, otherwise the
+    listener thread would see a stale value. When the queue is full the
+    record is dropped and counted in ``dropped``.
+    """
 
-def _wrap_logging_handler(
-    handler: logging.Handler,
-    *,
-    loop: asyncio.AbstractEventLoop,
-    buffer_size: int,
-    flush_interval: float | int,
-) -> logging.Handler:
-    buffered_handler = BufferedHandler(
-        buffer_size,
-        target=handler,
-        flushLevel=logging.CRITICAL,
-    )
+    queue: queue.Queue
 
-    _run_in_thread(
-        _threaded_flush_handler,
-        args=(
-            buffered_handler,
-            flush_interval,
-            loop,
-        ),
-        deattach=True,
-    )
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._exception_formatter = logging.Formatter()
 
-    atexit.register(
-        _safe_flush_handler,
-        buffered_handler,
-    )
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        setattr(record, _trace_id_record_attr, get_trace_id(_trace_id_record_default_value))
 
-    return buffered_handler
+        # args and tracebacks may not be safe to format from another thread
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            log_records_dropped.inc()
 
-def _threaded_flush_handler(
-    handler: logging.handlers.MemoryHandler,
-    flush_interval: int | float,
-    loop: asyncio.AbstractEventLoop,
-) -> None:
-    def has_target() -> bool:
-        return bool(handler.target)
 
-    def has_no_target() -> bool:
-        return False
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line, for log collectors.
+    """
 
-    is_target = has_no_target
-    if isinstance(handler, logging.handlers.MemoryHandler):
-        is_target = has_target
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "function": record.funcName,
+            "line": record.lineno,
+            "trace_id": getattr(record, _trace_id_record_attr, _trace_id_record_default_value),
+            "message": record.getMessage(),
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        elif record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
 
-    while not loop.is_closed() and is_target():
-        _safe_flush_handler(handler)
-        time.sleep(flush_interval)
+        return orjson.dumps(entry, default=str).decode()
 
 
-def _run_in_thread(
-    fun: F,
+def _create_logging_handler(
+    log_format: str,
     *,
-    args: Any = (),
-    kwargs: Any = MappingProxyType({}),
-    deattach: bool = True,
-) -> threading.Thread:
-    thread = threading.Thread(
-        target=fun,
-        name=fun.__name__,
-        args=args,
-        kwargs=kwargs,
-        daemon=deattach,
-    )
-    thread.start()
-    return thread
+    json_output: bool = False,
+) -> logging.Handler:
+    handler = logging.StreamHandler(stream=sys.stdout)
+
+    formatter = JsonFormatter() if json_output else logging.Formatter(log_format)
+    handler.setFormatter(formatter)
+
+    return handler
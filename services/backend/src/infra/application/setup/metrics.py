@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+import logging
+import time
+
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import AppConfig
+from src.infra.application.metrics import metrics_registry
+
+
+logger = logging.getLogger(__name__)
+
+_UNMATCHED_ROUTE = "unmatched"
+
+
+request_duration = metrics_registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route"),
+)
+requests_total = metrics_registry.counter(
+    "http_requests_total", "HTTP requests by route and status code", ("method", "route", "status"),
+)
+requests_in_flight = metrics_registry.gauge(
+    "http_requests_in_flight", "HTTP requests being processed by route", ("method", "route"),
+)
+
+
+@dataclass
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route latency, status codes and the
+    number of requests in flight.
+
+    Routes are labelled by their path template, matched against the app
+    routes before the request is handled so the in-flight gauge can carry
+    it too. Path parameters do not multiply the series.
+    """
+    app: ASGIApp
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = _match_route(scope["app"].routes, scope) or _UNMATCHED_ROUTE
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        requests_in_flight.inc(method, route)
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            requests_in_flight.dec(method, route)
+
+            request_duration.labels(method, route).observe(elapsed)
+            requests_total.inc(method, route, str(status_code))
+
+
+def _match_route(routes: list[BaseRoute], scope: Scope, prefix: str = "") -> str | None:
+    """
+    Path template of the route the router will dispatch ``scope`` to, like
+    the router a full match wins over a method mismatch.
+    """
+    partial: str | None = None
+
+    for route in routes:
+        match, child_scope = route.matches(scope)
+        if match == Match.NONE:
+            continue
+
+        path = prefix + getattr(route, "path", "")
+        if sub_routes := getattr(route, "routes", None):
+            path = _match_route(sub_routes, {**scope, **child_scope}, path)
+        if match == Match.FULL:
+            return path
+        partial = partial or path
+
+    return partial
+
+
+def setup_metrics_middleware(app: FastAPI, config: AppConfig) -> None:
+    if config.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+        logger.info("request metrics enabled")
@@ -2,12 +2,11 @@ from contextvars import ContextVar
 from dataclasses import dataclass, field
 import logging
 import logging.handlers
-from typing import Awaitable, Callable, Final, cast
+from typing import Callable, Final, cast
 from uuid import uuid4
 
-from fastapi import FastAPI, Request, Response
-from starlette.datastructures import MutableHeaders
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.config import AppConfig
 
@@ -34,49 +33,49 @@ def get_trace_id(
 
 @dataclass
 class TracingMiddleware:
+    """
+    Pure ASGI middleware propagating the trace id.
+
+    Reads the trace id header straight from the ASGI scope (or generates a
+    new id), exposes it through the ``trace_id`` context variable and adds it
+    to the response headers. Unlike ``BaseHTTPMiddleware`` it does not spawn
+    a task per request nor buffer streaming bodies.
+    """
+    app: ASGIApp
     header_name: str = field(default=_TRACE_ID_HEADER_NAME)
     generator: Callable[[], str] = field(default=_get_uuid4_hex)
 
-    async def __call__(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+    def __post_init__(self) -> None:
+        self._raw_header_name = self.header_name.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Loads Trace Id from incoming headers or generate new one otherwise.
         """
-        headers = MutableHeaders(request.headers)
-
-        trace_id_value = self._get_header_value_or_generate_new(
-            header_name=self.header_name,
-            headers=headers,
-        )
-        trace_id.set(trace_id_value)
-
-        async def tracing_middleware(
-            request: Request,
-            call_next: Callable[[Request], Awaitable[Response]],
-        ) -> Response:
-            response = await call_next(request)
-            if trace_id_value := trace_id.get():
-                response.headers[self.header_name] = trace_id_value
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
 
-            return response
+        trace_id_value = self._get_header_value_or_generate_new(scope["headers"])
+        token = trace_id.set(trace_id_value)
+        raw_trace_id = trace_id_value.encode("latin-1")
 
-        return await tracing_middleware(request, call_next)
+        async def send_with_trace_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), (self._raw_header_name, raw_trace_id)]
+            await send(message)
 
-    def _get_header_value_or_generate_new(
-        self,
-        *,
-        header_name: str,
-        headers: MutableHeaders,
-    ) -> str:
-        header_value = headers.get(header_name.lower())
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        finally:
+            trace_id.reset(token)
 
-        if not header_value:
-            return self.generator()
+    def _get_header_value_or_generate_new(self, headers: list[tuple[bytes, bytes]]) -> str:
+        for name, value in headers:
+            if name == self._raw_header_name and value:
+                return value.decode("latin-1")
 
-        return header_value
+        return self.generator()
 
 
 def setup_tracing_middleware(app: FastAPI, config: AppConfig) -> None:
@@ -86,8 +85,6 @@ def setup_tracing_middleware(app: FastAPI, config: AppConfig) -> None:
     )
 
     app.add_middleware(
-        BaseHTTPMiddleware,
-        dispatch=TracingMiddleware(
-            header_name=config.trace_header_name,
-        ),
+        TracingMiddleware,
+        header_name=config.trace_header_name,
     )
@@ -0,0 +1,22 @@
+from typing import Iterator
+
+from fastapi.testclient import TestClient
+import pytest
+
+from src.config import AppConfig
+from src.infra.application.factory import app_factory
+from tests.base import get_test_app_config
+
+
+@pytest.fixture
+def test_app_config(tmp_path) -> AppConfig:
+    config = get_test_app_config()
+    config.content_cache.disk_path = str(tmp_path / "document-cache")
+    config.email_jobs.db_path = str(tmp_path / "email-jobs.sqlite3")
+    return config
+
+
+@pytest.fixture
+def client(test_app_config: AppConfig) -> Iterator[TestClient]:
+    with TestClient(app_factory(test_app_config)) as test_client:
+        yield test_client
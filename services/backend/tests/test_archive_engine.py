@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+import io
+import os
+import zipfile
+
+from src.apps.documents.utils import archive_engine
+from src.apps.documents.utils.archive_engine import ArchiveEngine
+
+
+class TestArchiveEngine:
+    async def test_entries_are_stored_or_deflated_by_compressibility(self):
+        files = {
+            "document_1.pdf": b"%PDF-1.7 " * 20_000,
+            "document_2.pdf": os.urandom(200_000),
+            "empty.txt": b"",
+        }
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            archive = await ArchiveEngine(executor).create_zip_archive(files)
+
+        with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+            assert zip_file.testzip() is None
+            assert zip_file.namelist() == list(files)
+            assert {name: zip_file.read(name) for name in files} == files
+            assert [info.compress_type for info in zip_file.infolist()] == [
+                zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED, zipfile.ZIP_STORED,
+            ]
+
+    async def test_entries_past_zip32_limits_use_zip64_records(self, monkeypatch):
+        # shrink the limits so the Zip64 layout is exercised with small entries
+        monkeypatch.setattr(archive_engine, "_ZIP32_LIMIT", 1000)
+        monkeypatch.setattr(archive_engine, "_ZIP32_MAX_ENTRIES", 2)
+        files = {f"document_{n}.pdf": os.urandom(1500) for n in range(3)}
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            archive = await ArchiveEngine(executor).create_zip_archive(files)
+
+        assert b"PK\x06\x06" in archive
+        with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+            assert zip_file.testzip() is None
+            assert {name: zip_file.read(name) for name in zip_file.namelist()} == files
@@ -0,0 +1,61 @@
+import asyncio
+
+from src.apps.documents.dto import DocumentDTO
+from src.apps.documents.exceptions import DocumentConnectionError
+from src.apps.documents.services.search_service import SearchDocumentAPIService
+
+
+class FakeDocumentClient:
+    def __init__(self, failing_part_number: int | None = None):
+        self.failing_part_number = failing_part_number
+        self.calls: list[list[int]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_documents_list(self, part_numbers: list[int]) -> list[DocumentDTO]:
+        self.calls.append(part_numbers)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.failing_part_number in part_numbers:
+                raise DocumentConnectionError()
+        finally:
+            self.in_flight -= 1
+
+        return [
+            DocumentDTO(
+                id=f"{part_number}-0",
+                part_number=part_number,
+                rev="A",
+                date_created="2024-01-01T00:00:00Z",
+                file_size_bytes=1,
+            )
+            for part_number in part_numbers
+            if part_number % 2 == 0
+        ]
+
+
+class TestBulkSearch:
+    async def test_part_numbers_are_searched_in_limited_chunks(self):
+        client = FakeDocumentClient()
+        service = SearchDocumentAPIService(client)  # type: ignore[arg-type]
+        service.chunk_size, service.max_in_flight = 3, 2
+
+        chunks = [chunk async for chunk in service.search_chunks([*range(10), 0, 1])]
+
+        assert sorted(map(len, client.calls)) == [1, 3, 3, 3]
+        assert client.max_in_flight == 2
+        found = sorted(document.part_number for chunk in chunks for document in chunk.result.documents)
+        assert found == [0, 2, 4, 6, 8]
+
+    async def test_failed_chunk_is_reported_without_failing_others(self):
+        client = FakeDocumentClient(failing_part_number=4)
+        service = SearchDocumentAPIService(client)  # type: ignore[arg-type]
+        service.chunk_size = 3
+
+        chunks = [chunk async for chunk in service.search_chunks(list(range(6)))]
+
+        failed = [chunk for chunk in chunks if chunk.result is None]
+        assert [chunk.part_numbers for chunk in failed] == [[3, 4, 5]]
+        assert failed[0].error == DocumentConnectionError.default_detail
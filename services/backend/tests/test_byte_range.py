@@ -0,0 +1,52 @@
+import pytest
+
+from src.apps.documents.exceptions import DocumentRangeNotSatisfiable
+from src.apps.documents.utils.byte_range import byte_range_response, parse_byte_range
+
+CONTENT = bytes(range(256)) * 4
+
+
+async def read_body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+class TestParseByteRange:
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("bytes=0-99", (0, 99)),
+            ("bytes=1000-", (1000, 1023)),
+            ("bytes=-24", (1000, 1023)),
+            ("bytes=1000-5000", (1000, 1023)),
+            ("bytes=0-1,5-6", None),
+            ("items=0-1", None),
+            ("bytes=9-1", None),
+            (None, None),
+        ],
+    )
+    def test_single_ranges_are_clamped_and_others_ignored(self, header, expected):
+        assert parse_byte_range(header, len(CONTENT)) == expected
+
+    def test_range_past_the_end_is_not_satisfiable(self):
+        with pytest.raises(DocumentRangeNotSatisfiable) as exc_info:
+            parse_byte_range("bytes=1024-", len(CONTENT))
+
+        assert exc_info.value.headers == {"Content-Range": "bytes */1024"}
+
+
+class TestByteRangeResponse:
+    async def test_range_is_streamed_as_partial_content(self):
+        response = byte_range_response(CONTENT, "application/pdf", "bytes=100-899", chunk_size=256)
+
+        assert response.status_code == 206
+        assert response.headers["Content-Range"] == "bytes 100-899/1024"
+        assert response.headers["Content-Length"] == "800"
+        assert await read_body(response) == CONTENT[100:900]
+
+    async def test_without_range_the_whole_content_is_streamed(self):
+        response = byte_range_response(CONTENT, "application/pdf", None)
+
+        assert response.status_code == 200
+        assert response.headers["Accept-Ranges"] == "bytes"
+        assert response.headers["Content-Length"] == "1024"
+        assert await read_body(response) == CONTENT
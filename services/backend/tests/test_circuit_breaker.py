@@ -0,0 +1,75 @@
+import httpx
+import pytest
+
+from src.apps.documents.decorators import handle_http_errors
+from src.apps.documents.exceptions import DocumentConnectionError, DocumentError
+from src.apps.documents.utils.circuit_breaker import CircuitBreaker, CircuitState, circuit_breakers
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_half_opens_after_timeout(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout_seconds=0)
+
+        breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
+        breaker.record_failure()
+
+        # zero reset timeout moves straight to half-open with one trial call
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_open_circuit_refuses_requests(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout_seconds=60)
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.OPEN
+        assert not breaker.allow_request()
+
+
+class TestHandleHttpErrors:
+    async def test_retries_idempotent_call_then_succeeds(self):
+        calls = 0
+
+        @handle_http_errors("test_retry_success", retry=True)
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            if calls < 2:
+                raise httpx.ConnectError("refused")
+            return "ok"
+
+        assert await fetch() == "ok"
+        assert calls == 2
+
+    async def test_fails_fast_while_circuit_is_open(self):
+        calls = 0
+        breaker = circuit_breakers.get("test_fail_fast")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        @handle_http_errors("test_fail_fast", retry=True)
+        async def fetch():
+            nonlocal calls
+            calls += 1
+
+        with pytest.raises(DocumentConnectionError):
+            await fetch()
+        assert calls == 0
+
+    async def test_client_errors_are_not_retried(self):
+        calls = 0
+        request = httpx.Request("GET", "http://sap/documents/1")
+
+        @handle_http_errors("test_not_found", retry=True)
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            raise httpx.HTTPStatusError("", request=request, response=httpx.Response(404, request=request))
+
+        with pytest.raises(DocumentError):
+            await fetch()
+        assert calls == 1
@@ -0,0 +1,86 @@
+import asyncio
+from contextlib import suppress
+
+import httpx
+import pytest
+
+from src.apps.documents.exceptions import DocumentServiceOverloadedError
+from src.apps.documents.utils.concurrency_limiter import AdaptiveConcurrencyLimiter
+
+
+def make_limiter(
+        initial_limit: int = 1,
+        min_limit: int = 1,
+        max_limit: int = 10,
+        queue_timeout_seconds: float = 1,
+        latency_threshold_seconds: float = 1,
+) -> AdaptiveConcurrencyLimiter:
+    return AdaptiveConcurrencyLimiter(
+        initial_limit=initial_limit,
+        min_limit=min_limit,
+        max_limit=max_limit,
+        queue_timeout_seconds=queue_timeout_seconds,
+        latency_threshold_seconds=latency_threshold_seconds,
+        backoff_ratio=0.5,
+        name="test",
+    )
+
+
+async def call(limiter: AdaptiveConcurrencyLimiter, status_code: int = 200, seconds: float = 0) -> None:
+    async with limiter.slot() as slot:
+        await asyncio.sleep(seconds)
+        slot.status_code = status_code
+
+
+class TestAdaptiveConcurrencyLimiter:
+    async def test_queue_timeout_rejects_the_call(self):
+        limiter = make_limiter(queue_timeout_seconds=0.01)
+        exported = limiter.rejected_total.values.get((), 0)
+
+        async with limiter.slot():
+            with pytest.raises(DocumentServiceOverloadedError):
+                await call(limiter)
+
+        assert limiter.rejected == 1
+        assert limiter.rejected_total.values[()] == exported + 1
+        assert limiter.queued == 0
+        assert limiter.in_flight == 0
+
+    async def test_cancellation_after_hand_over_does_not_leak_the_slot(self):
+        limiter = make_limiter()
+
+        async with limiter.slot():
+            waiting = asyncio.ensure_future(call(limiter))
+            await asyncio.sleep(0)
+            assert limiter.queued == 1
+
+        # the slot is handed to the waiter before it gets to run
+        waiting.cancel()
+        with suppress(asyncio.CancelledError):
+            await waiting
+
+        assert limiter.in_flight == 0
+        assert limiter.queued == 0
+        await asyncio.wait_for(call(limiter), 0.1)
+
+    async def test_congestion_decreases_the_limit_once_per_window(self):
+        limiter = make_limiter(initial_limit=8, latency_threshold_seconds=0.01)
+
+        await asyncio.gather(call(limiter, 503, 0.001), call(limiter, 429, 0.001), call(limiter, 502, 0.001))
+        assert limiter.limit == 4
+
+        await call(limiter, seconds=0.02)
+        assert limiter.limit == 2
+
+        with pytest.raises(httpx.ConnectError):
+            async with limiter.slot():
+                raise httpx.ConnectError("refused")
+        assert limiter.limit == 1
+
+    async def test_successful_calls_increase_the_limit_up_to_max(self):
+        limiter = make_limiter(initial_limit=2, max_limit=3)
+
+        for _ in range(20):
+            await call(limiter)
+
+        assert limiter.limit == 3
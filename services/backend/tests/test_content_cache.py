@@ -0,0 +1,64 @@
+from src.apps.documents.cache import DocumentContentCache, content
+
+
+def make_cache(tmp_path, memory_max_bytes: int = 10, disk_max_bytes: int = 20) -> DocumentContentCache:
+    return DocumentContentCache(
+        memory_max_bytes=memory_max_bytes,
+        disk_path=tmp_path / "cache",
+        disk_max_bytes=disk_max_bytes,
+        revision_ttl_seconds=60,
+    )
+
+
+class TestDocumentContentCache:
+    async def test_miss_then_memory_hit(self, tmp_path):
+        cache = make_cache(tmp_path)
+
+        assert await cache.get("doc", "A") is None
+        await cache.put("doc", "A", b"12345")
+
+        assert await cache.get("doc", "A") == b"12345"
+        assert await cache.get("doc", "B") is None
+        assert cache.known_revision("doc") == "A"
+        assert cache.stats.memory_hits == 1
+        assert cache.stats.misses == 2
+
+    async def test_memory_eviction_falls_back_to_disk(self, tmp_path):
+        cache = make_cache(tmp_path)
+
+        await cache.put("first", "A", b"123456")
+        await cache.put("second", "A", b"abcdef")
+
+        assert cache.stats.memory_evictions == 1
+        assert await cache.get("first", "A") == b"123456"
+        assert cache.stats.disk_hits == 1
+
+    async def test_disk_tier_is_size_capped_and_deduplicated(self, tmp_path):
+        cache = make_cache(tmp_path, memory_max_bytes=0, disk_max_bytes=12)
+
+        await cache.put("one", "A", b"x" * 6)
+        await cache.put("same-content", "A", b"x" * 6)
+        assert cache.disk.size_bytes == 6
+
+        await cache.put("two", "A", b"y" * 6)
+        await cache.put("three", "A", b"z" * 6)
+
+        assert cache.stats.disk_evictions == 2
+        assert await cache.get("one", "A") is None
+        assert await cache.get("three", "A") == b"z" * 6
+
+        await cache.aclose()
+        assert not (tmp_path / "cache").exists()
+
+    async def test_oldest_revisions_are_dropped_past_the_cap(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(content, "_MAX_TRACKED_REVISIONS", 2)
+        cache = make_cache(tmp_path, memory_max_bytes=0, disk_max_bytes=0)
+
+        await cache.put("first", "A", b"1")
+        await cache.put("second", "A", b"2")
+        await cache.put("first", "B", b"1")
+        await cache.put("third", "A", b"3")
+
+        assert cache.known_revision("second") is None
+        assert cache.known_revision("first") == "B"
+        assert cache.known_revision("third") == "A"
@@ -0,0 +1,147 @@
+import asyncio
+
+from src.apps.documents.dto import EmailJobDTO, EmailJobStatus, EmailResultDTO, FailedDocumentsDTO
+from src.apps.documents.exceptions import EmailAttachmentTooLarge
+from src.apps.documents.jobs import EmailJobQueue, EmailJobStore
+
+
+def make_queue(tmp_path, handler, lease_seconds: float = 60) -> EmailJobQueue:
+    return EmailJobQueue(
+        store=EmailJobStore(str(tmp_path / "jobs.sqlite3"), lease_seconds=lease_seconds),
+        handler=handler,
+        workers=2,
+        max_attempts=2,
+        retry_backoff_seconds=0,
+        poll_interval_seconds=0.01,
+    )
+
+
+async def wait_for_status(queue: EmailJobQueue, job_id: str, status: EmailJobStatus) -> EmailJobDTO:
+    for _ in range(200):
+        job = await queue.get(job_id)
+        if job is not None and job.status == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not reach {status}")
+
+
+class TestEmailJobQueue:
+    async def test_job_is_processed_and_partial_failures_recorded(self, tmp_path):
+        async def handler(job: EmailJobDTO) -> EmailResultDTO:
+            return EmailResultDTO(failed=FailedDocumentsDTO(document_ids=job.document_ids[1:]))
+
+        queue = make_queue(tmp_path, handler)
+        await queue.start()
+        try:
+            job = await queue.enqueue(["a", "b"], "user@tennantco.com")
+            assert job.status == EmailJobStatus.QUEUED
+
+            done = await wait_for_status(queue, job.id, EmailJobStatus.SUCCEEDED)
+            assert done.failed_document_ids == ["b"]
+            assert done.attempts == 1
+        finally:
+            await queue.stop()
+
+    async def test_job_is_retried_then_marked_failed(self, tmp_path):
+        async def handler(job: EmailJobDTO) -> EmailResultDTO:
+            raise RuntimeError("graph unavailable")
+
+        queue = make_queue(tmp_path, handler)
+        await queue.start()
+        try:
+            job = await queue.enqueue(["a"], "user@tennantco.com")
+
+            failed = await wait_for_status(queue, job.id, EmailJobStatus.FAILED)
+            assert failed.attempts == 2
+            assert failed.last_error == "graph unavailable"
+        finally:
+            await queue.stop()
+
+    async def test_permanent_error_is_not_retried(self, tmp_path):
+        async def handler(job: EmailJobDTO) -> EmailResultDTO:
+            raise EmailAttachmentTooLarge()
+
+        queue = make_queue(tmp_path, handler)
+        await queue.start()
+        try:
+            job = await queue.enqueue(["a"], "user@tennantco.com")
+
+            failed = await wait_for_status(queue, job.id, EmailJobStatus.FAILED)
+            assert failed.attempts == 1
+            assert failed.last_error == EmailAttachmentTooLarge.default_detail
+        finally:
+            await queue.stop()
+
+    async def test_lease_is_renewed_while_a_slow_send_runs(self, tmp_path):
+        sends: list[str] = []
+
+        async def handler(job: EmailJobDTO) -> EmailResultDTO:
+            sends.append(job.id)
+            await asyncio.sleep(0.3)
+            return EmailResultDTO()
+
+        queue = make_queue(tmp_path, handler, lease_seconds=0.1)
+        await queue.start()
+        try:
+            job = await queue.enqueue(["a"], "user@tennantco.com")
+
+            done = await wait_for_status(queue, job.id, EmailJobStatus.SUCCEEDED)
+            assert done.attempts == 1
+            assert sends == [job.id]
+        finally:
+            await queue.stop()
+
+    async def test_job_with_expired_lease_is_recovered(self, tmp_path):
+        store = EmailJobStore(str(tmp_path / "jobs.sqlite3"), lease_seconds=0)
+        await store.open()
+        job = await store.create("user@tennantco.com", ["a"], max_attempts=3)
+        # simulates a worker that died after claiming the job
+        assert (await store.claim()).id == job.id
+        await store.close()
+
+        async def handler(job: EmailJobDTO) -> EmailResultDTO:
+            return EmailResultDTO()
+
+        queue = make_queue(tmp_path, handler)
+        await queue.start()
+        try:
+            recovered = await wait_for_status(queue, job.id, EmailJobStatus.SUCCEEDED)
+            assert recovered.attempts == 2
+        finally:
+            await queue.stop()
+
+    async def test_expired_lease_on_the_last_attempt_fails_the_job(self, tmp_path):
+        store = EmailJobStore(str(tmp_path / "jobs.sqlite3"), lease_seconds=0)
+        await store.open()
+        try:
+            job = await store.create("user@tennantco.com", ["a"], max_attempts=1)
+            claimed = await store.claim()
+            assert claimed is not None
+
+            assert await store.claim() is None
+            failed = await store.get(job.id)
+            assert failed.status == EmailJobStatus.FAILED
+            assert failed.attempts == 1
+
+            # the stale worker can no longer overwrite the outcome
+            await store.complete(claimed, [])
+            assert (await store.get(job.id)).status == EmailJobStatus.FAILED
+        finally:
+            await store.close()
+
+    async def test_stale_attempt_does_not_overwrite_a_reclaimed_job(self, tmp_path):
+        store = EmailJobStore(str(tmp_path / "jobs.sqlite3"), lease_seconds=0)
+        await store.open()
+        try:
+            await store.create("user@tennantco.com", ["a"], max_attempts=3)
+            stale = await store.claim()
+            current = await store.claim()
+            assert current.attempts == stale.attempts + 1
+
+            await store.fail(stale, "late failure", retry_delay_seconds=0, retry=False)
+            assert (await store.get(current.id)).status == EmailJobStatus.RUNNING
+
+            await store.complete(current, [])
+            assert (await store.get(current.id)).status == EmailJobStatus.SUCCEEDED
+        finally:
+            await store.close()
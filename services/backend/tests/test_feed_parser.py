@@ -0,0 +1,52 @@
+from src.apps.documents.dto import DocumentDTO
+from src.apps.documents.utils.feed_parser import AtomFeedParser
+
+ENTRY = """
+  <entry>
+    <id>https://sap.example/documents/api/v1/documents('{id}')</id>
+    <link rel="edit" href="documents('{id}')"/>
+    <content type="application/xml">
+      <m:properties>
+        <d:id>{id}</d:id>
+        <d:part_number m:type="Edm.Int64">{part_number}</d:part_number>
+        <d:rev>B</d:rev>
+        <d:date_created m:type="Edm.DateTime">2024-01-01T10:00:00</d:date_created>
+        <d:file_size_bytes m:type="Edm.Int64">2048</d:file_size_bytes>
+        <d:description m:null="true"/>
+      </m:properties>
+    </content>
+  </entry>"""
+
+FEED = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"
+      xmlns:m="http://schemas.microsoft.com/ado/2007/08/dataservices/metadata"
+      xmlns:d="http://schemas.microsoft.com/ado/2007/08/dataservices">
+  <title>documents</title>{entries}
+  <link rel="next" href="https://sap.example/documents/api/v1/documents?$skiptoken=2"/>
+</feed>"""
+
+
+class TestAtomFeedParser:
+    def test_entries_are_parsed_across_chunk_boundaries(self):
+        body = FEED.format(entries="".join(ENTRY.format(id=f"doc-{n}", part_number=n) for n in range(3))).encode()
+        parser = AtomFeedParser(DocumentDTO)
+
+        documents: list[DocumentDTO] = []
+        for start in range(0, len(body), 7):
+            documents.extend(parser.feed(body[start:start + 7]))
+        documents.extend(parser.close())
+
+        assert [(document.id, document.part_number) for document in documents] == [
+            ("doc-0", 0), ("doc-1", 1), ("doc-2", 2),
+        ]
+        assert documents[0].file_size_bytes == 2048
+        assert parser.next_link == "https://sap.example/documents/api/v1/documents?$skiptoken=2"
+
+    def test_parsed_entries_are_released(self):
+        body = FEED.format(entries="".join(ENTRY.format(id=f"doc-{n}", part_number=n) for n in range(100))).encode()
+        parser = AtomFeedParser(DocumentDTO)
+
+        parsed = sum(1 for _ in parser.feed(body))
+
+        assert parsed == 100
+        assert parser._feed is not None and len(parser._feed) < 5
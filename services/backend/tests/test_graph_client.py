@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+from azure.core.credentials import AccessToken
+import httpx
+
+from src.apps.documents.graph_client import CachedTokenCredential, GraphMailClient
+from src.config.config import GraphConfig
+
+
+class FakeCredential:
+    def __init__(self, lifetime_seconds: float):
+        self.lifetime_seconds = lifetime_seconds
+        self.calls = 0
+
+    async def get_token(self, *scopes: str, **kwargs) -> AccessToken:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return AccessToken(f"token-{self.calls}", int(time.time() + self.lifetime_seconds))
+
+    async def close(self) -> None:
+        pass
+
+
+class TestCachedTokenCredential:
+    async def test_concurrent_callers_share_one_token_request(self):
+        inner = FakeCredential(lifetime_seconds=3600)
+        credential = CachedTokenCredential(inner, refresh_margin_seconds=300)
+
+        tokens = await asyncio.gather(*(credential.get_token("scope") for _ in range(10)))
+
+        assert {token.token for token in tokens} == {"token-1"}
+        assert inner.calls == 1
+
+    async def test_token_is_refreshed_ahead_of_expiry(self):
+        inner = FakeCredential(lifetime_seconds=200)
+        credential = CachedTokenCredential(inner, refresh_margin_seconds=300)
+
+        first = await credential.get_token("scope")
+        second = await credential.get_token("scope")
+
+        assert (first.token, second.token) == ("token-1", "token-2")
+
+    async def test_claims_bypass_cache(self):
+        inner = FakeCredential(lifetime_seconds=3600)
+        credential = CachedTokenCredential(inner)
+
+        await credential.get_token("scope")
+        challenged = await credential.get_token("scope", claims='{"access_token": {}}')
+
+        assert challenged.token == "token-2"
+
+
+class TestGraphMailClientUpload:
+    async def test_attachment_is_uploaded_in_ranged_chunks(self):
+        received: list[tuple[str, bytes]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            received.append((request.headers["Content-Range"], request.content))
+            return httpx.Response(200)
+
+        config = GraphConfig(
+            client_id="client", client_secret="secret", azure_tenant_id="tenant", upload_chunk_size_bytes=4,
+        )
+        graph_client = GraphMailClient(config)
+        graph_client._upload_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        await graph_client._upload_chunks("https://upload.example/session", b"0123456789")
+
+        assert received == [
+            ("bytes 0-3/10", b"0123"),
+            ("bytes 4-7/10", b"4567"),
+            ("bytes 8-9/10", b"89"),
+        ]
@@ -0,0 +1,55 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from src.apps.health_check.dto import CheckResult
+from src.apps.health_check.service import CachedCheck, Check, HealthCheckService, Probe
+
+
+@dataclass
+class StaticCheck(Check):
+    status: str = "pass"
+    delay_seconds: float = 0
+
+    async def __call__(self) -> CheckResult:
+        await asyncio.sleep(self.delay_seconds)
+        return CheckResult(
+            component_id=self.component_id,
+            component_type=self.component_type,
+            status=self.status,
+            time=datetime.now(UTC).isoformat(),
+        )
+
+
+class TestCachedCheck:
+    async def test_result_is_pending_until_refreshed(self):
+        check = CachedCheck(check=StaticCheck(component_id="upstream"))
+
+        assert (await check()).status == "warn"
+        await check.refresh()
+        assert (await check()).status == "pass"
+
+    async def test_timeout_of_non_critical_check_is_reported_as_warn(self):
+        check = CachedCheck(check=StaticCheck(component_id="upstream", delay_seconds=1), timeout_seconds=0.01)
+
+        await check.refresh()
+
+        result = await check()
+        assert (result.status, result.observed_value) == ("warn", "timeout")
+
+
+class TestHealthCheckService:
+    async def test_results_are_grouped_by_component_and_fail_wins(self):
+        probe = Probe(
+            name="test",
+            checks=[
+                StaticCheck(component_id="a", status="warn"),
+                StaticCheck(component_id="b", status="fail"),
+                StaticCheck(component_id="a", status="pass"),
+            ],
+        )
+
+        result = await HealthCheckService().run_probe(probe)
+
+        assert result.status.name == "fail"
+        assert [len(checks) for checks in result.checks.values()] == [2, 1]
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import time
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+import httpx
+import jwt
+from jwt.algorithms import RSAAlgorithm
+
+from src.apps.auth import jwt as auth_jwt
+from src.apps.auth.jwks import JWKSManager
+from src.apps.auth.token_cache import VerifiedTokenCache
+from src.config import get_config
+
+
+def make_token(private_key, kid: str, expires_in: float = 3600) -> str:
+    config = get_config().azure
+    claims = {
+        "aud": config.client_id,
+        "iss": auth_jwt.ISSUER,
+        "exp": int(time.time() + expires_in),
+        "groups": ["Drawing-Locator-Viewer"],
+    }
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+class TestDecodeJwt:
+    async def test_verified_token_is_served_from_cache(self, monkeypatch):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwks = [{**json.loads(RSAAlgorithm.to_jwk(private_key.public_key())), "kid": "key-1"}]
+
+        async def get_jwks():
+            return jwks
+
+        monkeypatch.setattr(auth_jwt, "get_jwks", get_jwks)
+        token = make_token(private_key, "key-1")
+
+        claims = await auth_jwt.decode_jwt(token)
+        assert claims["groups"] == ["Drawing-Locator-Viewer"]
+
+        def fail_decode(*args, **kwargs):
+            raise AssertionError("token verified twice")
+
+        monkeypatch.setattr(auth_jwt.jwt, "decode", fail_decode)
+        assert await auth_jwt.decode_jwt(token) == claims
+
+        # a scheduled refresh returning the same keys keeps verified tokens
+        jwks = [dict(key) for key in jwks]
+        assert await auth_jwt.decode_jwt(token) == claims
+
+
+class TestVerifiedTokenCache:
+    def test_entries_expire_at_token_exp(self):
+        cache = VerifiedTokenCache(max_entries=10)
+        cache.put(b"live", {"exp": time.time() + 60})
+        cache.put(b"expired", {"exp": time.time() - 1})
+
+        assert cache.get(b"live") is not None
+        assert cache.get(b"expired") is None
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = VerifiedTokenCache(max_entries=2)
+        exp = time.time() + 60
+        cache.put(b"a", {"exp": exp})
+        cache.put(b"b", {"exp": exp})
+        cache.get(b"a")
+        cache.put(b"c", {"exp": exp})
+
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") is not None
+
+
+def make_manager(ttl_seconds: float = 3600) -> tuple[JWKSManager, list[int]]:
+    fetches: list[int] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        fetches.append(1)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"keys": [{"kid": f"key-{len(fetches)}"}]})
+
+    manager = JWKSManager(
+        "https://login.example/keys",
+        ttl_seconds=ttl_seconds,
+        unknown_kid_refresh_interval_seconds=60,
+        timeout_seconds=1,
+    )
+    manager._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return manager, fetches
+
+
+class TestJWKSManager:
+    async def test_concurrent_callers_share_one_fetch(self):
+        manager, fetches = make_manager()
+
+        results = await asyncio.gather(*(manager.get_keys() for _ in range(10)))
+
+        assert len(fetches) == 1
+        assert all(keys == [{"kid": "key-1"}] for keys in results)
+        await manager.stop()
+
+    async def test_stale_keys_are_served_while_revalidating(self):
+        manager, fetches = make_manager(ttl_seconds=0)
+        await manager.get_keys()
+
+        assert await manager.get_keys() == [{"kid": "key-1"}]
+        await asyncio.sleep(0.05)
+        assert await manager.get_keys() == [{"kid": "key-2"}]
+        assert len(fetches) == 2
+        await manager.stop()
+
+    async def test_unknown_kid_refresh_is_rate_limited(self):
+        manager, fetches = make_manager()
+        await manager.get_keys()
+
+        assert await manager.refresh_for_unknown_kid() is True
+        assert await manager.refresh_for_unknown_kid() is False
+        assert len(fetches) == 2
+        await manager.stop()
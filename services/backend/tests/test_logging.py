@@ -0,0 +1,46 @@
+import json
+import logging
+import queue
+
+from src.infra.application.setup.logging import BoundedQueueHandler, JsonFormatter
+from src.infra.application.setup.tracing import trace_id
+
+
+def make_record(message: str, *args) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, args, None)
+
+
+class TestBoundedQueueHandler:
+    def test_trace_id_is_captured_at_enqueue_time(self):
+        handler = BoundedQueueHandler(queue.Queue())
+
+        token = trace_id.set("abc123")
+        try:
+            handler.handle(make_record("sent %s", "email"))
+        finally:
+            trace_id.reset(token)
+
+        record = handler.queue.get_nowait()
+        assert record.trace_id == "abc123"
+        assert record.getMessage() == "sent email"
+
+    def test_records_are_dropped_and_counted_when_full(self):
+        handler = BoundedQueueHandler(queue.Queue(maxsize=1))
+
+        for _ in range(3):
+            handler.handle(make_record("message"))
+
+        assert handler.queue.qsize() == 1
+        assert handler.dropped == 2
+
+
+class TestJsonFormatter:
+    def test_record_is_formatted_as_json(self):
+        handler = BoundedQueueHandler(queue.Queue())
+        handler.handle(make_record("found %d documents", 3))
+
+        entry = json.loads(JsonFormatter().format(handler.queue.get_nowait()))
+
+        assert entry["message"] == "found 3 documents"
+        assert entry["trace_id"] == "-"
+        assert entry["level"] == "INFO"
@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.apps.documents.cache import PartNumberMetadataCache
+from src.apps.documents.cache.content import cache_events
+from src.apps.documents.dto import DocumentDTO
+from src.apps.documents.exceptions import DocumentConnectionError
+from src.apps.documents.services.search_service import SearchDocumentAPIService
+
+
+def make_document(document_id: str, part_number: int) -> DocumentDTO:
+    return DocumentDTO(
+        id=document_id,
+        part_number=part_number,
+        rev="A",
+        date_created="2024-01-01T00:00:00Z",
+        file_size_bytes=100,
+    )
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr("src.apps.documents.cache.metadata.time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def make_cache(max_entries: int = 10) -> PartNumberMetadataCache:
+    return PartNumberMetadataCache(
+        ttl_seconds=60, negative_ttl_seconds=10, stale_ttl_seconds=300, max_entries=max_entries,
+    )
+
+
+class FakeDocumentClient:
+    def __init__(self):
+        self.error: Exception | None = None
+        self.calls: list[list[int]] = []
+
+    async def get_documents_list(self, part_numbers: list[int]) -> list[DocumentDTO]:
+        self.calls.append(part_numbers)
+        if self.error is not None:
+            raise self.error
+        return [make_document(f"{part_number}-0", part_number) for part_number in part_numbers if part_number != 404]
+
+
+class TestPartNumberMetadataCache:
+    def test_entries_expire_after_ttl_and_negative_entries_sooner(self, clock):
+        cache = make_cache()
+        cache.put_many({1: [make_document("a", 1)], 2: []})
+        assert cache.get_fresh([2]) == ({2: []}, [])
+
+        clock.now += 30
+        hits, misses = cache.get_fresh([1, 2])
+        assert list(hits) == [1]
+        assert misses == [2]
+        assert cache.stats.fresh_hits == 1
+        assert cache.stats.negative_hits == 1
+
+        clock.now += 31
+        hits, misses = cache.get_fresh([1, 2])
+        assert hits == {}
+        assert misses == [1, 2]
+        assert set(cache.get_stale([1, 2])) == {1, 2}
+        assert cache.stats.stale_hits == 2
+
+        clock.now += 300
+        assert cache.get_stale([1, 2]) == {}
+
+    def test_eviction_drops_least_recently_used_and_its_sizes(self, clock):
+        cache = make_cache(max_entries=2)
+        cache.put_many({1: [make_document("a", 1)], 2: [make_document("b", 2)]})
+        cache.get_fresh([1])
+        exported = cache_events.values.get(("metadata", "evictions"), 0)
+
+        cache.put_many({3: [make_document("c", 3)]})
+
+        assert cache.get_fresh([1, 2, 3])[1] == [2]
+        assert cache.document_size("b") is None
+        assert cache.document_size("a") == 100
+        assert cache.stats.evictions == 1
+        assert cache_events.values[("metadata", "evictions")] == exported + 1
+
+
+class TestSearchStaleIfError:
+    async def test_stale_entries_are_served_when_upstream_fails(self, clock):
+        client = FakeDocumentClient()
+        service = SearchDocumentAPIService(client, metadata_cache=make_cache())  # type: ignore[arg-type]
+        await service.search([1, 2])
+
+        clock.now += 61
+        client.error = DocumentConnectionError()
+        result = await service.search([1, 2])
+
+        assert [document.id for document in result.documents] == ["1-0", "2-0"]
+        assert sorted(result.stale_part_numbers) == [1, 2]
+
+    async def test_error_is_raised_when_a_miss_has_no_stale_entry(self, clock):
+        client = FakeDocumentClient()
+        service = SearchDocumentAPIService(client, metadata_cache=make_cache())  # type: ignore[arg-type]
+        await service.search([1])
+
+        clock.now += 61
+        client.error = DocumentConnectionError()
+        with pytest.raises(DocumentConnectionError):
+            await service.search([1, 2])
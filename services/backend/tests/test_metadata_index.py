@@ -0,0 +1,104 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.apps.documents.cache import MetadataIndex, MetadataIndexSync
+from src.apps.documents.dto import DocumentDTO
+from src.apps.documents.exceptions import EmailAttachmentTooLarge
+from src.apps.documents.services.email_service import EmailDocumentAPIService
+
+EPOCH = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def make_document(document_id: str, part_number: int, rev: str = "A", minutes: int = 0) -> dict:
+    return {
+        "id": document_id,
+        "part_number": part_number,
+        "rev": rev,
+        "date_created": EPOCH + timedelta(minutes=minutes),
+        "file_size_bytes": 100,
+    }
+
+
+class FakeUpstream:
+    def __init__(self, documents: list[dict]):
+        self.documents = documents
+        self.watermarks: list[datetime | None] = []
+
+    async def fetch_page(self, created_since: datetime | None, limit: int) -> list[DocumentDTO]:
+        self.watermarks.append(created_since)
+        matching = sorted(
+            (document for document in self.documents if created_since is None or document["date_created"] >= created_since),
+            key=lambda document: document["date_created"],
+        )
+        return [DocumentDTO.model_validate(document) for document in matching[:limit]]
+
+
+class TestMetadataIndex:
+    def test_lookup_returns_documents_per_part_number(self):
+        index = MetadataIndex(max_lag_seconds=60)
+        index.replace([
+            DocumentDTO.model_validate(make_document("b", 7)),
+            DocumentDTO.model_validate(make_document("a", 7)),
+            DocumentDTO.model_validate(make_document("c", 3)),
+        ])
+
+        results = index.lookup([7, 5])
+
+        assert [document.id for document in results[7]] == ["a", "b"]
+        assert results[5] == []
+        assert index.is_current()
+
+    def test_naive_creation_dates_are_read_as_utc(self):
+        index = MetadataIndex(max_lag_seconds=60)
+        index.replace([
+            DocumentDTO.model_validate({**make_document("a", 1), "date_created": datetime(2024, 1, 1, 1)}),
+            DocumentDTO.model_validate(make_document("b", 1)),
+        ])
+
+        assert index.lookup([1])[1][0].date_created == EPOCH + timedelta(hours=1)
+        assert index.watermark == EPOCH + timedelta(hours=1)
+        assert index.watermark.tzinfo is not None
+
+    def test_document_size_is_found_by_id(self):
+        index = MetadataIndex(max_lag_seconds=60)
+        index.replace([DocumentDTO.model_validate(make_document(f"doc-{n}", n % 4)) for n in range(20)])
+
+        assert index.document_size("doc-13") == 100
+        assert index.document_size("doc-99") is None
+
+    def test_email_size_check_falls_back_to_the_index(self):
+        index = MetadataIndex(max_lag_seconds=60)
+        index.replace([DocumentDTO.model_validate(make_document("big", 1))])
+        service = EmailDocumentAPIService(None, None, metadata_index=index)  # type: ignore[arg-type]
+        service.max_email_size_bytes = 99
+
+        with pytest.raises(EmailAttachmentTooLarge):
+            service.check_known_size(["big", "unknown"])
+
+    def test_index_is_not_current_before_full_sync_or_when_lagging(self):
+        index = MetadataIndex(max_lag_seconds=0)
+        assert not index.is_current()
+
+        index.replace([])
+        assert not index.is_current()
+
+
+class TestMetadataIndexSync:
+    async def test_delta_sync_pages_by_watermark_and_upserts_revisions(self):
+        upstream = FakeUpstream([make_document(f"doc-{n}", n % 3, minutes=n) for n in range(5)])
+        sync = MetadataIndexSync(
+            MetadataIndex(max_lag_seconds=60), upstream.fetch_page,
+            page_size=2, interval_seconds=60, full_sync_interval_seconds=3600,
+        )
+
+        await sync.sync(full=True)
+        assert len(sync.index) == 5
+
+        upstream.documents.append(make_document("doc-1", 1, rev="B", minutes=10))
+        upstream.watermarks.clear()
+        await sync.sync(full=False)
+
+        assert upstream.watermarks[0] == EPOCH + timedelta(minutes=4)
+        assert len(sync.index) == 5
+        assert [document.rev for document in sync.index.lookup([1])[1] if document.id == "doc-1"] == ["B"]
@@ -0,0 +1,49 @@
+from fastapi import FastAPI
+import httpx
+
+from src.infra.application.metrics import MetricsRegistry, metrics_registry
+from src.infra.application.setup.metrics import MetricsMiddleware, requests_in_flight
+
+
+class TestMetricsRegistry:
+    def test_render_text_exposition_format(self):
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests", ("status",)).inc("200", amount=2)
+        registry.histogram("latency_seconds", buckets=(0.1, 1.0)).labels().observe(0.5)
+
+        assert registry.render().splitlines() == [
+            "# HELP requests_total Requests",
+            "# TYPE requests_total counter",
+            'requests_total{status="200"} 2',
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{le="0.1"} 0',
+            'latency_seconds_bucket{le="1"} 1',
+            'latency_seconds_bucket{le="+Inf"} 1',
+            "latency_seconds_sum 0.5",
+            "latency_seconds_count 1",
+        ]
+
+
+class TestMetricsMiddleware:
+    async def test_requests_are_labelled_by_route_template(self):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+        in_flight: list[float] = []
+
+        @app.get("/documents/{document_id}")
+        async def document(document_id: str):
+            in_flight.append(requests_in_flight.values[("GET", "/documents/{document_id}")])
+            return {}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/documents/1")
+            await client.get("/documents/2")
+
+            await client.get("/missing")
+
+        rendered = metrics_registry.render()
+        assert in_flight == [1, 1]
+        assert 'http_requests_total{method="GET",route="/documents/{document_id}",status="200"} 2' in rendered
+        assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in rendered
+        assert 'http_requests_in_flight{method="GET",route="/documents/{document_id}"} 0' in rendered
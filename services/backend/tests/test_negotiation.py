@@ -0,0 +1,118 @@
+import base64
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from src.api.rest.v1.document.routes import download_router
+from src.apps.auth.enums import DrawingLocatorGroup
+from src.apps.auth.jwt import decode_jwt
+from src.apps.documents.constants import FAILED_DOCUMENTS_HEADER, MediaTypes
+from src.apps.documents.dependency import get_download_service
+from src.apps.documents.dto import DownloadResultDTO
+from src.infra.application.negotiation import negotiate
+
+OFFERED = ["application/json", MediaTypes.ZIP, MediaTypes.PDF]
+
+
+class TestNegotiate:
+    @pytest.mark.parametrize(
+        ("accept", "expected"),
+        [
+            (None, "application/json"),
+            ("application/zip", MediaTypes.ZIP),
+            ("application/json;q=0.5, application/pdf", MediaTypes.PDF),
+            ("application/*;q=0.2, application/zip;q=0.9", MediaTypes.ZIP),
+            ("*/*", "application/json"),
+            ("application/pdf, application/zip", MediaTypes.ZIP),
+            ("*/*;q=0.1, application/json;q=0", MediaTypes.ZIP),
+            ("text/html", None),
+            ("application/zip;q=0", None),
+        ],
+    )
+    def test_preference_follows_quality_specificity_and_offer_order(self, accept, expected):
+        assert negotiate(accept, OFFERED) == expected
+
+
+class FakeDownloadService:
+    def __init__(self, result: DownloadResultDTO):
+        self.result = result
+        self.archive: bool | None = None
+
+    async def download(self, document_ids: list[str], archive: bool = False) -> DownloadResultDTO:
+        self.archive = archive
+        if archive and not self.result.file_name.endswith(".zip"):
+            return DownloadResultDTO(
+                file_name="documents.zip", content_bytes=b"PK\x03\x04", failed_document_ids=[],
+            )
+        return self.result
+
+
+@pytest.fixture
+def download_client():
+    app = FastAPI()
+    app.include_router(download_router)
+    app.dependency_overrides[decode_jwt] = lambda: {"groups": list(DrawingLocatorGroup)}
+
+    def serve(result: DownloadResultDTO) -> tuple[TestClient, FakeDownloadService]:
+        service = FakeDownloadService(result)
+        app.dependency_overrides[get_download_service] = lambda: service
+        return TestClient(app), service
+
+    return serve
+
+
+class TestDownloadRepresentations:
+    def test_raw_archive_when_requested(self, download_client):
+        client, _ = download_client(DownloadResultDTO(
+            file_name="documents.zip", content_bytes=b"PK\x03\x04", failed_document_ids=["b", "c"],
+        ))
+
+        response = client.post("/download", json={"document_ids": ["a", "b", "c"]}, headers={"Accept": "application/zip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == MediaTypes.ZIP
+        assert response.headers["content-disposition"] == 'attachment; filename="documents.zip"'
+        assert response.headers[FAILED_DOCUMENTS_HEADER] == "b,c"
+        assert response.content == b"PK\x03\x04"
+
+    def test_single_pdf_is_served_as_pdf(self, download_client):
+        client, service = download_client(DownloadResultDTO(
+            file_name="document_a.pdf", content_bytes=b"%PDF-1.7", failed_document_ids=[],
+        ))
+
+        response = client.post("/download", json={"document_ids": ["a"]}, headers={"Accept": "application/pdf"})
+
+        assert response.headers["content-type"] == MediaTypes.PDF
+        assert FAILED_DOCUMENTS_HEADER not in response.headers
+        assert service.archive is False
+
+    def test_single_pdf_is_archived_when_only_zip_is_accepted(self, download_client):
+        client, service = download_client(DownloadResultDTO(
+            file_name="document_a.pdf", content_bytes=b"%PDF-1.7", failed_document_ids=[],
+        ))
+
+        response = client.post("/download", json={"document_ids": ["a"]}, headers={"Accept": "application/zip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == MediaTypes.ZIP
+        assert service.archive is True
+
+    def test_several_documents_are_not_acceptable_as_pdf(self, download_client):
+        client, _ = download_client(DownloadResultDTO(
+            file_name="documents.zip", content_bytes=b"PK\x03\x04", failed_document_ids=[],
+        ))
+
+        response = client.post("/download", json={"document_ids": ["a", "b"]}, headers={"Accept": "application/pdf"})
+
+        assert response.status_code == 406
+
+    def test_json_envelope_by_default(self, download_client):
+        client, _ = download_client(DownloadResultDTO(
+            file_name="document_a.pdf", content_bytes=b"%PDF-1.7", failed_document_ids=[],
+        ))
+
+        response = client.post("/download", json={"document_ids": ["a"]})
+
+        assert response.json()["file_name"] == "document_a.pdf"
+        assert base64.b64decode(response.json()["content"]) == b"%PDF-1.7"
@@ -0,0 +1,72 @@
+from datetime import UTC, datetime
+
+import httpx
+
+from src.apps.documents.client import DocumentClient
+from src.apps.documents.utils.odata import NEXT_LINK, ODataQuery, any_of, eq, ge
+
+
+class TestODataQuery:
+    def test_params_combine_all_options(self):
+        query = (
+            ODataQuery()
+            .select("id", "rev")
+            .where(any_of("part_number", [1, 2]), eq("name", "O'Brien"))
+            .where(ge("date_created", datetime(2024, 1, 1, tzinfo=UTC)))
+            .order_by("date_created")
+            .top(50)
+            .skip(100)
+        )
+
+        assert query.params() == {
+            "$select": "id,rev",
+            "$filter": (
+                "(part_number eq 1 or part_number eq 2) and name eq 'O''Brien' "
+                "and date_created ge 2024-01-01T00:00:00Z"
+            ),
+            "$orderby": "date_created",
+            "$top": "50",
+            "$skip": "100",
+        }
+
+    def test_builder_does_not_mutate_base_query(self):
+        base = ODataQuery().select("id")
+        base.top(10)
+
+        assert base.params() == {"$select": "id"}
+
+
+def make_document(document_id: str) -> dict:
+    return {
+        "id": document_id,
+        "part_number": 1,
+        "rev": "A",
+        "date_created": "2024-01-01T00:00:00Z",
+        "file_size_bytes": 10,
+    }
+
+
+class TestDocumentClientPaging:
+    async def test_documents_follow_next_link(self):
+        requested: list[httpx.URL] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url)
+            if "$skiptoken" in request.url.params:
+                return httpx.Response(200, json={"value": [make_document("b")]})
+            return httpx.Response(200, json={
+                "value": [make_document("a")],
+                NEXT_LINK: "https://sap.example/documents/api/v1/documents?$skiptoken=1",
+            })
+
+        client = DocumentClient(
+            "https://sap.example/documents", "user", "secret", transport=httpx.MockTransport(handler),
+        )
+
+        documents = [
+            document async for document in client.iter_documents("api/v1/documents", ODataQuery().select("id"))
+        ]
+
+        assert [document.id for document in documents] == ["a", "b"]
+        assert requested[0].params["$select"] == "id"
+        assert requested[1].params["$skiptoken"] == "1"
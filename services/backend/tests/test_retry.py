@@ -0,0 +1,50 @@
+import logging
+
+import httpx
+import pytest
+
+from src.apps.documents import decorators
+from src.apps.documents.decorators import handle_http_errors
+from src.apps.documents.exceptions import DocumentConnectionError
+from src.config import get_config
+
+
+@pytest.fixture
+def retry_config(monkeypatch):
+    config = get_config().sap_cpi
+    monkeypatch.setattr(config, "retry_attempts", 5)
+    monkeypatch.setattr(config, "retry_base_delay_seconds", 0.001)
+    monkeypatch.setattr(config, "retry_max_delay_seconds", 0.02)
+    # always take the upper end of the jitter range
+    monkeypatch.setattr(decorators.random, "uniform", lambda low, high: high)
+    return config
+
+
+class TestRetry:
+    async def test_backoff_grows_towards_the_cap(self, retry_config, caplog):
+        attempts = []
+
+        @handle_http_errors("test_retry_backoff", retry=True)
+        async def fail():
+            attempts.append(1)
+            raise httpx.ConnectError("refused")
+
+        with caplog.at_level(logging.WARNING, logger=decorators.__name__), pytest.raises(DocumentConnectionError):
+            await fail()
+
+        delays = [record.args[1] for record in caplog.records if record.msg.startswith("Retrying")]
+        assert len(attempts) == 5
+        assert delays == pytest.approx([0.003, 0.009, 0.02, 0.02])
+
+    async def test_retryable_error_is_retried_until_success(self, retry_config):
+        attempts = []
+
+        @handle_http_errors("test_retry_success", retry=True)
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise httpx.ConnectError("refused")
+            return "ok"
+
+        assert await flaky() == "ok"
+        assert len(attempts) == 3
@@ -0,0 +1,27 @@
+from datetime import UTC, datetime
+import json
+
+import msgpack
+
+from src.infra.application.serialization import MSGPACK_MEDIA_TYPE, negotiated_response
+
+CONTENT = {"data": [{"id": "a", "date_created": datetime(2024, 1, 1, tzinfo=UTC).isoformat()}]}
+
+
+class TestNegotiatedResponse:
+    def test_json_is_the_default(self):
+        response = negotiated_response(CONTENT, None)
+
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == CONTENT
+
+    def test_unsupported_accept_falls_back_to_json(self):
+        response = negotiated_response(CONTENT, "application/xml")
+
+        assert response.media_type == "application/json"
+
+    def test_msgpack_when_preferred(self):
+        response = negotiated_response(CONTENT, f"{MSGPACK_MEDIA_TYPE}, application/json;q=0.5")
+
+        assert response.media_type == MSGPACK_MEDIA_TYPE
+        assert msgpack.unpackb(response.body) == CONTENT
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from src.apps.documents.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    async def test_concurrent_callers_share_one_call(self):
+        flights: SingleFlight[str, int] = SingleFlight()
+        calls = 0
+
+        async def fetch() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(*(flights.do("doc", fetch) for _ in range(5)))
+
+        assert results == [42] * 5
+        assert calls == 1
+        assert len(flights) == 0
+
+    async def test_error_reaches_all_waiters(self):
+        flights: SingleFlight[str, int] = SingleFlight()
+
+        async def fetch() -> int:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            *(flights.do("doc", fetch) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        flights: SingleFlight[str, int] = SingleFlight()
+
+        async def fetch() -> int:
+            await asyncio.sleep(0.02)
+            return 7
+
+        first = asyncio.ensure_future(flights.do("doc", fetch))
+        second = asyncio.ensure_future(flights.do("doc", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == 7
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    async def test_overlapping_batches_fetch_only_new_keys(self):
+        flights: SingleFlight[int, list[int]] = SingleFlight()
+        batches: list[list[int]] = []
+
+        async def fetch(keys: list[int]) -> dict[int, list[int]]:
+            batches.append(keys)
+            await asyncio.sleep(0.01)
+            return {key: [key] for key in keys}
+
+        first, second = await asyncio.gather(
+            flights.do_many([1, 2, 3], fetch),
+            flights.do_many([2, 3, 4, 4], fetch),
+        )
+
+        assert batches == [[1, 2, 3], [4]]
+        assert first == {1: [1], 2: [2], 3: [3]}
+        assert second == {2: [2], 3: [3], 4: [4]}
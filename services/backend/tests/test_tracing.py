@@ -0,0 +1,33 @@
+from fastapi import FastAPI
+import httpx
+
+from src.infra.application.setup.tracing import TracingMiddleware, get_trace_id
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware, header_name="X-Trace-ID", generator=lambda: "generated")
+
+    @app.get("/trace")
+    async def trace():
+        return {"trace_id": get_trace_id()}
+
+    return app
+
+
+class TestTracingMiddleware:
+    async def test_incoming_trace_id_is_propagated(self):
+        transport = httpx.ASGITransport(app=make_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/trace", headers={"X-Trace-ID": "abc123"})
+
+        assert response.json() == {"trace_id": "abc123"}
+        assert response.headers["x-trace-id"] == "abc123"
+
+    async def test_trace_id_is_generated_when_missing(self):
+        transport = httpx.ASGITransport(app=make_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/trace")
+
+        assert response.json() == {"trace_id": "generated"}
+        assert response.headers["x-trace-id"] == "generated"
@@ -0,0 +1,52 @@
+import asyncio
+from io import BytesIO
+import json
+import zipfile
+
+from src.apps.documents.utils.content_generator import ContentGenerator
+
+
+class FakeDocumentClient:
+    def __init__(self, documents: dict[str, bytes], delays: dict[str, float]):
+        self.documents = documents
+        self.delays = delays
+        self.started = 0
+
+    async def get_document_content(self, document_id: str) -> bytes:
+        self.started += 1
+        await asyncio.sleep(self.delays.get(document_id, 0))
+        if document_id not in self.documents:
+            raise RuntimeError("not found")
+        return self.documents[document_id]
+
+
+class TestStreamArchive:
+    async def test_entries_in_completion_order_with_manifest(self):
+        client = FakeDocumentClient(
+            documents={"a": b"%PDF-a" * 1000, "b": b"%PDF-b"},
+            delays={"a": 0.02, "b": 0.0},
+        )
+
+        chunks = [
+            chunk async for chunk in ContentGenerator.stream_archive(client, ["a", "b", "missing"])
+        ]
+
+        with zipfile.ZipFile(BytesIO(b"".join(chunks))) as archive:
+            assert archive.testzip() is None
+            assert archive.namelist() == ["document_b.pdf", "document_a.pdf", "manifest.json"]
+            assert archive.read("document_a.pdf") == client.documents["a"]
+
+            manifest = json.loads(archive.read("manifest.json"))
+            assert manifest["failed_document_ids"] == ["missing"]
+
+    async def test_fetches_ahead_of_the_consumer_are_bounded(self):
+        client = FakeDocumentClient(documents={str(n): b"%PDF" for n in range(20)}, delays={})
+        ahead: list[int] = []
+
+        async for _ in ContentGenerator.stream_archive(client, list(client.documents), prefetch=3):
+            # a slow consumer, fetched payloads must not pile up meanwhile
+            await asyncio.sleep(0.001)
+            ahead.append(client.started - len(ahead) - 1)
+
+        assert client.started == 20
+        assert max(ahead) <= 3